@@ -0,0 +1,78 @@
+"""
+Fixtures for the benchmark suite.
+
+The benchmarks run against throwaway databases on the `localhost` entry of the
+configuration file. Both databases are created at the start of the session and
+dropped at the end.
+
+Dataset sizes default to `SIZES` and can be overridden with a comma-separated
+`PG_DATA_ETL_BENCH_SIZES` environment variable, e.g. `PG_DATA_ETL_BENCH_SIZES=1000,5000`
+"""
+import os
+import pytest
+
+from pg_data_etl import Database
+
+from .synthetic import GEO_GENERATORS, make_wide_frame
+
+SIZES = [1_000, 10_000, 100_000]
+
+if os.environ.get("PG_DATA_ETL_BENCH_SIZES"):
+    SIZES = [int(x) for x in os.environ["PG_DATA_ETL_BENCH_SIZES"].split(",")]
+
+BENCH_SCHEMA = "bench"
+
+
+def bench_tablename(kind: str, size: int) -> str:
+    return f"{BENCH_SCHEMA}.{kind}_{size}"
+
+
+@pytest.fixture(scope="session")
+def bench_db():
+    """ Spin up a throwaway db for the whole benchmark session, then drop it """
+
+    db = Database.from_config("pytest_benchmarks", "localhost")
+
+    db.admin("CREATE")
+
+    yield db
+
+    db.admin("DROP")
+
+
+@pytest.fixture(scope="session")
+def bench_target_db():
+    """ A second throwaway db that receives copied tables """
+
+    db = Database.from_config("pytest_benchmarks_target", "localhost")
+
+    db.admin("CREATE")
+
+    yield db
+
+    db.admin("DROP")
+
+
+@pytest.fixture(scope="session")
+def bench_data_path(tmp_path_factory):
+    return tmp_path_factory.mktemp("bench_data")
+
+
+@pytest.fixture(scope="session")
+def loaded_bench_db(bench_db: Database):
+    """
+    - Load every synthetic dataset at every size into the benchmark db
+    - Used by the export, query and copy benchmarks, which need data to read
+    """
+
+    for size in SIZES:
+        for kind, generator in GEO_GENERATORS.items():
+            bench_db.import_geodataframe(generator(size), bench_tablename(kind, size))
+
+        bench_db.import_dataframe(
+            make_wide_frame(size), bench_tablename("wide", size), {"index": False}
+        )
+
+    bench_db.execute("ANALYZE")
+
+    yield bench_db
@@ -0,0 +1,108 @@
+"""
+Synthetic data generators for the benchmark suite.
+
+Every generator is seeded so that repeated runs produce identical data,
+which keeps timings comparable between benchmark runs.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import LineString
+
+# Rough bounding box around Philadelphia, in EPSG:2272 (PA South, feet)
+BBOX_2272 = (2_660_000, 210_000, 2_750_000, 310_000)
+DEFAULT_EPSG = 2272
+
+
+def _random_xy(n: int, rng: np.random.Generator) -> tuple:
+    xmin, ymin, xmax, ymax = BBOX_2272
+    x = rng.uniform(xmin, xmax, n)
+    y = rng.uniform(ymin, ymax, n)
+    return x, y
+
+
+def _attributes(n: int, rng: np.random.Generator) -> dict:
+    return {
+        "category": rng.choice(["a", "b", "c", "d"], n),
+        "value": rng.normal(size=n),
+        "count": rng.integers(0, 1000, n),
+    }
+
+
+def make_points(n: int, seed: int = 42) -> gpd.GeoDataFrame:
+    """
+    - Generate `n` random points with a few attribute columns
+    """
+    rng = np.random.default_rng(seed)
+    x, y = _random_xy(n, rng)
+
+    return gpd.GeoDataFrame(
+        _attributes(n, rng),
+        geometry=gpd.points_from_xy(x, y),
+        crs=f"EPSG:{DEFAULT_EPSG}",
+    )
+
+
+def make_lines(n: int, vertices: int = 8, seed: int = 42) -> gpd.GeoDataFrame:
+    """
+    - Generate `n` random-walk linestrings, each with `vertices` points
+    """
+    rng = np.random.default_rng(seed)
+    x, y = _random_xy(n, rng)
+
+    steps = rng.normal(scale=250, size=(n, vertices - 1, 2)).cumsum(axis=1)
+    starts = np.column_stack([x, y])[:, None, :]
+    coords = np.concatenate([starts, starts + steps], axis=1)
+
+    return gpd.GeoDataFrame(
+        _attributes(n, rng),
+        geometry=[LineString(c) for c in coords],
+        crs=f"EPSG:{DEFAULT_EPSG}",
+    )
+
+
+def make_polygons(n: int, seed: int = 42) -> gpd.GeoDataFrame:
+    """
+    - Generate `n` random polygons by buffering points with a random radius
+    """
+    rng = np.random.default_rng(seed)
+    points = make_points(n, seed=seed)
+    radius = rng.uniform(50, 500, n)
+
+    polygons = points.copy()
+    polygons["geometry"] = points.geometry.buffer(radius, 4)
+
+    return polygons
+
+
+def make_wide_frame(n: int, ncols: int = 50, seed: int = 42) -> pd.DataFrame:
+    """
+    - Generate a wide tabular dataframe with `n` rows and `ncols` mixed-type columns
+    - Columns rotate through integer, float, low-cardinality text and date types
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+
+    for i in range(ncols):
+        kind = i % 4
+        if kind == 0:
+            data[f"int_{i}"] = rng.integers(0, 100_000, n)
+        elif kind == 1:
+            data[f"float_{i}"] = rng.normal(size=n)
+        elif kind == 2:
+            data[f"text_{i}"] = rng.choice(["alpha", "beta", "gamma", "delta", "epsilon"], n)
+        else:
+            data[f"date_{i}"] = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+                rng.integers(0, 365 * 5, n), unit="D"
+            )
+
+    return pd.DataFrame(data)
+
+
+GEO_GENERATORS = {
+    "points": make_points,
+    "lines": make_lines,
+    "polygons": make_polygons,
+}
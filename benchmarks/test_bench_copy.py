@@ -0,0 +1,38 @@
+import pytest
+
+from pg_data_etl import Database
+
+from .conftest import SIZES, bench_tablename
+
+
+# (method, workers) combinations to compare
+COPY_MODES = [("pg_dump", 1), ("copy", 1), ("copy", 4)]
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("kind", ["polygons", "wide"])
+@pytest.mark.parametrize("method,workers", COPY_MODES)
+def test_export_table_to_another_db(
+    benchmark,
+    loaded_bench_db: Database,
+    bench_target_db: Database,
+    kind: str,
+    size: int,
+    method: str,
+    workers: int,
+):
+    tablename = bench_tablename(kind, size)
+
+    def setup():
+        bench_target_db.execute(f"DROP TABLE IF EXISTS {tablename} CASCADE;")
+
+    benchmark.group = f"export_table_to_another_db-{kind}"
+    benchmark.pedantic(
+        loaded_bench_db.export_table_to_another_db,
+        args=(tablename, bench_target_db),
+        kwargs={"method": method, "workers": workers},
+        setup=setup,
+        rounds=3,
+    )
+
+    assert bench_target_db.query_as_singleton(f"SELECT count(*) FROM {tablename}") == size
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+
+from pg_data_etl import Database
+
+from .conftest import SIZES, bench_tablename
+
+ROUNDS = 3
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("filetype", ["geojson", "shp"])
+def test_export_gis_geopandas(
+    benchmark, loaded_bench_db: Database, bench_data_path, filetype: str, size: int
+):
+    filepath = bench_data_path / f"export_gpd_{size}.{filetype}"
+
+    benchmark.group = f"export_gis-geopandas-{filetype}"
+    benchmark.pedantic(
+        loaded_bench_db.export_gis,
+        kwargs={
+            "method": "geopandas",
+            "table_or_sql": bench_tablename("polygons", size),
+            "filepath": filepath,
+            "filetype": filetype,
+        },
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_export_gis_ogr2ogr(benchmark, loaded_bench_db: Database, bench_data_path, size: int):
+    filepath = bench_data_path / f"export_ogr_{size}.geojson"
+
+    def setup():
+        filepath.unlink(missing_ok=True)
+
+    benchmark.group = "export_gis-ogr2ogr"
+    benchmark.pedantic(
+        loaded_bench_db.export_gis,
+        kwargs={
+            "method": "ogr2ogr",
+            "table_or_sql": bench_tablename("polygons", size),
+            "filepath": filepath,
+            "filetype": "GeoJSON",
+        },
+        setup=setup,
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_export_gis_pgsql2shp(benchmark, loaded_bench_db: Database, bench_data_path, size: int):
+    filepath = bench_data_path / f"export_pgsql2shp_{size}"
+
+    benchmark.group = "export_gis-pgsql2shp"
+    benchmark.pedantic(
+        loaded_bench_db.export_gis,
+        kwargs={
+            "method": "pgsql2shp",
+            "table_or_sql": bench_tablename("polygons", size),
+            "filepath": filepath,
+        },
+        rounds=ROUNDS,
+    )
+
+
+# (method, compression, parts) combinations to compare
+CSV_MODES = [
+    ("pandas", None, 1),
+    ("copy", None, 1),
+    ("copy", "gzip", 1),
+    ("copy", None, 4),
+]
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("method,compression,parts", CSV_MODES)
+def test_export_csv(
+    benchmark,
+    loaded_bench_db: Database,
+    bench_data_path,
+    method: str,
+    compression: str | None,
+    parts: int,
+    size: int,
+):
+    tablename = bench_tablename("wide", size)
+    filepath = bench_data_path / f"export_{method}_{compression}_{parts}_{size}.csv"
+
+    def export():
+        if method == "pandas":
+            loaded_bench_db.df(f"SELECT * FROM {tablename}").to_csv(filepath, index=False)
+        else:
+            loaded_bench_db.export_csv(tablename, filepath, compression=compression, parts=parts)
+
+    benchmark.group = f"export_csv-{size}"
+    benchmark.pedantic(export, rounds=ROUNDS)
+
+
+def test_dump(benchmark, loaded_bench_db: Database, bench_data_path):
+    benchmark.group = "dump"
+    filepath = benchmark.pedantic(loaded_bench_db.dump, args=(bench_data_path,), rounds=ROUNDS)
+    filepath.unlink()
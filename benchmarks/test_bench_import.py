@@ -0,0 +1,119 @@
+import pytest
+
+from pg_data_etl import Database
+
+from .conftest import SIZES, BENCH_SCHEMA
+from .synthetic import GEO_GENERATORS, make_wide_frame
+
+ROUNDS = 3
+
+
+def _drop_table_setup(db: Database, tablename: str):
+    """ Build a `pedantic()` setup function that starts each round from an empty table """
+
+    def setup():
+        db.execute(f"DROP TABLE IF EXISTS {tablename} CASCADE;")
+
+    return setup
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("kind", list(GEO_GENERATORS.keys()))
+def test_import_geodataframe(benchmark, bench_db: Database, kind: str, size: int):
+    gdf = GEO_GENERATORS[kind](size)
+    tablename = f"{BENCH_SCHEMA}.import_{kind}_{size}"
+
+    benchmark.group = f"import_geodataframe-{kind}"
+    benchmark.pedantic(
+        bench_db.import_geodataframe,
+        args=(gdf, tablename),
+        setup=_drop_table_setup(bench_db, tablename),
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_import_dataframe(benchmark, bench_db: Database, size: int):
+    df = make_wide_frame(size)
+    tablename = f"{BENCH_SCHEMA}.import_wide_{size}"
+
+    benchmark.group = "import_dataframe-wide"
+    benchmark.pedantic(
+        bench_db.import_dataframe,
+        args=(df, tablename, {"index": False}),
+        setup=_drop_table_setup(bench_db, tablename),
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("method", ["geopandas", "shp2pgsql", "ogr2ogr"])
+def test_import_gis(benchmark, bench_db: Database, bench_data_path, method: str, size: int):
+    shp_path = bench_data_path / f"import_points_{size}.shp"
+    GEO_GENERATORS["points"](size).to_file(shp_path)
+
+    tablename = f"{BENCH_SCHEMA}.import_gis_{method}_{size}"
+
+    if method == "shp2pgsql":
+        kwargs = {"filepath": str(shp_path), "sql_tablename": tablename, "srid": 2272}
+    else:
+        kwargs = {"filepath": str(shp_path), "sql_tablename": tablename}
+
+    benchmark.group = f"import_gis-{method}"
+    benchmark.pedantic(
+        bench_db.import_gis,
+        kwargs={"method": method, **kwargs},
+        setup=_drop_table_setup(bench_db, tablename),
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("kind", list(GEO_GENERATORS.keys()))
+@pytest.mark.parametrize("method", ["geopandas", "ogr2ogr"])
+def test_import_gis_geopackage(
+    benchmark, bench_db: Database, bench_data_path, method: str, kind: str, size: int
+):
+    gpkg_path = bench_data_path / f"import_{kind}_{size}.gpkg"
+
+    if not gpkg_path.exists():
+        GEO_GENERATORS[kind](size).to_file(gpkg_path, driver="GPKG")
+
+    tablename = f"{BENCH_SCHEMA}.import_gpkg_{method}_{kind}_{size}"
+
+    benchmark.group = f"import_gis-gpkg-{kind}"
+    benchmark.pedantic(
+        bench_db.import_gis,
+        kwargs={"method": method, "filepath": str(gpkg_path), "sql_tablename": tablename},
+        setup=_drop_table_setup(bench_db, tablename),
+        rounds=ROUNDS,
+    )
+
+    assert bench_db.query_as_singleton(f"SELECT count(*) FROM {tablename}") == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("suffix", [".csv", ".xlsx"])
+def test_import_file_with_pandas(
+    benchmark, bench_db: Database, bench_data_path, suffix: str, size: int
+):
+    if suffix == ".xlsx" and size > 10_000:
+        pytest.skip("Writing large .xlsx fixtures takes longer than the benchmark itself")
+
+    df = make_wide_frame(size, ncols=20)
+    filepath = bench_data_path / f"wide_{size}{suffix}"
+
+    if suffix == ".csv":
+        df.to_csv(filepath, index=False)
+    else:
+        df.to_excel(filepath, index=False)
+
+    tablename = f"{BENCH_SCHEMA}.import_file_{suffix[1:]}_{size}"
+
+    benchmark.group = f"import_file_with_pandas-{suffix[1:]}"
+    benchmark.pedantic(
+        bench_db.import_file_with_pandas,
+        args=(filepath, tablename),
+        setup=_drop_table_setup(bench_db, tablename),
+        rounds=ROUNDS,
+    )
@@ -0,0 +1,93 @@
+import pytest
+
+from pg_data_etl import Database
+
+from .conftest import BENCH_SCHEMA, SIZES, bench_tablename
+from .synthetic import GEO_GENERATORS
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_df(benchmark, loaded_bench_db: Database, size: int):
+    benchmark.group = "df-wide"
+    result = benchmark(loaded_bench_db.df, f"SELECT * FROM {bench_tablename('wide', size)}")
+
+    assert len(result) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("kind", list(GEO_GENERATORS.keys()))
+def test_gdf(benchmark, loaded_bench_db: Database, kind: str, size: int):
+    benchmark.group = f"gdf-{kind}"
+    result = benchmark(loaded_bench_db.gdf, f"SELECT * FROM {bench_tablename(kind, size)}")
+
+    assert len(result) == size
+
+
+@pytest.mark.parametrize("binary", [True, False], ids=["ewkb", "from_postgis"])
+def test_gdf_million_points(benchmark, bench_db: Database, binary: bool):
+    tablename = f"{BENCH_SCHEMA}.points_1m"
+    bench_db.schema_add(BENCH_SCHEMA)
+
+    bench_db.execute(f"""
+        CREATE TABLE IF NOT EXISTS {tablename} AS
+        SELECT i AS uid, ST_SetSRID(ST_MakePoint(mod(i, 1000) * 10, i / 1000 * 10), 2272) AS geom
+        FROM generate_series(1, 1000000) AS i
+    """)
+
+    benchmark.group = "gdf-1m-points"
+    result = benchmark.pedantic(
+        bench_db.gdf, args=(f"SELECT * FROM {tablename}",), kwargs={"binary": binary}, rounds=3
+    )
+
+    assert len(result) == 1_000_000
+    assert result.crs.to_epsg() == 2272
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_query_as_list_of_lists(benchmark, loaded_bench_db: Database, size: int):
+    benchmark.group = "query_as_list_of_lists-wide"
+    result = benchmark(
+        loaded_bench_db.query_as_list_of_lists, f"SELECT * FROM {bench_tablename('wide', size)}"
+    )
+
+    assert len(result) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_query_as_singleton(benchmark, loaded_bench_db: Database, size: int):
+    benchmark.group = "query_as_singleton-count"
+    result = benchmark(
+        loaded_bench_db.query_as_singleton, f"SELECT count(*) FROM {bench_tablename('wide', size)}"
+    )
+
+    assert result == size
+
+
+def test_tables(benchmark, loaded_bench_db: Database):
+    benchmark.group = "lists"
+    benchmark(loaded_bench_db.tables, spatial_only=True)
+
+
+def test_columns(benchmark, loaded_bench_db: Database):
+    benchmark.group = "lists"
+    benchmark(loaded_bench_db.columns, bench_tablename("wide", SIZES[0]))
+
+
+def test_report_spatial(benchmark, loaded_bench_db: Database):
+    benchmark.group = "lists"
+    benchmark(loaded_bench_db.report_spatial)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_gis_make_geotable_from_query(benchmark, loaded_bench_db: Database, size: int):
+    query = f"""
+        SELECT category, ST_Buffer(geom, 100) AS geom
+        FROM {bench_tablename('points', size)}
+    """
+
+    benchmark.group = "gis_make_geotable_from_query"
+    benchmark.pedantic(
+        loaded_bench_db.gis_make_geotable_from_query,
+        args=(query, f"bench.ctas_{size}", "POLYGON", 2272),
+        rounds=3,
+    )
@@ -0,0 +1,58 @@
+import pytest
+
+from pg_data_etl import Database
+
+from .conftest import SIZES, BENCH_SCHEMA
+from .synthetic import BBOX_2272, make_points, make_polygons
+
+# Load options compared for bounding box query latency
+LAYOUTS = {
+    "unordered": {},
+    "hilbert": {"spatial_order": "hilbert"},
+    "geohash": {"spatial_order": "geohash"},
+    "clustered": {"cluster": True},
+}
+
+GENERATORS = {"points": make_points, "polygons": make_polygons}
+
+
+def _window(fraction: float = 0.05) -> str:
+    """ A bounding box covering `fraction` of the width/height of the synthetic data """
+    xmin, ymin, xmax, ymax = BBOX_2272
+    x, y = xmin + (xmax - xmin) * 0.4, ymin + (ymax - ymin) * 0.4
+
+    return (
+        f"ST_MakeEnvelope({x}, {y}, {x + (xmax - xmin) * fraction}, "
+        f"{y + (ymax - ymin) * fraction}, 2272)"
+    )
+
+
+@pytest.fixture(scope="module")
+def spatially_loaded_db(bench_db: Database):
+    """ Load every dataset once per layout, at every size """
+
+    for size in SIZES:
+        for kind, generator in GENERATORS.items():
+            gdf = generator(size)
+
+            for layout, kwargs in LAYOUTS.items():
+                tablename = f"{BENCH_SCHEMA}.{layout}_{kind}_{size}"
+                bench_db.import_geodataframe(gdf, tablename, **kwargs)
+
+    bench_db.execute("ANALYZE")
+
+    yield bench_db
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("layout", list(LAYOUTS.keys()))
+@pytest.mark.parametrize("kind", list(GENERATORS.keys()))
+def test_bbox_query(benchmark, spatially_loaded_db: Database, kind: str, layout: str, size: int):
+    query = f"""
+        SELECT *
+        FROM {BENCH_SCHEMA}.{layout}_{kind}_{size}
+        WHERE geom && {_window()}
+    """
+
+    benchmark.group = f"bbox-{kind}-{size}"
+    benchmark(spatially_loaded_db.query_as_list_of_lists, query)
@@ -4,4 +4,4 @@
 
 
 """
-from .database import Database  # noqa
+from .database import Database, DatabaseGroup  # noqa
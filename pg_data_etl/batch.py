@@ -0,0 +1,63 @@
+"""
+`pg_data_etl.batch`
+-------------------
+
+Run the same action over many targets with a bounded pool of worker threads,
+and collect a machine-readable summary of what happened.
+
+This powers the `pg import`, `pg export` and `pg copy` commands.
+"""
+from __future__ import annotations
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
+
+
+def _run_one(func: Callable, target) -> dict:
+    start = time.perf_counter()
+    result = {"target": target, "status": "ok", "seconds": None, "error": None}
+
+    try:
+        func(target)
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+
+    result["seconds"] = round(time.perf_counter() - start, 4)
+
+    return result
+
+
+def run_batch(func: Callable, targets: list, jobs: int = 1, label: str | None = None) -> dict:
+    """
+    - Call `func(target)` for every target, running up to `jobs` of them at once
+    - A failing target does not stop the others
+
+    Arguments:
+        func (Callable): function that takes a single target
+        targets (list): JSON-serializable targets, e.g. strings or dicts
+        jobs (int): maximum number of targets processed at the same time
+        label (str | None): name of the batch, stored in the summary
+
+    Returns:
+        dict: summary with overall timing and a `results` list in the same order as `targets`
+    """
+    started_at = datetime.now().isoformat(timespec="seconds")
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        results = list(executor.map(lambda target: _run_one(func, target), targets))
+
+    failed = [r for r in results if r["status"] != "ok"]
+
+    return {
+        "command": label,
+        "started_at": started_at,
+        "jobs": jobs,
+        "total_seconds": round(time.perf_counter() - start, 4),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "results": results,
+    }
@@ -0,0 +1,306 @@
+"""
+`pg_data_etl.cache`
+-------------------
+
+An opt-in, on-disk cache of `df()` and `gdf()` results, stored as Parquet
+and GeoParquet files.
+
+```python
+>>> db.enable_cache(max_bytes=5 * 1024**3)
+>>> gdf = db.gdf("SELECT * FROM gis.parcels")  # miss: runs the query
+>>> gdf = db.gdf("SELECT * FROM gis.parcels")  # hit: reads from disk
+>>> gdf = db.gdf("SELECT * FROM gis.parcels", cache=False)  # always runs the query
+>>> db.cache_stats()
+{'hits': 1, 'misses': 1, 'bypassed': 1, 'evictions': 0, 'write_errors': 0, 'files': 1, 'bytes': 48213}
+```
+
+The cache key combines:
+
+- the database (host, port and name)
+- the SQL, with whitespace and comments outside of quoted literals normalized
+- a freshness token for every table the query reads. Tables are found with
+`EXPLAIN (VERBOSE)`, so views resolve to their base tables. The token is
+built from each table's `relfilenode`, on-disk size and the insert/update/delete
+counters in `pg_stat_user_tables`, so any write to a referenced table produces a new key.
+
+Things to know:
+
+- Postgres publishes table statistics with a short delay (up to ~1 second), so a
+read immediately after a write from another connection can still hit the cache.
+Pass `cache=False` for read-after-write code paths.
+- Queries that don't read any table (e.g. `SELECT now()`) are never cached.
+- Results that can't be written as Parquet (e.g. duplicate column names) are returned
+uncached, and counted as `write_errors`.
+- When the folder grows past `max_bytes`, the least recently used files are removed.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+from pg_data_etl.settings import DB_CONFIG_FILEPATH
+
+DEFAULT_CACHE_FOLDER = DB_CONFIG_FILEPATH.parent / "query_cache"
+
+_QUOTED = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")""")
+
+
+def normalize_sql(query: str) -> str:
+    """
+    - Collapse whitespace and drop comments outside of quoted literals/identifiers
+    - Strip any trailing semicolons
+
+    Arguments:
+        query (str): SQL query
+
+    Returns:
+        str: normalized SQL, suitable for use in a cache key
+    """
+    parts = _QUOTED.split(query)
+
+    for i in range(0, len(parts), 2):
+        text = re.sub(r"/\*.*?\*/", " ", parts[i], flags=re.DOTALL)
+        text = re.sub(r"--[^\n]*", " ", text)
+        parts[i] = re.sub(r"\s+", " ", text)
+
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def _fetch_all(db, query: str) -> list:
+    """
+    - Run one of the cache's own catalog queries on a plain cursor, so that it isn't
+    profiled (an `EXPLAIN` of an `EXPLAIN` fails) or reported to instrumentation sinks
+    """
+    with db.connection(read_only=True) as connection:
+        cursor = connection.cursor()
+        cursor.execute(query)
+        result = cursor.fetchall()
+        cursor.close()
+
+    return result
+
+
+def _relations_in_plan(node: dict, relations: set) -> set:
+    if "Relation Name" in node:
+        relations.add((node.get("Schema", "public"), node["Relation Name"]))
+
+    for child in node.get("Plans", []):
+        _relations_in_plan(child, relations)
+
+    return relations
+
+
+class QueryCache:
+    """
+    Stores query results on disk, keyed on SQL and the freshness of the tables it reads.
+
+    Arguments:
+        folder (Path | str): where the cached files are written
+        max_bytes (int): size limit for the folder, enforced with least-recently-used eviction
+    """
+
+    def __init__(self, folder: Path | str = DEFAULT_CACHE_FOLDER, max_bytes: int = 2 * 1024**3):
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.write_errors = 0
+
+        self._lock = threading.Lock()
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    # Keys
+    # ----
+
+    def referenced_tables(self, db, query: str) -> list:
+        """
+        - Get a sorted list of `(schema, table)` tuples that `query` reads from
+        """
+        plan = _fetch_all(db, f"EXPLAIN (VERBOSE, FORMAT JSON) {query}")[0][0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return sorted(_relations_in_plan(plan[0]["Plan"], set()))
+
+    def freshness_token(self, db, tables: list) -> list:
+        """
+        - Get the current modification state of each table in a single catalog query
+        """
+        values = ", ".join(f"('{schema}', '{table}')" for schema, table in tables)
+
+        query = f"""
+            SELECT
+                n.nspname, c.relname, c.relfilenode, pg_relation_size(c.oid),
+                s.n_tup_ins, s.n_tup_upd, s.n_tup_del
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+            WHERE (n.nspname, c.relname) IN ({values})
+            ORDER BY 1, 2
+        """
+
+        return [list(row) for row in _fetch_all(db, query)]
+
+    def key(self, db, query: str, kind: str) -> str | None:
+        """
+        - Build the cache key for a query, or `None` if the query can't be cached
+        """
+        try:
+            tables = self.referenced_tables(db, query)
+        except Exception:
+            return None
+
+        if not tables:
+            return None
+
+        params = db.connection_params
+
+        payload = {
+            "db": [params["host"], str(params["port"]), params["db_name"]],
+            "kind": kind,
+            "sql": normalize_sql(query),
+            "tables": self.freshness_token(db, tables),
+        }
+
+        text = json.dumps(payload, sort_keys=True, default=str)
+
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    # Storage
+    # -------
+
+    def _filepath(self, key: str) -> Path:
+        return self.folder / f"{key}.parquet"
+
+    def _read(self, filepath: Path, kind: str):
+        if kind.startswith("gdf"):
+            import geopandas as gpd
+
+            return gpd.read_parquet(filepath)
+
+        import pandas as pd
+
+        return pd.read_parquet(filepath)
+
+    def _write(self, data, key: str) -> None:
+        filepath = self._filepath(key)
+        tmp_filepath = filepath.with_suffix(f".{threading.get_ident()}.tmp")
+
+        try:
+            data.to_parquet(tmp_filepath)
+            os.replace(tmp_filepath, filepath)
+
+        except Exception as e:
+            tmp_filepath.unlink(missing_ok=True)
+
+            with self._lock:
+                self.write_errors += 1
+
+            print(f"Result not cached, it can't be written to Parquet: {e}")
+            return None
+
+        self.evict()
+
+    def fetch(self, db, query: str, loader, kind: str = "df", use_cache: bool = True):
+        """
+        - Return the cached result for `query`, or call `loader()` and cache its result
+
+        Arguments:
+            db (Database): database the query runs against
+            query (str): SQL query
+            loader (Callable): function with no arguments that runs the query
+            kind (str): label for the type of result, e.g. `"df"` or `"gdf"`
+            use_cache (bool): set to `False` to bypass the cache entirely
+
+        Returns:
+            the result of `loader()`, possibly read back from disk
+        """
+        key = self.key(db, query, kind) if use_cache else None
+
+        if key is None:
+            with self._lock:
+                self.bypassed += 1
+            return loader()
+
+        filepath = self._filepath(key)
+
+        if filepath.exists():
+            try:
+                data = self._read(filepath, kind)
+                os.utime(filepath)
+
+                with self._lock:
+                    self.hits += 1
+
+                return data
+
+            except FileNotFoundError:
+                # Evicted by another thread between the check and the read
+                pass
+
+        with self._lock:
+            self.misses += 1
+
+        data = loader()
+        self._write(data, key)
+
+        return data
+
+    # Maintenance
+    # -----------
+
+    def _files(self) -> list:
+        return [f for f in self.folder.glob("*.parquet") if f.is_file()]
+
+    def size(self) -> int:
+        """
+        - Total size of the cached files, in bytes
+        """
+        return sum(f.stat().st_size for f in self._files())
+
+    def evict(self) -> None:
+        """
+        - Remove least-recently-used files until the cache fits in `max_bytes`
+        """
+        with self._lock:
+            files = sorted(self._files(), key=lambda f: f.stat().st_mtime)
+            total = sum(f.stat().st_size for f in files)
+
+            while files and total > self.max_bytes:
+                oldest = files.pop(0)
+                total -= oldest.stat().st_size
+                oldest.unlink()
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        - Delete every cached file
+        """
+        with self._lock:
+            for f in self._files():
+                f.unlink()
+
+    def stats(self) -> dict:
+        """
+        - Hit/miss counters for this session, and the current size of the cache on disk
+        """
+        files = self._files()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "write_errors": self.write_errors,
+            "files": len(files),
+            "bytes": sum(f.stat().st_size for f in files),
+        }
@@ -1,6 +1,26 @@
+from __future__ import annotations
+import json
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
 import click
 from pg_data_etl.settings.make_config_file import make_config_file as _make_config_file
 
+TABULAR_SUFFIXES = [".csv", ".xlsx", ".xls"]
+
+# Exported with COPY, optionally compressed, e.g. "counts.csv.gz"
+CSV_SUFFIXES = [".csv", ".tsv"]
+
+OGR_DRIVERS = {
+    ".geojson": "GeoJSON",
+    ".json": "GeoJSON",
+    ".shp": "ESRI Shapefile",
+    ".gpkg": "GPKG",
+}
+
+GEOPANDAS_SUFFIXES = [".geojson", ".shp"]
+
 
 @click.group()
 def main():
@@ -15,7 +35,298 @@ def make_config_file(overwrite):
     _make_config_file(overwrite=overwrite)
 
 
-all_commands = [make_config_file]
+# Batch commands
+# --------------
+
+
+def database_options(func):
+    """Options shared by every command that connects to a database"""
+    options = [
+        click.option("--db", "db_name", required=True, help="Name of the database"),
+        click.option(
+            "--config-key", default="localhost", show_default=True, help="Entry in the config file"
+        ),
+        click.option(
+            "--config-file",
+            type=click.Path(dir_okay=False),
+            default=None,
+            help="Path to a config file other than the default",
+        ),
+        click.option(
+            "--jobs", "-j", default=1, show_default=True, help="Number of targets run in parallel"
+        ),
+        click.option(
+            "--summary-file",
+            type=click.Path(dir_okay=False),
+            default=None,
+            help="Write the JSON summary here instead of to stdout",
+        ),
+    ]
+
+    for option in reversed(options):
+        func = option(func)
+
+    return func
+
+
+def _database(db_name: str, config_key: str, config_file: str | None, jobs: int):
+    from pg_data_etl import Database
+
+    db = Database.from_config(db_name, config_key, config_filepath=config_file)
+
+    # All jobs share one pool of connections
+    db.enable_pool(maxconn=max(jobs, 1))
+
+    return db
+
+
+def _split_target(target: str, first: str, second: str) -> tuple:
+    if "=" not in target:
+        raise click.BadParameter(f"'{target}' should be formatted as {first}={second}")
+
+    return tuple(target.rsplit("=", 1))
+
+
+def _run_and_report(
+    label: str, func, targets: list, jobs: int, summary_file, databases: list
+) -> None:
+    from pg_data_etl.batch import run_batch
+
+    # Keep stdout clean for the JSON summary
+    with redirect_stdout(sys.stderr):
+        try:
+            summary = run_batch(func, targets, jobs=jobs, label=label)
+        finally:
+            for db in databases:
+                db.close_pool()
+
+    output = json.dumps(summary, indent=2, default=str)
+
+    if summary_file:
+        Path(summary_file).write_text(output)
+    else:
+        click.echo(output)
+
+    if summary["failed"]:
+        sys.exit(1)
+
+
+@click.command("import")
+@database_options
+@click.argument("targets", nargs=-1, required=True)
+@click.option(
+    "--method",
+    type=click.Choice(["geopandas", "shp2pgsql", "ogr2ogr"]),
+    default="geopandas",
+    show_default=True,
+    help="Import method for spatial files",
+)
+@click.option(
+    "--srid", type=int, default=None, help="EPSG of the source data (shp2pgsql/ogr2ogr only)"
+)
+@click.option(
+    "--new-srid", type=int, default=None, help="Reproject to this EPSG (shp2pgsql/ogr2ogr only)"
+)
+@click.option(
+    "--if-exists",
+    type=click.Choice(["fail", "replace", "append"]),
+    default="fail",
+    show_default=True,
+)
+def import_files(
+    db_name,
+    config_key,
+    config_file,
+    jobs,
+    summary_file,
+    targets,
+    method,
+    srid,
+    new_srid,
+    if_exists,
+):
+    """
+    Import files into a database. Each target is formatted as FILEPATH=SCHEMA.TABLE
+
+    \b
+    e.g. pg import --db my_db -j 4 roads.shp=gis.roads counts.csv=raw.counts
+    """
+    for target in targets:
+        _split_target(target, "FILEPATH", "TABLE")
+
+    db = _database(db_name, config_key, config_file, jobs)
+
+    def import_one(target: str) -> None:
+        filepath, tablename = _split_target(target, "FILEPATH", "TABLE")
+
+        if Path(filepath).suffix.lower() in TABULAR_SUFFIXES:
+            db.import_file_with_pandas(
+                filepath, tablename, df_import_kwargs={"index": False, "if_exists": if_exists}
+            )
+
+        elif method == "shp2pgsql":
+            db.import_gis(
+                method="shp2pgsql",
+                filepath=filepath,
+                sql_tablename=tablename,
+                srid=srid,
+                new_srid=new_srid,
+            )
+
+        elif method == "ogr2ogr":
+            db.import_gis(
+                method="ogr2ogr",
+                filepath=filepath,
+                sql_tablename=tablename,
+                srid=srid,
+                new_srid=new_srid,
+                if_exists=if_exists,
+            )
+
+        else:
+            db.import_gis(
+                method="geopandas",
+                filepath=filepath,
+                sql_tablename=tablename,
+                gpd_kwargs={"if_exists": if_exists},
+            )
+
+    _run_and_report("import", import_one, list(targets), jobs, summary_file, [db])
+
+
+@click.command("export")
+@database_options
+@click.argument("targets", nargs=-1, required=True)
+@click.option(
+    "--method",
+    type=click.Choice(["geopandas", "ogr2ogr"]),
+    default="geopandas",
+    show_default=True,
+    help="Export method for spatial files",
+)
+def export_files(db_name, config_key, config_file, jobs, summary_file, targets, method):
+    """
+    Export tables or queries to files. Each target is formatted as TABLE_OR_SQL=FILEPATH
+
+    \b
+    e.g. pg export --db my_db -j 4 gis.roads=roads.geojson "SELECT * FROM raw.counts=counts.csv"
+    """
+    for target in targets:
+        _split_target(target, "TABLE_OR_SQL", "FILEPATH")
+
+    db = _database(db_name, config_key, config_file, jobs)
+
+    def export_one(target: str) -> None:
+        table_or_sql, filepath = _split_target(target, "TABLE_OR_SQL", "FILEPATH")
+        suffix = Path(filepath).suffix.lower()
+
+        if set(CSV_SUFFIXES) & {s.lower() for s in Path(filepath).suffixes}:
+            db.export_csv(table_or_sql, filepath)
+
+        elif method == "ogr2ogr":
+            if suffix not in OGR_DRIVERS:
+                raise ValueError(f"ogr2ogr can't export {suffix=}. Use one of: {list(OGR_DRIVERS)}")
+
+            db.export_gis(
+                method="ogr2ogr",
+                table_or_sql=table_or_sql,
+                filepath=filepath,
+                filetype=OGR_DRIVERS[suffix],
+            )
+
+        else:
+            # export_gis_with_geopandas() only prints a message for other suffixes
+            if suffix not in GEOPANDAS_SUFFIXES:
+                raise ValueError(
+                    f"geopandas can't export {suffix=}. Use one of: {GEOPANDAS_SUFFIXES + CSV_SUFFIXES}"
+                )
+
+            db.export_gis(
+                method="geopandas",
+                table_or_sql=table_or_sql,
+                filepath=filepath,
+                filetype=suffix[1:],
+            )
+
+    _run_and_report("export", export_one, list(targets), jobs, summary_file, [db])
+
+
+@click.command("copy")
+@database_options
+@click.argument("tables", nargs=-1, required=True)
+@click.option("--target-db", required=True, help="Name of the database to copy into")
+@click.option(
+    "--target-config-key",
+    default=None,
+    help="Config file entry for the target database. Defaults to --config-key",
+)
+@click.option(
+    "--method",
+    type=click.Choice(["pg_dump", "copy"]),
+    default="pg_dump",
+    show_default=True,
+    help="Pipe pg_dump into psql, or stream binary COPY without client binaries",
+)
+def copy_tables(
+    db_name,
+    config_key,
+    config_file,
+    jobs,
+    summary_file,
+    tables,
+    target_db,
+    target_config_key,
+    method,
+):
+    """
+    Copy tables from one database into another
+
+    \b
+    e.g. pg copy --db my_db --target-db scratch -j 4 gis.roads gis.parcels
+    """
+    source = _database(db_name, config_key, config_file, jobs)
+    target = _database(target_db, target_config_key or config_key, config_file, jobs)
+
+    def copy_one(tablename: str) -> None:
+        source.export_table_to_another_db(tablename, target, method=method)
+
+    _run_and_report("copy", copy_one, list(tables), jobs, summary_file, [source, target])
+
+
+@click.command("run")
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option("--jobs", "-j", default=None, type=int, help="Overrides 'jobs' in the manifest")
+@click.option("--force", is_flag=True, default=False, help="Run every step, even if unchanged")
+@click.option(
+    "--summary-file",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Write the JSON summary here instead of to stdout",
+)
+def run_manifest(manifest, jobs, force, summary_file):
+    """
+    Run an ETL manifest (.yml or .toml) as a DAG of parallel steps
+
+    \b
+    e.g. pg run etl.yml --jobs 4
+    """
+    from pg_data_etl.manifest import run_manifest as _run_manifest
+
+    with redirect_stdout(sys.stderr):
+        summary = _run_manifest(manifest, jobs=jobs, force=force)
+
+    output = json.dumps(summary, indent=2, default=str)
+
+    if summary_file:
+        Path(summary_file).write_text(output)
+    else:
+        click.echo(output)
+
+    if summary["failed"] or summary["blocked"]:
+        sys.exit(1)
+
+
+all_commands = [make_config_file, import_files, export_files, copy_tables, run_manifest]
 
 for cmd in all_commands:
     main.add_command(cmd)
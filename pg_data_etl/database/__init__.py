@@ -4,6 +4,7 @@
 """
 
 from __future__ import annotations
+import threading
 from pathlib import Path
 
 from pg_data_etl import helpers
@@ -69,12 +70,25 @@ class Database:
         """
 
         self._can_create_schemas = True
+        self._profiler = None
+        self._pool = None
+        self._engine = None
+        self._cache = None
+        self._session = threading.local()
+        self._routing = threading.local()
+        self._router = None
         self._init_kwargs = kwargs
 
         # Save all kwargs as private variables
         for key, value in kwargs.items():
             setattr(self, f"_{key}", value)
 
+        # Send reads to replicas, if any are configured
+        if kwargs.get("replicas"):
+            self._router = helpers.ReplicaRouter(
+                kwargs["replicas"], strategy=kwargs.get("replica_strategy") or "round_robin"
+            )
+
         # Set up the CommandPath subclass
         if self._bin_paths:
             self.cmd = helpers.CommandPathManager(**self._bin_paths)
@@ -159,6 +173,8 @@ class Database:
         super_pw: str | None = None,
         extras: str | None = None,
         bin_paths: dict | None = None,
+        replicas: list | str | None = None,
+        replica_strategy: str = "round_robin",
     ) -> Database:
         """
         - Build a `Database` from keyword arguments
@@ -167,6 +183,11 @@ class Database:
         explicitly declared, these values are assumed to be the same as the
         provided username/password
 
+        - `replicas` is a list (or comma-separated string) of read replica URIs.
+        Read-only methods like `df()`, `gdf()` and `query_as_*()` are sent to them,
+        picked by `replica_strategy` (`"round_robin"` or `"least_busy"`), falling back
+        to the primary if a replica can't be reached. See `pin_to_primary()`
+
         """
 
         if not super_un:
@@ -185,6 +206,8 @@ class Database:
             super_db=super_db,
             extras=extras,
             bin_paths=bin_paths,
+            replicas=replicas,
+            replica_strategy=replica_strategy,
         )
 
     @classmethod
@@ -192,11 +215,16 @@ class Database:
         cls,
         uri: str,
         bin_paths: dict | None = None,
+        replicas: list | str | None = None,
+        replica_strategy: str = "round_robin",
     ) -> Database:
         """
         - Build a `Database` through its URI
+        - See `from_parameters()` for `replicas` and `replica_strategy`
         """
-        return cls(uri=uri, bin_paths=bin_paths)
+        return cls(
+            uri=uri, bin_paths=bin_paths, replicas=replicas, replica_strategy=replica_strategy
+        )
 
     @classmethod
     def from_config(
@@ -208,6 +236,8 @@ class Database:
     ) -> Database:
         """
         - Build a `Database` with the configuration file support
+        - Read replicas can be listed in the config entry, e.g.
+        `replicas = postgresql://un:pw@replica-1:5432/gis, postgresql://un:pw@replica-2:5432/gis`
         """
         if config_filepath:
             config = configurations(filepath=Path(config_filepath))
@@ -216,10 +246,16 @@ class Database:
 
         return cls.from_parameters(db_name=db_name, bin_paths=bin_paths, **config[config_key])
 
+    # Connections
+    # -----------
+
+    from .actions import connection, sqlalchemy_connection, session, pin_to_primary
+    from .actions import enable_pool, close_pool, profile
+
     # Administration
     # --------------
 
-    from .actions import exists, admin, schema_add, load_from_dumpfile
+    from .actions import exists, admin, schema_add, load_from_dumpfile, clone
 
     # Change Things Within Database
     # -----------------------------
@@ -232,23 +268,27 @@ class Database:
         gis_table_update_spatial_data_projection,
         gis_table_lint_geom_colname,
         gis_table_add_spatial_index,
+        gis_table_cluster_on_spatial_index,
     )
 
     # Lists of Content
     # ----------------
 
-    from .actions import tables, schemas, columns, views, report_spatial, projection
+    from .actions import tables, schemas, columns, views, report_spatial, projection, table_stats
+    from .actions import table_partitions
 
     # Get Data Out of Database To Memory
     # ----------------------------------
 
-    from .actions import gdf, df
+    from .actions import gdf, gdf_bbox, iter_tiles, df, arrow, arrow_batches
+    from .actions import enable_cache, disable_cache, cache_stats
     from .actions import query_as_list_of_lists as query
     from .actions import (
         query_as_singleton,
         query_as_list_of_singletons,
         query_as_list_of_lists,
     )
+    from .actions import map_query
 
     # Get Data Out of Database To File
     # --------------------------------
@@ -256,16 +296,22 @@ class Database:
     from .actions import (
         dump,
         export_gis,
+        export_arrow,
+        export_csv,
         export_entire_db_to_another_db,
         export_table_to_another_db,
+        copy_query_to_another_db,
     )
 
     # Put Files Into Database
     # -----------------------
 
-    from .actions import import_gis, import_file_with_pandas
+    from .actions import import_gis, import_file_with_pandas, import_xlsx
 
     # Put In-Memory Data Into Database
     # --------------------------------
 
     from .actions import import_dataframe, import_geodataframe
+
+
+from .group import DatabaseGroup  # noqa
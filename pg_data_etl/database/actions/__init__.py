@@ -1,9 +1,12 @@
 from .query import *  # noqa
 from .admin import *  # noqa
 from .backup import *  # noqa
+from .checkpoints import *  # noqa
 from .copy import *  # noqa
 from .data_export import *  # noqa
+from .import_excel import *  # noqa
 from .import_geo_data import *  # noqa
 from .import_tabular_data import *  # noqa
 from .load_from_dumpfile import *  # noqa
+from .partitions import *  # noqa
 from .reports import *  # noqa
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from pg_data_etl import helpers
+from pg_data_etl import helpers, instrumentation
 
 
 def dump(self, output_folder: str = ".") -> Path:
@@ -25,6 +25,10 @@ def dump(self, output_folder: str = ".") -> Path:
 
     print(command)
 
-    helpers.run_command_in_shell(command)
+    with instrumentation.track("dump", db=self) as event:
+        helpers.run_command_in_shell(command)
+
+        if instrumentation.enabled():
+            event.bytes = helpers.filesize_in_bytes(output_filepath)
 
     return output_filepath
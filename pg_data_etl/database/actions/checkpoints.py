@@ -0,0 +1,147 @@
+from __future__ import annotations
+import hashlib
+from pathlib import Path
+from typing import Callable, Iterable
+
+from pg_data_etl import helpers
+
+PROGRESS_TABLE = "public.pg_data_etl_import_progress"
+
+
+def _source_fingerprint(filepath: Path | str, chunksize: int) -> str:
+    """
+    - Identify a source file and chunking, so progress is only ever resumed against the same data
+    - Built from the resolved path, size, modification time, the first MB of content and `chunksize`
+
+    Arguments:
+        filepath (Path | str): source file, or folder for multi-file formats
+        chunksize (int): number of rows per chunk
+
+    Returns:
+        str: hex digest
+    """
+
+    filepath = Path(filepath).resolve()
+    stat = filepath.stat()
+
+    digest = hashlib.sha256()
+    digest.update(f"{filepath}|{stat.st_size}|{stat.st_mtime_ns}|{chunksize}".encode())
+
+    if filepath.is_file():
+        with open(filepath, "rb") as f:
+            digest.update(f.read(1024 * 1024))
+
+    return digest.hexdigest()
+
+
+def _committed_chunks(self, tablename: str, fingerprint: str) -> set:
+    """
+    - Get the chunk numbers that already loaded into `tablename` from this source
+    - Progress left behind by a different source is cleared
+    """
+
+    self.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (
+            tablename text,
+            fingerprint text,
+            chunk integer,
+            rows integer,
+            loaded_at timestamptz DEFAULT now(),
+            PRIMARY KEY (tablename, fingerprint, chunk)
+        );
+    """)
+
+    self.execute(f"""
+        DELETE FROM {PROGRESS_TABLE}
+        WHERE tablename = '{tablename}' AND fingerprint <> '{fingerprint}';
+    """)
+
+    query = f"""
+        SELECT chunk FROM {PROGRESS_TABLE}
+        WHERE tablename = '{tablename}' AND fingerprint = '{fingerprint}'
+    """
+
+    return set(self.query_as_list_of_singletons(query))
+
+
+def _clear_progress(self, tablename: str) -> None:
+    if self.query_as_singleton(f"SELECT to_regclass('{PROGRESS_TABLE}') IS NOT NULL"):
+        self.execute(f"DELETE FROM {PROGRESS_TABLE} WHERE tablename = '{tablename}';")
+
+
+def _import_in_chunks(
+    self,
+    chunks: Iterable,
+    tablename: str,
+    fingerprint: str,
+    if_exists: str,
+    write_chunk: Callable,
+    finalize: Callable | None = None,
+    resume: bool = True,
+) -> int:
+    """
+    - Load `chunks` one transaction at a time, recording each committed chunk in the
+    progress table inside the same transaction
+    - When a previous call with the same source failed part-way, the chunks it
+    committed are skipped, so no row is ever loaded twice
+    - Progress is cleared once every chunk is loaded and `finalize()` has run
+
+    Arguments:
+        chunks (Iterable): dataframes, in a repeatable order
+        tablename (str): name of the table being loaded
+        fingerprint (str): identifies the source, see `_source_fingerprint()`
+        if_exists (str): `to_sql()` behavior for the first chunk of a fresh import
+        write_chunk (Callable): `write_chunk(df, connection, if_exists)` writes one chunk
+        finalize (Callable | None): run once after the last chunk, e.g. to add indexes
+        resume (bool): set to `False` to discard earlier progress and start over
+
+    Returns:
+        int: number of rows loaded by this call
+    """
+
+    import sqlalchemy
+
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+    tablename = f"{schema}.{tbl}"
+
+    if not resume:
+        _clear_progress(self, tablename)
+
+    done = _committed_chunks(self, tablename, fingerprint)
+
+    if done:
+        print(f"Resuming the import into {tablename}, skipping {len(done)} loaded chunks")
+
+    record_progress = sqlalchemy.text(f"""
+        INSERT INTO {PROGRESS_TABLE} (tablename, fingerprint, chunk, rows)
+        VALUES (:tablename, :fingerprint, :chunk, :rows)
+    """)
+
+    rows_loaded = 0
+
+    for number, df in enumerate(chunks):
+        if number in done:
+            continue
+
+        with self.sqlalchemy_connection() as connection:
+            write_chunk(df, connection, "append" if (done or number) else if_exists)
+
+            connection.execute(
+                record_progress,
+                {
+                    "tablename": tablename,
+                    "fingerprint": fingerprint,
+                    "chunk": number,
+                    "rows": len(df),
+                },
+            )
+
+        done.add(number)
+        rows_loaded += len(df)
+
+    if finalize:
+        finalize()
+
+    _clear_progress(self, tablename)
+
+    return rows_loaded
@@ -1,13 +1,40 @@
-from pg_data_etl import helpers
+from __future__ import annotations
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
+from pg_data_etl import helpers, instrumentation
 
-def export_table_to_another_db(self, table_to_copy: str, target_db) -> None:
+from .query.connection import _savepoint
+
+
+def export_table_to_another_db(
+    self,
+    table_to_copy: str,
+    target_db,
+    method: str = "pg_dump",
+    workers: int = 1,
+    split_on: str | None = None,
+) -> None:
     """
-    - Pipe data directly from a pg_dump of one DB into another using psql
+    - Copy a table from this database into `target_db`
+    - `method="pg_dump"` pipes data directly from a pg_dump of one DB into another using psql
+    - `method="copy"` doesn't need any client binaries. It re-creates the table from the
+    system catalogs and streams `COPY ... (FORMAT binary)` straight from one connection
+    into the other. Primary keys, unique/check constraints and indexes are added after the
+    data is loaded, and serial sequences are set to continue after the copied values
+    - With `method="copy"` and `workers > 1`, the table is split into ranges that are copied
+    over parallel connections. All ranges read from the same snapshot of the source table.
+    Ranges are split on physical location (`ctid`) unless a numeric `split_on` column is given
 
     Arguments:
         table_to_copy (str): name of table that you want to copy
         target_db (Database): database where you want the data copied to
+        method (str): `"pg_dump"` or `"copy"`
+        workers (int): number of parallel connections, only used when `method="copy"`
+        split_on (str | None): numeric column, e.g. `"uid"`, used to split the table into key ranges
 
     Returns:
         None: although it makes a copy of the table inside `target_db`
@@ -18,52 +45,732 @@ def export_table_to_another_db(self, table_to_copy: str, target_db) -> None:
         schema = table_to_copy.split(".")[0]
         target_db.schema_add(schema)
 
+    if method == "copy":
+        # The catalog reads must match the snapshot taken on the source's primary
+        with instrumentation.track("export_table_to_another_db.copy", table_to_copy, db=self) as e:
+            with self.pin_to_primary(), target_db.pin_to_primary():
+                e.rows, e.bytes = _copy_table(self, table_to_copy, target_db, workers, split_on)
+
+                target_db.gis_table_lint_geom_colname(table_to_copy)
+
+        return None
+
+    if method != "pg_dump":
+        raise ValueError(f"{method=} is not supported. Valid options include: ['pg_dump', 'copy']")
+
     pg_dump = self.cmd.pg_dump
-    command = f"{pg_dump} --no-owner --no-acl -t {table_to_copy} {self.uri} | psql {target_db.uri}"
+    psql = target_db.cmd.psql
+    command = (
+        f"{pg_dump} --no-owner --no-acl -t {table_to_copy} {self.uri} | {psql} {target_db.uri}"
+    )
 
     print(command)
-    helpers.run_command_in_shell(command)
 
-    self.gis_table_lint_geom_colname(target_db, table_to_copy)
+    with instrumentation.track("export_table_to_another_db", table_to_copy, db=self):
+        with target_db.pin_to_primary():
+            helpers.run_command_in_shell(command)
+
+            target_db.gis_table_lint_geom_colname(table_to_copy)
 
     return None
 
 
-def export_entire_db_to_another_db(self, target_db) -> None:
+# Streaming COPY between connections
+# ----------------------------------
+
+
+class _CopyStream:
+    """
+    A bounded, in-memory pipe between a `COPY ... TO STDOUT` on one connection
+    and a `COPY ... FROM STDIN` on another.
+
+    The source side calls `write()` and then `finish()`. The target side calls `read()`,
+    which raises the source's error instead of reporting a clean end of data, so
+    a failed export can never be committed as a partial import.
+    """
+
+    def __init__(self, max_chunks: int = 64):
+        self._chunks = queue.Queue(max_chunks)
+        self._buffer = b""
+        self._finished = False
+        self.error = None
+        self.abandoned = False
+        self.bytes = 0
+
+    def _put(self, item) -> None:
+        while not self.abandoned:
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+        raise BrokenPipeError("The target connection stopped reading")
+
+    def write(self, data) -> int:
+        self._put(bytes(data))
+        self.bytes += len(data)
+        return len(data)
+
+    def finish(self, error: BaseException | None = None) -> None:
+        self.error = error
+
+        try:
+            self._put(None)
+        except BrokenPipeError:
+            pass
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._finished and (size < 0 or len(self._buffer) < size):
+            chunk = self._chunks.get()
+
+            if chunk is None:
+                self._finished = True
+                if self.error:
+                    raise RuntimeError("The source COPY failed") from self.error
+            else:
+                self._buffer += chunk
+
+        if size < 0:
+            size = len(self._buffer)
+
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+
+        return data
+
+
+@contextmanager
+def _own_connection(db):
+    """
+    - A `psycopg2` connection that's kept out of the pool, committed if the block succeeds
+    """
+
+    import psycopg2
+
+    with instrumentation.waiting():
+        conn = psycopg2.connect(db.uri)
+
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _stream_copy(
+    source_db,
+    copy_out: str,
+    target_db,
+    copy_in: str,
+    snapshot: str | None = None,
+    pooled: bool = True,
+) -> tuple:
+    """
+    - Stream the output of `copy_out` on `source_db` into `copy_in` on `target_db`
+    - If a `snapshot` is given, the source reads from that exported snapshot
+    - With `pooled=False` both sides open their own connections. Parallel streams need
+    this: a source holding a pooled connection blocks once its stream is full, and can
+    starve a stream whose target already holds the other side's last pooled connection
+
+    Returns:
+        tuple: (rows loaded, bytes transferred)
+    """
+
+    stream = _CopyStream()
+
+    def connect(db):
+        return db.connection() if pooled else _own_connection(db)
+
+    def export():
+        try:
+            with connect(source_db) as connection:
+                cursor = connection.cursor()
+
+                if snapshot:
+                    cursor.execute(
+                        "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY;"
+                        f"SET TRANSACTION SNAPSHOT '{snapshot}';"
+                    )
+
+                cursor.copy_expert(copy_out, stream)
+                cursor.close()
+
+        except BaseException as e:
+            stream.finish(e)
+        else:
+            stream.finish()
+
+    thread = threading.Thread(target=export, daemon=True)
+    thread.start()
+
+    try:
+        with connect(target_db) as connection:
+            cursor = connection.cursor()
+            cursor.copy_expert(copy_in, stream)
+            rows = cursor.rowcount
+            cursor.close()
+    finally:
+        stream.abandoned = True
+        thread.join()
+
+    return rows, stream.bytes
+
+
+def _quoted(tablename: str) -> str:
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+
+    return f'"{schema}"."{tbl}"'
+
+
+# Table definitions from the catalogs
+# -----------------------------------
+
+
+def _table_definition(db, tablename: str) -> dict:
+    """
+    - Read the columns, constraints, indexes and sequences of a table from the system catalogs
+
+    Returns:
+        dict: with `columns`, `copy_columns`, `sequences`, `constraints` and `indexes` lists
+    """
+
+    table = _quoted(tablename)
+
+    column_query = f"""
+        SELECT
+            a.attname,
+            format_type(a.atttypid, a.atttypmod),
+            a.attnotnull,
+            pg_get_expr(d.adbin, d.adrelid),
+            a.attidentity,
+            a.attgenerated,
+            pg_get_serial_sequence('{table}', a.attname)
+        FROM pg_attribute a
+        LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+        WHERE a.attrelid = '{table}'::regclass AND a.attnum > 0 AND NOT a.attisdropped
+        ORDER BY a.attnum
+    """
+
+    columns, copy_columns, sequences = [], [], []
+
+    for name, data_type, not_null, default, identity, generated, sequence in db.query(column_query):
+        column = f'"{name}" {data_type}'
+
+        if generated == "s":
+            column += f" GENERATED ALWAYS AS ({default}) STORED"
+        else:
+            copy_columns.append(f'"{name}"')
+
+            if identity:
+                column += " GENERATED BY DEFAULT AS IDENTITY"
+            elif default:
+                column += f" DEFAULT {default}"
+
+        if not_null:
+            column += " NOT NULL"
+
+        columns.append(column)
+
+        if sequence:
+            sequences.append({"column": name, "sequence": sequence, "identity": bool(identity)})
+
+    # Foreign keys are left out, the tables they point at may not exist in the target
+    constraint_query = f"""
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = '{table}'::regclass AND contype IN ('p', 'u', 'c', 'x')
+        ORDER BY contype DESC
+    """
+
+    constraints = [
+        f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition};'
+        for name, definition in db.query(constraint_query)
+    ]
+
+    index_query = f"""
+        SELECT pg_get_indexdef(x.indexrelid)
+        FROM pg_index x
+        WHERE x.indrelid = '{table}'::regclass
+        AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+    """
+
+    indexes = [f"{definition};" for definition in db.query_as_list_of_singletons(index_query)]
+
+    return {
+        "columns": columns,
+        "copy_columns": copy_columns,
+        "sequences": sequences,
+        "constraints": constraints,
+        "indexes": indexes,
+    }
+
+
+def _split_ranges(
+    db, tablename: str | None, workers: int, split_on: str | None, query: str | None = None
+) -> list:
+    """
+    - Get `WHERE` clauses that split a table into `workers` ranges of similar size
+    - Pass a `query` instead of a `tablename` to split its output, which needs a `split_on` column
+    """
+
+    if workers < 2:
+        return ["TRUE"]
+
+    if query:
+        if not split_on:
+            raise ValueError("Splitting the output of a query needs a numeric split_on column")
+
+        table = f"({query}) AS q"
+    else:
+        table = _quoted(tablename)
+
+    if split_on:
+        low, high = db.query(
+            f'SELECT min("{split_on}")::numeric, max("{split_on}")::numeric FROM {table}'
+        )[0]
+
+        if low is None:
+            return ["TRUE"]
+
+        step = (high - low) / workers
+        bounds = [low + step * i for i in range(1, workers)]
+        column = f'"{split_on}"'
+
+    else:
+        pages = db.query_as_singleton(
+            f"SELECT pg_relation_size('{table}') / current_setting('block_size')::int"
+        )
+        step = max(pages // workers, 1)
+        bounds = sorted({step * i for i in range(1, workers) if step * i < pages})
+        bounds = [f"'({b},0)'::tid" for b in bounds]
+        column = "ctid"
+
+    if not bounds:
+        return ["TRUE"]
+
+    ranges = [f"{column} < {bounds[0]}"]
+    ranges += [
+        f"{column} >= {lower} AND {column} < {upper}" for lower, upper in zip(bounds, bounds[1:])
+    ]
+
+    # The last range also picks up anything past the last boundary, and NULL keys
+    ranges.append(f"{column} >= {bounds[-1]} OR {column} IS NULL")
+
+    return ranges
+
+
+def _copy_table(self, tablename: str, target_db, workers: int, split_on: str | None) -> tuple:
+    """
+    - Copy a table with binary COPY, see `export_table_to_another_db(method="copy")`
+
+    Returns:
+        tuple: (rows copied, bytes transferred)
+    """
+
+    table = _quoted(tablename)
+
+    if target_db.query_as_singleton(f"SELECT to_regclass('{table}') IS NOT NULL"):
+        raise ValueError(f"Table '{tablename}' already exists in the target database")
+
+    definition = _table_definition(self, tablename)
+    columns = ", ".join(definition["copy_columns"])
+
+    # Serial columns need their sequence to exist before the table does
+    create_sequences = [
+        f"CREATE SEQUENCE IF NOT EXISTS {s['sequence']};"
+        for s in definition["sequences"]
+        if not s["identity"]
+    ]
+
+    create_table = f"CREATE TABLE {table} (\n    " + ",\n    ".join(definition["columns"]) + "\n);"
+
+    target_db.execute("\n".join(create_sequences + [create_table]))
+
+    import psycopg2
+
+    # Hold a snapshot open so that every range reads the same version of the table.
+    # This connection, like the ones for each range, is kept out of the pool so it
+    # can't starve the workers
+    snapshot_connection = psycopg2.connect(self.uri)
+
+    try:
+        cursor = snapshot_connection.cursor()
+        cursor.execute(
+            "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY;"
+            "SELECT pg_export_snapshot();"
+        )
+        snapshot = cursor.fetchone()[0]
+
+        ranges = _split_ranges(self, tablename, workers, split_on)
+
+        def copy_range(where: str) -> tuple:
+            return _stream_copy(
+                self,
+                f"COPY (SELECT {columns} FROM {table} WHERE {where}) TO STDOUT (FORMAT binary)",
+                target_db,
+                f"COPY {table} ({columns}) FROM STDIN (FORMAT binary)",
+                snapshot=snapshot,
+                pooled=False,
+            )
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            results = list(executor.map(copy_range, ranges))
+
+    except BaseException:
+        # Don't leave a partially loaded table behind
+        target_db.execute(f"DROP TABLE IF EXISTS {table};")
+        raise
+
+    finally:
+        snapshot_connection.close()
+
+    # Build constraints and indexes once, after all of the data is in place
+    post_load = definition["constraints"] + definition["indexes"]
+
+    for s in definition["sequences"]:
+        if not s["identity"]:
+            post_load.append(f'ALTER SEQUENCE {s["sequence"]} OWNED BY {table}."{s["column"]}";')
+
+        # Continue numbering after the copied values
+        post_load.append(f"""
+            SELECT setval(
+                pg_get_serial_sequence('{table}', '{s["column"]}'),
+                coalesce(max("{s["column"]}"), 1),
+                max("{s["column"]}") IS NOT NULL
+            ) FROM {table};
+        """)
+
+    post_load.append(f"ANALYZE {table};")
+
+    target_db.execute("\n".join(post_load))
+
+    rows = sum(r[0] for r in results)
+    num_bytes = sum(r[1] for r in results)
+
+    print(f"Copied {rows} rows ({num_bytes} bytes) of {tablename} over {len(ranges)} connection(s)")
+
+    return rows, num_bytes
+
+
+def _query_columns(db, query: str) -> list:
+    """
+    - Get `(name, type)` pairs for the columns a query returns
+    - A temporary view is used so that type modifiers are kept where Postgres knows them,
+    e.g. `varchar(20)`, `numeric(10,2)` or `geometry(Point,2272)` for columns selected as-is
+    """
+
+    with db.connection() as connection:
+        # Throw the view away afterwards, without rolling back the rest of a `session()`
+        with _savepoint(connection, rollback=True):
+            cursor = connection.cursor()
+            cursor.execute(f"CREATE TEMPORARY VIEW pg_data_etl_query_columns AS {query}")
+            cursor.execute("""
+                SELECT attname, format_type(atttypid, atttypmod)
+                FROM pg_attribute
+                WHERE attrelid = 'pg_data_etl_query_columns'::regclass AND attnum > 0
+                ORDER BY attnum
+            """)
+            columns = cursor.fetchall()
+            cursor.close()
+
+    return columns
+
+
+def copy_query_to_another_db(
+    self, query: str, target_db, new_table: str, if_exists: str = "fail"
+) -> None:
+    """
+    - Stream the result of a query into a new table in `target_db`, e.g. one county,
+    a few columns or recent years, without copying the whole source table
+    - Data moves as binary `COPY`, straight from one connection to the other
+    - Geometry columns keep their type and SRID, so they're registered in `geometry_columns`.
+    If the query computes a geometry (e.g. `ST_Buffer(geom, 100)`), the type and SRID are
+    read from the copied rows with `Populate_Geometry_Columns()`. Every geometry column
+    gets a spatial index
+
+    ```python
+    >>> query = "SELECT uid, name, geom FROM gis.parcels WHERE county = 'Bucks'"
+    >>> db.copy_query_to_another_db(query, scratch_db, "gis.bucks_parcels")
+    ```
+
+    Arguments:
+        query (str): any valid `SELECT` query
+        target_db (Database): database where the new table should go
+        new_table (str): name of the new table, optionally with schema prefix
+        if_exists (str): `"fail"` or `"replace"`, if `new_table` already exists in `target_db`
+
+    Returns:
+        None: but creates `new_table` inside `target_db`
+    """
+
+    schema, tbl = helpers.convert_full_tablename_to_parts(new_table)
+    table = _quoted(new_table)
+    query = query.strip().rstrip(";")
+
+    if target_db.query_as_singleton(f"SELECT to_regclass('{table}') IS NOT NULL"):
+        if if_exists == "replace":
+            target_db.execute(f"DROP TABLE {table};")
+        else:
+            raise ValueError(f"Table '{new_table}' already exists in the target database")
+
+    columns = _query_columns(self, query)
+    geom_columns = [name for name, data_type in columns if data_type.startswith("geometry")]
+
+    target_db.schema_add(schema)
+    target_db.execute(
+        f"CREATE TABLE {table} (\n    "
+        + ",\n    ".join(f'"{name}" {data_type}' for name, data_type in columns)
+        + "\n);"
+    )
+
+    with instrumentation.track("copy_query_to_another_db", query, db=self) as event:
+        try:
+            rows, num_bytes = _stream_copy(
+                self,
+                f"COPY ({query}) TO STDOUT (FORMAT binary)",
+                target_db,
+                f"COPY {table} FROM STDIN (FORMAT binary)",
+            )
+        except BaseException:
+            target_db.execute(f"DROP TABLE IF EXISTS {table};")
+            raise
+
+        event.rows, event.bytes = rows, num_bytes
+
+    post_load = []
+
+    # Computed geometries have no type modifier, so work it out from the copied rows
+    if "geometry" in [data_type for _, data_type in columns]:
+        post_load.append(f"SELECT Populate_Geometry_Columns('{table}'::regclass);")
+
+    post_load += [f'CREATE INDEX ON {table} USING GIST ("{name}");' for name in geom_columns]
+    post_load.append(f"ANALYZE {table};")
+
+    target_db.execute("\n".join(post_load))
+
+    print(f"Copied {rows} rows ({num_bytes} bytes) from query into {new_table}")
+
+    return None
+
+
+CLONE_CONNECTIONS = ["fail", "wait", "terminate"]
+
+
+def _cluster_id(db) -> str | None:
+    """
+    - Get an identifier for the server a database lives on, or `None` if it can't be
+    read (e.g. the user isn't allowed to call `pg_control_system()`)
+    - Physical replicas and `pg_basebackup` copies share their primary's
+    `system_identifier`, so the server's address and port are part of the identifier too
+    """
+
+    query = """
+        SELECT concat_ws(':', system_identifier, inet_server_addr(), inet_server_port())
+        FROM pg_control_system()
+    """
+
+    try:
+        return str(db.query_as_singleton(query, super_uri=True))
+    except Exception:
+        return None
+
+
+def _same_cluster(self, target_db) -> bool:
+    source_id = _cluster_id(self)
+
+    return source_id is not None and source_id == _cluster_id(target_db)
+
+
+def _other_connections(self) -> int:
+    db_name = self.connection_params["db_name"]
+
+    query = f"""
+        SELECT count(*) FROM pg_stat_activity
+        WHERE datname = '{db_name}' AND pid <> pg_backend_pid()
+    """
+
+    return self.query_as_singleton(query, super_uri=True)
+
+
+def _create_from_template(self, target_db, connections: str, timeout: float) -> None:
+    """
+    - Create `target_db` with `CREATE DATABASE ... TEMPLATE`, which copies the source's
+    files on the server instead of dumping and replaying them
+    - `STRATEGY FILE_COPY` is used on Postgres 15+, which skips writing every block to WAL
+    - Postgres refuses to use a database as a template while anyone else is connected to it
+    """
+
+    if connections not in CLONE_CONNECTIONS:
+        raise ValueError(f"{connections=} is not valid. Options include: {CLONE_CONNECTIONS}")
+
+    source_name = self.connection_params["db_name"]
+    target_name = target_db.connection_params["db_name"]
+
+    if connections == "wait":
+        deadline = time.monotonic() + timeout
+
+        while _other_connections(self):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"'{source_name}' still has open connections after {timeout}s")
+
+            time.sleep(1)
+
+    sql = f"CREATE DATABASE {target_name} TEMPLATE {source_name}"
+
+    if int(self.query_as_singleton("SHOW server_version_num", super_uri=True)) >= 150000:
+        sql += " STRATEGY FILE_COPY"
+
+    statements = [sql]
+
+    # Terminate in the same psql call, so there's less time for new connections to appear
+    if connections == "terminate":
+        statements.insert(
+            0,
+            f"SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+            f"WHERE datname = '{source_name}' AND pid <> pg_backend_pid()",
+        )
+
+    flags = " ".join(f'-c "{statement};"' for statement in statements)
+
+    helpers.run_command_in_shell(
+        f"{target_db.cmd.psql} -v ON_ERROR_STOP=1 {flags} {target_db.uri_superuser}"
+    )
+
+    if not target_db.exists():
+        raise RuntimeError(
+            f"CREATE DATABASE {target_name} TEMPLATE {source_name} failed. "
+            "If other sessions are connected to the source, use connections='wait' or 'terminate'"
+        )
+
+
+def export_entire_db_to_another_db(
+    self, target_db, method: str = "auto", connections: str = "fail", timeout: float = 60
+) -> None:
     """
     - Copy an entire database to a new database.
 
-    - To get around memory error limitations, this is done in two steps as opposed to a single
-    command with a pipe:
+    - When both databases are on the same cluster, the copy is made with
+    `CREATE DATABASE ... TEMPLATE`, which copies the files on the server and takes seconds
+    instead of hours. Postgres needs the source to have no other connections for this,
+    which `connections` controls
+
+    - Otherwise, to get around memory error limitations, this is done in two steps as
+    opposed to a single command with a pipe:
         Step 1) Backup the source db to .sql file with pg_dump
         Step 2) Load the .sql file into the target db with psql
 
     Arguments:
         target_db (Database): new database (that doesn't exist yet) where you want the data
+        method (str): `"template"`, `"dump"`, or `"auto"` to use a template whenever the
+        databases are on the same cluster, and fall back to a dump if the template fails
+        connections (str): when using a template and others are connected to the source,
+        `"fail"`, `"wait"` up to `timeout` seconds for them to leave, or `"terminate"` them
+        timeout (float): seconds to wait when `connections="wait"`
 
     Returns:
         None: although it makes a full copy the source database in `target_db`
     """
 
+    if method not in ["auto", "template", "dump"]:
+        raise ValueError(f"{method=} is not valid. Use 'auto', 'template' or 'dump'")
+
+    method_requested = method
+
     if target_db.exists():
         target_db_name = target_db.connection_params["db_name"]
         print(f"A database named '{target_db_name}' already exists.")
         print("Use a different name or drop this database first before copying into it.")
         return None
 
+    if method != "dump":
+        same_cluster = _same_cluster(self, target_db)
+
+        if method == "template" and not same_cluster:
+            raise ValueError("method='template' needs both databases on the same cluster")
+
+        if method == "auto" and same_cluster:
+            # Don't let the default method fail where a dump would have worked
+            if connections == "fail" and _other_connections(self):
+                print("The source database has other connections, copying it with pg_dump")
+                same_cluster = False
+
+        method = "template" if same_cluster else "dump"
+
+    with instrumentation.track("export_entire_db_to_another_db", method, db=self):
+        if method == "template":
+            try:
+                _create_from_template(self, target_db, connections, timeout)
+            except (RuntimeError, TimeoutError) as e:
+                if method_requested != "auto":
+                    raise
+
+                print(f"{e}\nCopying with pg_dump instead")
+                method = "dump"
+
+        if method == "dump":
+            sql_filepath = self.dump()
+
+            target_db.admin("CREATE")
+
+            command = f'{target_db.cmd.psql} -f  "{sql_filepath}" {target_db.uri}'
+
+            with target_db.pin_to_primary():
+                helpers.run_command_in_shell(command)
+
+                # Ensure that spatial tables have 'geom' instead of 'shape' columns
+                for table in target_db.tables(spatial_only=True):
+                    target_db.gis_table_lint_geom_colname(table)
+
+            # Delete the .sql file from disk
+            sql_filepath.unlink()
+
+    return None
+
+
+def clone(self, db_name: str, connections: str = "fail", timeout: float = 60):
+    """
+    - Make a disposable copy of this database on the same cluster, e.g. for tests or
+    scratch work, with `CREATE DATABASE ... TEMPLATE`
+    - The copy is exact, and takes seconds even for large databases
+    - Postgres needs the source to have no other connections while it's copied.
+    Call `close_pool()` first if this `Database` has a pool
+
+    ```python
+    >>> scratch = db.clone("gis_scratch")
+    >>> scratch.execute("DELETE FROM parcels WHERE county <> 'Delaware'")
+    >>> scratch.admin("DROP")
+    ```
+
+    Arguments:
+        db_name (str): name of the new database, which must not exist yet
+        connections (str): if others are connected to the source, `"fail"`, `"wait"` up
+        to `timeout` seconds for them to leave, or `"terminate"` them
+        timeout (float): seconds to wait when `connections="wait"`
+
+    Returns:
+        Database: connected to the new copy, with the same credentials as this one
+    """
+
+    kwargs = dict(self._init_kwargs)
+
+    # A brand new database hasn't been replicated anywhere yet
+    kwargs.pop("replicas", None)
+
+    if self.CREATED_BY_URI:
+        params = helpers.decode_uri(self._uri)
+        params["db_name"] = db_name
+        kwargs["uri"] = helpers.generate_uri(**params)
     else:
-        sql_filepath = self.dump()
+        kwargs["db_name"] = db_name
 
-        target_db.admin("CREATE")
+    target_db = type(self)(**kwargs)
 
-        command = f'{target_db.cmd.psql} -f  "{sql_filepath}" {target_db.uri}'
-        helpers.run_command_in_shell(command)
+    if target_db.exists():
+        raise ValueError(f"A database named '{db_name}' already exists")
 
-        # Ensure that spatial tables have 'geom' instead of 'shape' columns
-        for table in target_db.tables(spatial_only=True):
-            target_db.gis_table_lint_geom_colname(table)
+    with instrumentation.track("clone", db_name, db=self):
+        _create_from_template(self, target_db, connections, timeout)
 
-        # Delete the .sql file from disk
-        sql_filepath.unlink()
+    print(f"Cloned {self.connection_params['db_name']} into {db_name}")
 
-        return None
+    return target_db
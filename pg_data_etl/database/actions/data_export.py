@@ -1,7 +1,14 @@
 from __future__ import annotations
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from pg_data_etl import helpers
+from pg_data_etl import helpers, instrumentation
+
+from .copy import _quoted, _split_ranges
+from .query.data_arrow import arrow_batches
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
 
 
 def export_shp_with_pgsql2shp(self, table_or_sql: str, filepath: Path) -> None:
@@ -23,9 +30,9 @@ def export_shp_with_pgsql2shp(self, table_or_sql: str, filepath: Path) -> None:
     else:
         query = f"SELECT * FROM {table_or_sql}"
 
-    params = self.connection_params()
+    params = self.connection_params
 
-    command = f'pgsql2shp -f "{filepath}" -h {params["host"]} -u {params["un"]} -P {params["pw"]} -p {params["port"]} {params["db_name"]} "{query}" '
+    command = f'{self.cmd.pgsql2shp} -f "{filepath}" -h {params["host"]} -u {params["un"]} -P {params["pw"]} -p {params["port"]} {params["db_name"]} "{query}" '
     print(command)
 
     helpers.run_command_in_shell(command)
@@ -118,4 +125,266 @@ def export_gis(self, method="geopandas", **kwargs):
 
     func = method_mapper[method]
 
-    func(self, **kwargs)
+    table_or_sql = kwargs.get("table_or_sql")
+
+    with instrumentation.track(f"export_gis.{method}", table_or_sql, db=self) as event:
+        func(self, **kwargs)
+
+        if "filepath" in kwargs and instrumentation.enabled():
+            event.bytes = helpers.filesize_in_bytes(kwargs["filepath"])
+
+
+def export_arrow(
+    self,
+    table_or_sql: str,
+    filepath: Path | str,
+    compression: str | None = None,
+    batch_size: int = 100_000,
+) -> Path:
+    """
+    - Write a table or query to an Arrow IPC (Feather v2) file, one record batch at a time
+    - Uncompressed files can be memory-mapped by downstream tools without copying,
+    e.g. `pyarrow.ipc.open_file(pyarrow.memory_map(filepath))`
+
+    Arguments:
+        table_or_sql (str): name of a table, or a full query
+        filepath (Path | str): file to write, e.g. "centerlines.arrow"
+        compression (str | None): `"lz4"` or `"zstd"` to compress the batches
+        batch_size (int): rows per batch, for the server-side cursor fallback
+
+    Returns:
+        Path: the file that was written
+    """
+
+    import pyarrow as pa
+
+    if helpers.this_is_raw_sql(table_or_sql):
+        query = table_or_sql
+    else:
+        query = f"SELECT * FROM {table_or_sql}"
+
+    filepath = Path(filepath)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+
+    with instrumentation.track("export_arrow", table_or_sql, db=self) as event:
+        batches = arrow_batches(self, query, batch_size)
+        schema = next(batches)
+
+        rows = 0
+
+        with pa.ipc.new_file(str(filepath), schema, options=options) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+
+        event.rows = rows
+        if instrumentation.enabled():
+            event.bytes = helpers.filesize_in_bytes(filepath)
+
+    print(f"Wrote {rows:,} rows to {filepath}")
+
+    return filepath
+
+
+class _CountingWriter:
+    """
+    - File-like wrapper that counts the bytes `COPY` writes through it
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.bytes = 0
+
+    def write(self, data) -> int:
+        self.bytes += len(data)
+        return self.f.write(data)
+
+
+def _open_for_writing(filepath: Path, compression: str | None):
+    if compression is None:
+        return open(filepath, "wb")
+
+    if compression == "gzip":
+        import gzip
+
+        # A low level keeps gzip from being the bottleneck of the export
+        return gzip.open(filepath, "wb", compresslevel=3)
+
+    if compression == "zstd":
+        try:
+            from compression import zstd
+
+            return zstd.open(filepath, "wb")
+        except ImportError:
+            pass
+
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd compression needs Python 3.14+ or `pip install zstandard`")
+
+        return zstandard.ZstdCompressor().stream_writer(open(filepath, "wb"), closefd=True)
+
+    raise ValueError(f"{compression=} is not valid. Options include: None, 'gzip', 'zstd'")
+
+
+def _part_filepath(filepath: Path, part: int, parts: int) -> Path:
+    if parts < 2:
+        return filepath
+
+    # counts.csv.gz -> counts_003.csv.gz
+    stem, _, suffixes = filepath.name.partition(".")
+
+    return filepath.with_name(f"{stem}_{part:03d}.{suffixes}" if suffixes else f"{stem}_{part:03d}")
+
+
+def _copy_to_file(
+    self,
+    copy_sql: str,
+    filepath: Path,
+    compression: str | None,
+    snapshot: str | None = None,
+) -> tuple:
+    """
+    - Stream the output of a `COPY ... TO STDOUT` into `filepath`
+
+    Returns:
+        tuple: (rows written, uncompressed bytes)
+    """
+
+    # Parts read from one exported snapshot, which lives on the primary
+    with self.connection(read_only=snapshot is None) as connection:
+        cursor = connection.cursor()
+
+        if snapshot:
+            cursor.execute(
+                "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY;"
+                f"SET TRANSACTION SNAPSHOT '{snapshot}';"
+            )
+
+        with _open_for_writing(filepath, compression) as f:
+            writer = _CountingWriter(f)
+            cursor.copy_expert(copy_sql, writer)
+
+        rows = cursor.rowcount
+        cursor.close()
+
+    return rows, writer.bytes
+
+
+def export_csv(
+    self,
+    table_or_sql: str,
+    filepath: Path | str,
+    compression: str | None = None,
+    header: bool = True,
+    delimiter: str | None = None,
+    parts: int = 1,
+    split_on: str | None = None,
+) -> list:
+    """
+    - Write a table or query to a CSV/TSV file with `COPY ... TO STDOUT`, streaming the rows
+    straight to disk without building a dataframe
+    - `compression` defaults to the file's suffix, e.g. `"counts.csv.gz"` is gzipped
+    and `"counts.csv.zst"` uses zstd (which needs Python 3.14+ or `zstandard`)
+    - `delimiter` defaults to a tab for `.tsv` files and a comma otherwise
+    - Use `parts` to split the output into that many files, written in parallel, e.g.
+    `counts_000.csv`, `counts_001.csv`, ... Tables are split by physical location unless
+    a numeric `split_on` column is given, which queries always need. Every part reads the
+    same snapshot of the data and has its own header row
+
+    ```python
+    >>> db.export_csv("raw.counts", "counts.csv.gz")
+    >>> db.export_csv("SELECT * FROM raw.counts WHERE year = 2021", "counts.tsv", parts=4, split_on="id")
+    ```
+
+    Arguments:
+        table_or_sql (str): name of a table, or a full query
+        filepath (Path | str): file to write
+        compression (str | None): `"gzip"` or `"zstd"`, or `None` to pick from the suffix
+        header (bool): flag to write the column names as the first line
+        delimiter (str | None): field separator
+        parts (int): number of files to split the output into
+        split_on (str | None): numeric column whose values split the output into parts
+
+    Returns:
+        list: the files that were written
+    """
+
+    import psycopg2
+
+    filepath = Path(filepath)
+    suffixes = [s.lower() for s in filepath.suffixes]
+
+    if compression is None and suffixes:
+        compression = COMPRESSION_SUFFIXES.get(suffixes[-1])
+
+    if delimiter is None:
+        delimiter = "\t" if ".tsv" in suffixes else ","
+
+    is_query = helpers.this_is_raw_sql(table_or_sql)
+    query = table_or_sql if is_query else f"SELECT * FROM {table_or_sql}"
+
+    escaped_delimiter = delimiter.encode("unicode_escape").decode()
+    options = f"FORMAT csv, HEADER {str(header).upper()}, DELIMITER E'{escaped_delimiter}'"
+
+    start = time.perf_counter()
+
+    with instrumentation.track("export_csv", table_or_sql, db=self) as event:
+        if parts < 2:
+            results = [
+                _copy_to_file(self, f"COPY ({query}) TO STDOUT ({options})", filepath, compression)
+            ]
+            filepaths = [filepath]
+
+        else:
+            # Hold a snapshot open so that every part reads the same version of the data
+            snapshot_connection = psycopg2.connect(self.uri)
+
+            try:
+                cursor = snapshot_connection.cursor()
+                cursor.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY;"
+                    "SELECT pg_export_snapshot();"
+                )
+                snapshot = cursor.fetchone()[0]
+
+                with self.pin_to_primary():
+                    if is_query:
+                        ranges = _split_ranges(self, None, parts, split_on, query=query)
+                        source = f"({query}) AS q"
+                    else:
+                        ranges = _split_ranges(self, table_or_sql, parts, split_on)
+                        source = _quoted(table_or_sql)
+
+                filepaths = [_part_filepath(filepath, i, len(ranges)) for i in range(len(ranges))]
+
+                def export_part(i: int) -> tuple:
+                    return _copy_to_file(
+                        self,
+                        f"COPY (SELECT * FROM {source} WHERE {ranges[i]}) TO STDOUT ({options})",
+                        filepaths[i],
+                        compression,
+                        snapshot=snapshot,
+                    )
+
+                with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                    results = list(executor.map(export_part, range(len(ranges))))
+
+            finally:
+                snapshot_connection.close()
+
+        rows = sum(r[0] for r in results)
+        raw_bytes = sum(r[1] for r in results)
+
+        event.rows = rows
+        event.bytes = sum(f.stat().st_size for f in filepaths)
+
+    seconds = time.perf_counter() - start
+
+    print(
+        f"Exported {rows:,} rows ({raw_bytes / 1024**2:.1f} MB) to {len(filepaths)} file(s) "
+        f"in {seconds:.2f}s, {raw_bytes / 1024**2 / max(seconds, 1e-9):.1f} MB/s"
+    )
+
+    return filepaths
@@ -0,0 +1,364 @@
+from __future__ import annotations
+import datetime
+import io
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+from pg_data_etl import helpers, instrumentation
+
+
+def _cell_type(value) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+
+    if isinstance(value, int):
+        return "bigint"
+
+    if isinstance(value, float):
+        return "double precision"
+
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return "timestamp"
+
+    return "text"
+
+
+def _wider_type(a: str | None, b: str | None) -> str | None:
+    """
+    - Get the narrowest Postgres type that holds values of both types,
+    i.e. bigint + double precision -> double precision, and text for anything else
+    """
+
+    if a is None or a == b:
+        return b
+
+    if b is None:
+        return a
+
+    if {a, b} == {"bigint", "double precision"}:
+        return "double precision"
+
+    return "text"
+
+
+def _column_types(rows: list, n_columns: int) -> list:
+    """
+    - Get the narrowest Postgres type that holds every value of each column
+    - Columns with no values at all are `None`
+    """
+
+    types = [None] * n_columns
+
+    for row in rows:
+        for i, value in enumerate(row):
+            if value is not None:
+                types[i] = _wider_type(types[i], _cell_type(value))
+
+    return types
+
+
+def _existing_type(pg_type: str) -> str:
+    """
+    - Get which of the types from `_cell_type()` an existing column's type corresponds to
+    """
+
+    if pg_type in ["smallint", "integer", "bigint"]:
+        return "bigint"
+
+    if pg_type in ["real", "double precision"] or pg_type.startswith("numeric"):
+        return "double precision"
+
+    if pg_type == "boolean":
+        return "boolean"
+
+    if pg_type == "date" or pg_type.startswith("timestamp"):
+        return "timestamp"
+
+    return "text"
+
+
+def _unique_column_names(header: tuple) -> list:
+    """
+    - Sanitize each header, and number any that collide afterwards,
+    e.g. `"Volume"` and `"volume"` become `volume` and `volume_2`
+    """
+
+    names = []
+
+    for i, raw in enumerate(header):
+        name = helpers.sanitize_column_name(raw) if raw is not None else ""
+        name = name or f"column_{i + 1}"
+
+        unique = name
+        n = 2
+
+        while unique in names:
+            unique = f"{name}_{n}"
+            n += 1
+
+        if unique != name:
+            print(f"Column '{raw}' is renamed to '{unique}' so it doesn't collide with '{name}'")
+
+        names.append(unique)
+
+    return names
+
+
+def _sheet_rows(filepath: Path, sheet: str, header_row: int) -> Iterator:
+    """
+    - Stream a worksheet with `openpyxl` in read-only mode, which parses one row
+    at a time instead of loading the whole workbook
+    - Yields the sanitized column names, followed by one tuple per non-empty row
+    """
+
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+
+    try:
+        rows = workbook[sheet].iter_rows(min_row=header_row, values_only=True)
+        header = next(rows, ())
+
+        # Trailing columns without a header or any values are formatting leftovers
+        while header and header[-1] is None:
+            header = header[:-1]
+
+        yield _unique_column_names(header)
+
+        n_columns = len(header)
+
+        for row in rows:
+            row = row[:n_columns]
+
+            if any(value is not None for value in row):
+                yield row + (None,) * (n_columns - len(row))
+
+    finally:
+        workbook.close()
+
+
+def _csv_field(value) -> str:
+    """
+    - Format one cell for `COPY ... (FORMAT csv)`. Text is always quoted, because
+    COPY reads an unquoted empty field as NULL: only empty cells (`None`) are left bare,
+    so an empty string in the sheet stays an empty string
+    """
+
+    if value is None:
+        return ""
+
+    if isinstance(value, datetime.date):
+        value = value.isoformat()
+
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+
+    return str(value)
+
+
+def _copy_chunk(cursor, tablename: str, columns: list, rows: list) -> None:
+    buffer = io.StringIO()
+
+    for row in rows:
+        buffer.write(",".join(_csv_field(value) for value in row) + "\n")
+
+    buffer.seek(0)
+
+    column_list = ", ".join(f'"{c}"' for c in columns)
+
+    cursor.copy_expert(f"COPY {tablename} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _load_sheet(
+    self,
+    filepath: Path,
+    sheet: str,
+    tablename: str,
+    if_exists: str,
+    chunksize: int,
+    header_row: int,
+) -> int:
+    """
+    - COPY one worksheet into `tablename`, `chunksize` rows at a time, in a single transaction
+    - Column types come from the first chunk and are widened if a later chunk doesn't fit
+    """
+
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+    self.schema_add(schema)
+
+    rows = _sheet_rows(filepath, sheet, header_row)
+
+    try:
+        return _copy_rows(self, rows, sheet, schema, tbl, if_exists, chunksize)
+    finally:
+        rows.close()
+
+
+def _copy_rows(
+    self, rows: Iterator, sheet: str, schema: str, tbl: str, if_exists: str, chunksize: int
+) -> int:
+    full_tablename = f'"{schema}"."{tbl}"'
+    columns = next(rows)
+
+    if not columns:
+        print(f"Sheet '{sheet}' has no header row, skipping it")
+        return 0
+
+    row_count = 0
+    types = None
+
+    with self.connection() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (full_tablename,))
+        exists = cursor.fetchone()[0]
+
+        if exists and if_exists == "fail":
+            raise ValueError(f"Table {schema}.{tbl} already exists")
+
+        if exists and if_exists == "replace":
+            cursor.execute(f"DROP TABLE {full_tablename};")
+            exists = False
+
+        if exists:
+            # Appending never changes the existing table, so read its column types
+            query = """
+                SELECT attname, format_type(atttypid, atttypmod)
+                FROM pg_attribute
+                WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+            """
+
+            cursor.execute(query, (full_tablename,))
+            existing = dict(cursor.fetchall())
+
+            missing = [c for c in columns if c not in existing]
+
+            if missing:
+                raise ValueError(f"Table {schema}.{tbl} doesn't have the columns {missing}")
+
+            types = [_existing_type(existing[c]) for c in columns]
+
+        while True:
+            chunk = list(islice(rows, chunksize))
+
+            chunk_types = _column_types(chunk, len(columns))
+
+            if types is None:
+                types = [t or "text" for t in chunk_types]
+
+                column_defs = ", ".join(f'"{c}" {t}' for c, t in zip(columns, types))
+                cursor.execute(f"CREATE TABLE {full_tablename} ({column_defs});")
+
+            if not chunk:
+                break
+
+            for i, (current, new) in enumerate(zip(types, chunk_types)):
+                wider = _wider_type(current, new)
+
+                if wider != current and exists:
+                    raise ValueError(
+                        f"Column '{columns[i]}' of {schema}.{tbl} is {existing[columns[i]]}, "
+                        f"which can't hold the {new} values in sheet '{sheet}'"
+                    )
+
+                if wider != current:
+                    cursor.execute(f"""
+                        ALTER TABLE {full_tablename}
+                        ALTER COLUMN "{columns[i]}" TYPE {wider} USING "{columns[i]}"::{wider};
+                    """)
+                    types[i] = wider
+
+            _copy_chunk(cursor, full_tablename, columns, chunk)
+            row_count += len(chunk)
+
+        cursor.close()
+
+    print(f"Loaded {row_count:,} rows from sheet '{sheet}' into {schema}.{tbl}")
+
+    return row_count
+
+
+def _load_sheet_in_worker(uri: str, bin_paths: dict | None, *args) -> int:
+    from pg_data_etl import Database
+
+    return _load_sheet(Database.from_uri(uri, bin_paths=bin_paths), *args)
+
+
+def import_xlsx(
+    self,
+    filepath: Path | str,
+    tablename: str | dict,
+    sheets: list | None = None,
+    if_exists: str = "fail",
+    chunksize: int = 50_000,
+    workers: int = 4,
+    header_row: int = 1,
+) -> dict:
+    """
+    - Stream an `.xlsx` workbook into postgres without loading it into memory first
+    - Rows are read with `openpyxl` in read-only mode and loaded with `COPY`,
+    `chunksize` rows at a time. Each sheet loads in its own transaction
+    - Column names are cleaned up the same way as `helpers.sanitize_df_for_sql()`
+    - With more than one sheet, each sheet goes into its own table and up to `workers`
+    sheets load at once, in separate processes so the spreadsheet parsing runs in parallel
+    - When `tablename` is a string and there are several sheets, each table is named
+    `{tablename}_{sheet}`. Pass a `{sheet: tablename}` dict to name them explicitly
+
+    ```python
+    >>> db.import_xlsx("regional_counts.xlsx", "raw.counts", sheets=["2021", "2022"])
+    {'2021': 512003, '2022': 498871}
+    ```
+
+    Arguments:
+        filepath (Path | str): path to the source XLSX
+        tablename (str | dict): name of the new table, or a `{sheet: tablename}` dict
+        sheets (list | None): sheets to load. Defaults to the keys of `tablename` when it's
+        a dict, or to every sheet otherwise
+        if_exists (str): `"fail"`, `"replace"` or `"append"`, as in `pandas.DataFrame.to_sql()`
+        chunksize (int): number of rows per `COPY`
+        workers (int): number of sheets to load in parallel
+        header_row (int): 1-based row number that holds the column names
+
+    Returns:
+        dict: number of rows loaded from each sheet
+    """
+
+    import openpyxl
+
+    filepath = Path(filepath)
+
+    if isinstance(tablename, dict):
+        tables = dict(tablename)
+        sheets = sheets or list(tables)
+    else:
+        if not sheets:
+            workbook = openpyxl.load_workbook(filepath, read_only=True)
+            sheets = workbook.sheetnames
+            workbook.close()
+
+        if len(sheets) == 1:
+            tables = {sheets[0]: tablename}
+        else:
+            tables = {s: f"{tablename}_{helpers.sanitize_column_name(s)}" for s in sheets}
+
+    jobs = [(filepath, s, tables[s], if_exists, chunksize, header_row) for s in sheets]
+
+    with instrumentation.track("import_xlsx", str(filepath), db=self) as event:
+        if instrumentation.enabled():
+            event.bytes = helpers.filesize_in_bytes(filepath)
+
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+                futures = [
+                    executor.submit(_load_sheet_in_worker, self.uri, self._bin_paths, *job)
+                    for job in jobs
+                ]
+                counts = [future.result() for future in futures]
+        else:
+            counts = [_load_sheet(self, *job) for job in jobs]
+
+        event.rows = sum(counts)
+
+    return dict(zip(sheets, counts))
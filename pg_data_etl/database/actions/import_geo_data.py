@@ -1,15 +1,25 @@
+from __future__ import annotations
+from itertools import islice
 from pathlib import Path
-import pandas as pd
-import sqlalchemy
-import geopandas as gpd
-from geoalchemy2 import Geometry, WKTElement
+from typing import TYPE_CHECKING, Iterator
 
-from pg_data_etl import helpers
+from pg_data_etl import helpers, instrumentation
+
+from .checkpoints import _import_in_chunks, _source_fingerprint
+from .partitions import _import_partitioned
+
+if TYPE_CHECKING:
+    import geopandas as gpd
 
 
 def shp2pgsql(self, filepath: str, srid: int, sql_tablename: str, new_srid: int = None):
     """
     Use the shp2pgsql command to import a shapefile into the database
+
+    - Rows are written in dump format (`-D`), so `psql` loads them with `COPY`
+    instead of one `INSERT` per feature
+    - `psql` runs the whole load as a single transaction and stops at the first
+    error, so a failed import never leaves a half-loaded table behind
     """
 
     # Ensure that the schema provided in the 'tablename' exists
@@ -19,15 +29,86 @@ def shp2pgsql(self, filepath: str, srid: int, sql_tablename: str, new_srid: int
     # If 'new_srid' is provided, use 'old:new' to project on the fly
     srid_arg = f"{srid}:{new_srid}" if new_srid else srid
 
+    commands = [
+        f'{self.cmd.shp2pgsql} -D -I -s {srid_arg} "{filepath}" {sql_tablename}',
+        f"{self.cmd.psql} -q -v ON_ERROR_STOP=1 --single-transaction {self.uri}",
+    ]
+
+    print(" | ".join(commands))
+
+    # The table only exists on the primary until it replicates
+    with self.pin_to_primary():
+        helpers.run_pipeline_in_shell(*commands)
+
+        self.gis_table_lint_geom_colname(sql_tablename)
+
+
+def import_gis_with_ogr2ogr(
+    self,
+    filepath: Path | str,
+    sql_tablename: str,
+    layer: str | None = None,
+    srid: int | None = None,
+    new_srid: int | None = None,
+    explode: bool = False,
+    if_exists: str = "fail",
+    group_size: int = 100_000,
+) -> None:
+    """
+    - Use `ogr2ogr` to import any GDAL-readable layer (GeoPackage, FileGDB, shapefile, ...)
+    without reading it into Python
+    - Features are written with `COPY` (`PG_USE_COPY`) in transactions of `group_size`
+    features (`-gt`). Use `group_size=None` to load everything in one transaction
+    - A failed import raises a `RuntimeError`. Groups committed before the failure stay loaded
+    - The table gets a `uid` primary key, a `geom` column and a spatial index,
+    to match the other import methods
+
+    Arguments:
+        filepath (Path | str): source file or folder, e.g. "data.gpkg" or "data.gdb"
+        sql_tablename (str): name the new table should be given in the database
+        layer (str | None): layer to import. Defaults to the first layer of the source
+        srid (int | None): EPSG code of the source, if it isn't defined in the file
+        new_srid (int | None): EPSG code to project the data to on the fly
+        explode (bool): flag to split multipart features into singlepart features
+        if_exists (str): `"fail"`, `"replace"` or `"append"`
+        group_size (int | None): number of features per transaction
+
+    Returns:
+        creates a new SQL table from the specified layer
+    """
+
+    schema, tbl = helpers.convert_full_tablename_to_parts(sql_tablename)
+    self.schema_add(schema)
+
+    params = self.connection_params
+
+    pg_params_for_ogr = f'PG:"host={params["host"]} user={params["un"]} password={params["pw"]} port={params["port"]} dbname={params["db_name"]}"'
+
     command = (
-        f'{self.cmd.shp2pgsql} -I -s {srid_arg} "{filepath}" {sql_tablename} | psql {self.uri}'
+        f'{self.cmd.ogr2ogr} -f PostgreSQL {pg_params_for_ogr} "{filepath}" {layer or ""} '
+        f"--config PG_USE_COPY YES -nln {schema}.{tbl} "
+        "-lco GEOMETRY_NAME=geom -lco FID=uid -lco SPATIAL_INDEX=GIST "
+        f"-gt {group_size or 'unlimited'}"
     )
 
-    print(command)
+    if srid:
+        command += f" -a_srs EPSG:{srid}"
 
-    helpers.run_command_in_shell(command)
+    if new_srid:
+        command += f" -t_srs EPSG:{new_srid}"
 
-    self.gis_table_lint_geom_colname(sql_tablename)
+    if explode:
+        command += " -explodecollections"
+
+    if if_exists == "replace":
+        command += " -overwrite"
+    elif if_exists == "append":
+        command += " -append"
+
+    print(command)
+
+    with self.pin_to_primary():
+        helpers.run_command_in_shell(command, check=True)
 
 
 def import_geofile_with_geopandas(
@@ -36,7 +117,24 @@ def import_geofile_with_geopandas(
     sql_tablename: str,
     gpd_kwargs: dict = {},
     explode: bool = False,
+    chunksize: int | None = None,
+    resume: bool = True,
 ) -> None:
+    """
+    - Import a spatial file with `geopandas`
+    - Set `chunksize` to load the file in chunks of that many features, each committed
+    in its own transaction. If the import fails part-way, calling it again with the
+    same file and `chunksize` picks up after the last committed chunk.
+    The `uid` column and spatial index are added once the last chunk is loaded
+    """
+
+    import geopandas as gpd
+
+    if chunksize:
+        _import_geofile_in_chunks(
+            self, filepath, sql_tablename, gpd_kwargs, explode, chunksize, resume
+        )
+        return None
 
     # Read the data into a geodataframe
     gdf = gpd.read_file(filepath)
@@ -47,6 +145,127 @@ def import_geofile_with_geopandas(
     self.import_geodataframe(gdf, sql_tablename, gpd_kwargs, explode=explode)
 
 
+def _read_geofile_in_chunks(filepath: Path, chunksize: int) -> Iterator:
+    """
+    - Read a spatial file `chunksize` features at a time, through one open reader
+    - Uses `fiona` when it's installed (the engine geopandas used before 1.0), and
+    otherwise streams Arrow batches with `pyogrio`, which needs `pyarrow`
+    """
+    import geopandas as gpd
+
+    try:
+        import fiona
+    except ImportError:
+        fiona = None
+
+    if fiona:
+        with fiona.open(filepath) as source:
+            columns = list(source.schema["properties"]) + ["geometry"]
+            features = iter(source)
+
+            while True:
+                batch = list(islice(features, chunksize))
+
+                if not batch:
+                    return
+
+                yield gpd.GeoDataFrame.from_features(batch, crs=source.crs_wkt)[columns]
+
+        return
+
+    import pyogrio
+
+    with pyogrio.open_arrow(filepath, batch_size=chunksize, use_pyarrow=True) as (meta, reader):
+        geometry_name = meta["geometry_name"] or "wkb_geometry"
+
+        for batch in reader:
+            df = batch.to_pandas()
+            geometry = gpd.GeoSeries.from_wkb(df.pop(geometry_name), crs=meta["crs"])
+
+            yield gpd.GeoDataFrame(df, geometry=geometry.rename("geometry"))
+
+
+def _import_geofile_in_chunks(
+    self,
+    filepath: Path,
+    tablename: str,
+    gpd_kwargs: dict,
+    explode: bool,
+    chunksize: int,
+    resume: bool,
+) -> None:
+    import sqlalchemy
+
+    def read_chunks():
+        for gdf in _read_geofile_in_chunks(filepath, chunksize):
+            gdf = gdf[gdf["geometry"].notnull()]
+
+            # A chunk with only null geometries has nothing to load
+            if not gdf.empty:
+                yield gdf
+
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+    self.schema_add(schema)
+
+    to_sql_kwargs = {**gpd_kwargs}
+    if_exists = to_sql_kwargs.pop("if_exists", "fail")
+
+    # Every chunk has to match the geometry type of the table's `geom` column
+    table_geom_type = {}
+
+    def write_chunk(gdf, connection, if_exists: str) -> None:
+        prepared = _prepare_geodataframe(gdf, "uid", explode)
+
+        if prepared is None:
+            raise ValueError("Mixed geometry types in the data. Run with explode=True")
+
+        gdf, dtype = prepared
+        geom_type = dtype["geom"].geometry_type
+
+        if "type" not in table_geom_type:
+            # Appending, or resuming an import: the table already has a type
+            if if_exists == "append":
+                existing = connection.execute(
+                    sqlalchemy.text("""
+                        SELECT type FROM geometry_columns
+                        WHERE f_table_schema = :schema AND f_table_name = :tbl
+                            AND f_geometry_column = 'geom'
+                    """),
+                    {"schema": schema, "tbl": tbl},
+                ).scalar()
+
+                table_geom_type["type"] = existing or geom_type
+            else:
+                table_geom_type["type"] = geom_type
+
+        if table_geom_type["type"] not in [geom_type, "GEOMETRY"]:
+            hint = "" if explode else ". Run with explode=True"
+            raise ValueError(
+                f"A chunk of {geom_type} features can't be added to {tablename}, "
+                f"which holds {table_geom_type['type']} features{hint}"
+            )
+
+        gdf.to_sql(
+            tbl, connection, schema=schema, dtype=dtype, if_exists=if_exists, **to_sql_kwargs
+        )
+
+    def finalize() -> None:
+        self.table_add_uid_column(tablename)
+        self.gis_table_add_spatial_index(tablename)
+
+    with instrumentation.track("import_geodataframe", str(filepath), db=self) as event:
+        event.rows = _import_in_chunks(
+            self,
+            read_chunks(),
+            tablename,
+            _source_fingerprint(filepath, chunksize),
+            if_exists,
+            write_chunk,
+            finalize=finalize,
+            resume=resume,
+        )
+
+
 def import_geodataframe(
     self,
     gdf: gpd.GeoDataFrame,
@@ -54,20 +273,51 @@ def import_geodataframe(
     gpd_kwargs: dict = {},
     uid_col: str = "uid",
     explode: bool = False,
+    partition_by: dict | None = None,
+    spatial_order: str | None = None,
+    cluster: bool = False,
 ) -> None:
     """
+    - Use `spatial_order="hilbert"` or `"geohash"` to sort the features along a
+    space-filling curve before they're written, and/or `cluster=True` to `CLUSTER`
+    the table on its spatial index afterwards. Both keep nearby features on the
+    same pages, so bounding box queries read fewer pages. With `partition_by`,
+    `cluster=True` clusters each partition on its own spatial index
+    - Use `partition_by` to load into a partitioned table (see `import_dataframe()`).
+    The `uid_col` and partition column make up the primary key, and the spatial
+    index is created on the parent so every partition gets one
+
     TODO: option to use multipart features instead of exploding to singlepart
     """
 
+    with instrumentation.track("import_geodataframe", db=self) as event:
+        event.rows = len(gdf)
+        _import_geodataframe(
+            self, gdf, tablename, gpd_kwargs, uid_col, explode, partition_by, spatial_order, cluster
+        )
+
+
+def _prepare_geodataframe(
+    gdf: gpd.GeoDataFrame,
+    uid_col: str,
+    explode: bool,
+    spatial_order: str | None = None,
+) -> tuple | None:
+    """
+    - Clean up a geodataframe so it can be written with `to_sql()`
+
+    Returns:
+        tuple | None: (dataframe with a geoalchemy2 `geom` column, `to_sql()` dtype),
+        or `None` if the data has mixed geometry types and `explode` is `False`
+    """
+    from geoalchemy2 import Geometry, WKTElement
+
     gdf = gdf.copy()
 
     gdf = helpers.sanitize_df_for_sql(gdf)
 
     epsg_code = int(str(gdf.crs).split(":")[1])
 
-    # Get a list of all geometry types in the dataframe
-    geom_types = list(gdf.geometry.geom_type.unique())
-
     # If there are multi- and single-part features, explode to singlepart
     if explode:
         # Explode multipart to singlepart and reset the index
@@ -75,11 +325,16 @@ def import_geodataframe(
         gdf["explode"] = gdf.index.to_numpy()
         gdf = gdf.reset_index()
 
-    else:
-        if len(geom_types) > 1:
-            print(f"Warning! This dataset has {geom_types=}")
-            print("Run with explode=True")
-            return None
+    # Get a list of all geometry types in the dataframe, after any explode
+    geom_types = list(gdf.geometry.geom_type.unique())
+
+    if not explode and len(geom_types) > 1:
+        print(f"Warning! This dataset has {geom_types=}")
+        print("Run with explode=True")
+        return None
+
+    if spatial_order:
+        gdf = gdf.iloc[helpers.spatial_sort_order(gdf.geometry, spatial_order)]
 
     # Use the non-multi version of the geometry
     geom_type_to_use = min(geom_types, key=len).upper()
@@ -103,35 +358,67 @@ def import_geodataframe(
     gdf["geom"] = gdf["geometry"].apply(lambda x: WKTElement(x.wkt, srid=epsg_code))
     gdf.drop(labels="geometry", axis=1, inplace=True)
 
-    # Ensure that the target schema exists
-    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
-    self.schema_add(schema)
+    return gdf, {"geom": Geometry(geom_type_to_use, srid=epsg_code)}
 
-    # Write geodataframe to SQL database
-    engine = sqlalchemy.create_engine(self.uri)
-    gdf.to_sql(
-        tbl,
-        engine,
-        schema=schema,
-        dtype={"geom": Geometry(geom_type_to_use, srid=epsg_code)},
-        **gpd_kwargs,
-    )
-    engine.dispose()
 
-    self.table_add_uid_column(tablename)
-    self.gis_table_add_spatial_index(tablename)
+def _import_geodataframe(
+    self,
+    gdf: gpd.GeoDataFrame,
+    tablename: str,
+    gpd_kwargs: dict,
+    uid_col: str,
+    explode: bool,
+    partition_by: dict | None = None,
+    spatial_order: str | None = None,
+    cluster: bool = False,
+) -> None:
+    prepared = _prepare_geodataframe(gdf, uid_col, explode, spatial_order)
+
+    if prepared is None:
+        return None
+
+    gdf, dtype = prepared
+
+    if partition_by:
+        _import_partitioned(
+            self,
+            gdf,
+            tablename,
+            partition_by,
+            gpd_kwargs,
+            dtype=dtype,
+            uid_col=uid_col,
+            spatial_index=True,
+        )
+
+    else:
+        # Ensure that the target schema exists
+        schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+        self.schema_add(schema)
+
+        # Write geodataframe to SQL database
+        with self.sqlalchemy_connection() as connection:
+            gdf.to_sql(tbl, connection, schema=schema, dtype=dtype, **gpd_kwargs)
+
+        self.table_add_uid_column(tablename)
+        self.gis_table_add_spatial_index(tablename)
+
+    if cluster:
+        self.gis_table_cluster_on_spatial_index(tablename)
 
 
 def import_gis(self, method="geopandas", **kwargs):
     """
-    - Import GIS data using `geopandas` or `shp2pgsql`
-    - Both methods take `filepath` and `sql_tablename` keyword arguments
+    - Import GIS data using `geopandas`, `shp2pgsql` or `ogr2ogr`
+    - All methods take `filepath` and `sql_tablename` keyword arguments
     - The geopandas method accepts optional `gpd_kwargs=dict` and `explode=bool` arguments
     - The `shp2pgsql` method requires `srid=int` and accepts an optional `new_srid=int` to convert projections during the import process
+    - The `ogr2ogr` method reads GeoPackage/FileGDB/etc. layers natively. See `import_gis_with_ogr2ogr()` for its arguments
     """
     method_mapper = {
         "geopandas": import_geofile_with_geopandas,
         "shp2pgsql": shp2pgsql,
+        "ogr2ogr": import_gis_with_ogr2ogr,
     }
 
     if method not in method_mapper:
@@ -139,4 +426,8 @@ def import_gis(self, method="geopandas", **kwargs):
 
     func = method_mapper[method]
 
-    func(self, **kwargs)
+    with instrumentation.track(f"import_gis.{method}", db=self) as event:
+        if "filepath" in kwargs and instrumentation.enabled():
+            event.bytes = helpers.filesize_in_bytes(kwargs["filepath"])
+
+        func(self, **kwargs)
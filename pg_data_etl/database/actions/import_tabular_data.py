@@ -1,9 +1,14 @@
 from __future__ import annotations
 from pathlib import Path
-import pandas as pd
-import sqlalchemy
+from typing import TYPE_CHECKING
 
-from pg_data_etl import helpers
+from pg_data_etl import helpers, instrumentation
+
+from .checkpoints import _import_in_chunks, _source_fingerprint
+from .partitions import _import_partitioned
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def import_file_with_pandas(
@@ -12,62 +17,140 @@ def import_file_with_pandas(
     tablename: str,
     pd_read_kwargs: dict = {},
     df_import_kwargs: dict = {"index": False},
+    chunksize: int | None = None,
+    resume: bool = True,
 ) -> None:
     """
     - Import a tabular CSV or XLSX file to postgres
     - Custom arguments can be provided for the reading of the file via `pd_read_kwargs`
     - Custom import arguments can be provided via `df_import_kwargs`
+    - Set `chunksize` to load the file in chunks of that many rows, each committed
+    in its own transaction. If the import fails part-way, calling it again with the
+    same file and `chunksize` picks up after the last committed chunk
+    - For large `.xlsx` workbooks, `import_xlsx()` streams the rows instead of
+    reading the whole file into memory
 
     Arguments:
         filepath (Path | str): Path or string of filepath to the source CSV or XLSX
         tablename (str): name the new table should be given in the database
         pd_read_kwargs (dict): a key/value dict with any special arguments needed to read the file
         df_import_kwargs (dict): a key/value dict with any special arguments needed to write the data to SQL
+        chunksize (int | None): number of rows per checkpointed chunk
+        resume (bool): set to `False` to ignore the progress of an earlier, failed import
 
     Returns:
         creates a new SQL table from the specified file
     """
 
+    import pandas as pd
+
     # Determine if this is a CSV, XLS, or XLSX and use the appropriate pandas loader
     filepath = Path(filepath)
     suffix = filepath.suffix.lower()
 
-    if suffix == ".csv":
-        df = pd.read_csv(filepath, **pd_read_kwargs)
-    elif suffix in [".xlsx", ".xls"]:
-        df = pd.read_excel(filepath, **pd_read_kwargs)
-    else:
-        print(
-            f"File type: '{suffix}' is not supported. Check the official pandas documentation to see if this is a valid filetype."
-        )
-        return None
+    with instrumentation.track("import_file_with_pandas", str(filepath), db=self) as event:
+        if instrumentation.enabled():
+            event.bytes = helpers.filesize_in_bytes(filepath)
+
+        if chunksize and suffix in [".csv", ".xlsx", ".xls"]:
+            if suffix == ".csv":
+                chunks = pd.read_csv(filepath, chunksize=chunksize, **pd_read_kwargs)
+            else:
+                df = pd.read_excel(filepath, **pd_read_kwargs)
+                chunks = (df.iloc[i : i + chunksize] for i in range(0, len(df), chunksize))
+
+            event.rows = _import_dataframe_in_chunks(
+                self, chunks, tablename, df_import_kwargs, filepath, chunksize, resume
+            )
+
+            return None
 
-    self.import_dataframe(df, tablename, df_import_kwargs)
+        if suffix == ".csv":
+            df = pd.read_csv(filepath, **pd_read_kwargs)
+        elif suffix in [".xlsx", ".xls"]:
+            df = pd.read_excel(filepath, **pd_read_kwargs)
+        else:
+            print(
+                f"File type: '{suffix}' is not supported. Check the official pandas documentation to see if this is a valid filetype."
+            )
+            return None
 
+        event.rows = len(df)
 
-def import_dataframe(self, df: pd.DataFrame, tablename: str, df_import_kwargs: dict = {}) -> None:
+        self.import_dataframe(df, tablename, df_import_kwargs)
+
+
+def import_dataframe(
+    self,
+    df: pd.DataFrame,
+    tablename: str,
+    df_import_kwargs: dict = {},
+    partition_by: dict | None = None,
+) -> None:
     """
     - Import an in-memort `pandas.DataFrame` into postgres
+    - Use `partition_by` to load into a partitioned table, with one partition per
+    list value, range interval or hash bucket. See `_import_partitioned()` for the options.
+    With `df_import_kwargs={"if_exists": "append"}`, later imports only add the missing partitions
+
+    ```python
+    >>> db.import_dataframe(df, "raw.counts", partition_by={"column": "year", "strategy": "list"})
+    ```
 
     Arguments:
         df (pd.DataFrame): data to load into postgres, as an in-memory dataframe
         tablename (str): name of the new table in SQL
         df_import_kwargs (dict): a key/value dict with any special arguments needed to write the data to SQL
+        partition_by (dict | None): e.g. `{"column": "date", "strategy": "range", "interval": "month"}`
 
     Returns:
         creates a new SQL table from the provided dataframe
     """
 
-    # Clean up column names
-    df = helpers.sanitize_df_for_sql(df)
+    with instrumentation.track("import_dataframe", db=self) as event:
+        event.rows = len(df)
 
-    # Make sure the schema exists
-    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
-    self.schema_add(schema)
+        # Clean up column names
+        df = helpers.sanitize_df_for_sql(df)
+
+        if partition_by:
+            _import_partitioned(self, df, tablename, partition_by, df_import_kwargs)
+            return None
+
+        # Make sure the schema exists
+        schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+        self.schema_add(schema)
 
-    # Write to database
-    engine = sqlalchemy.create_engine(self.uri)
+        # Write to database
+        with self.sqlalchemy_connection() as connection:
+            df.to_sql(tbl, connection, schema=schema, **df_import_kwargs)
 
-    df.to_sql(tbl, engine, schema=schema, **df_import_kwargs)
 
-    engine.dispose()
+def _import_dataframe_in_chunks(
+    self,
+    chunks,
+    tablename: str,
+    df_import_kwargs: dict,
+    filepath: Path,
+    chunksize: int,
+    resume: bool,
+) -> int:
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+    self.schema_add(schema)
+
+    to_sql_kwargs = {**df_import_kwargs}
+    if_exists = to_sql_kwargs.pop("if_exists", "fail")
+
+    def write_chunk(df, connection, if_exists: str) -> None:
+        df = helpers.sanitize_df_for_sql(df)
+        df.to_sql(tbl, connection, schema=schema, if_exists=if_exists, **to_sql_kwargs)
+
+    return _import_in_chunks(
+        self,
+        chunks,
+        tablename,
+        _source_fingerprint(filepath, chunksize),
+        if_exists,
+        write_chunk,
+        resume=resume,
+    )
@@ -0,0 +1,339 @@
+from __future__ import annotations
+import hashlib
+import math
+import re
+from typing import TYPE_CHECKING
+
+from pg_data_etl import helpers
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PARTITION_STRATEGIES = {"range": "r", "list": "l", "hash": "h"}
+
+# Calendar intervals for range partitions on date/timestamp columns
+RANGE_INTERVALS = {"year": ("Y", "%Y"), "month": ("M", "%Y_%m"), "day": ("D", "%Y_%m_%d")}
+
+
+def table_partitions(self, tablename: str) -> list:
+    """
+    - Get a list of the partitions attached to a partitioned table
+
+    Arguments:
+        tablename (str): name of the partitioned (parent) table
+
+    Returns:
+        list: with each partition formatted as `schema.tablename`
+    """
+
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+
+    query = f"""
+        SELECT concat(n.nspname, '.', c.relname)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_class p ON p.oid = i.inhparent
+        JOIN pg_namespace pn ON pn.oid = p.relnamespace
+        WHERE pn.nspname = '{schema}' AND p.relname = '{tbl}'
+        ORDER BY 1
+    """
+
+    return self.query_as_list_of_singletons(query)
+
+
+def _partition_spec(partition_by: dict) -> dict:
+    """
+    - Validate `partition_by` and fill in the defaults
+    """
+
+    import pandas as pd
+
+    spec = {"strategy": "list", **partition_by}
+
+    if "column" not in spec:
+        raise ValueError(f"{partition_by=} needs a 'column'")
+
+    if spec["strategy"] not in PARTITION_STRATEGIES:
+        raise ValueError(f"Partition strategy must be one of: {list(PARTITION_STRATEGIES)}")
+
+    if spec["strategy"] == "range" and "interval" not in spec:
+        raise ValueError("Range partitions need an 'interval', e.g. 'year', 'month' or 10000")
+
+    if spec["strategy"] == "hash":
+        spec.setdefault("modulus", 8)
+
+    # Match the column name cleanup that the dataframe goes through
+    spec["column"] = helpers.sanitize_df_for_sql(pd.DataFrame(columns=[spec["column"]])).columns[0]
+
+    return spec
+
+
+def _literal(value) -> str:
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+
+    if isinstance(value, (int, float)):
+        return str(value)
+
+    text = str(value).replace("'", "''")
+
+    return f"'{text}'"
+
+
+# Suffixes of the partitions for NULLs, which a value must never map to
+RESERVED_SUFFIXES = ["null", "default"]
+
+# Postgres truncates longer identifiers
+MAX_IDENTIFIER_BYTES = 63
+
+
+def _suffix(value) -> str:
+    text = str(value).lower()
+    suffix = re.sub(r"[^a-z0-9]+", "_", text).strip("_")
+
+    # Keep names unique when the cleanup loses information, and inside the 63 character limit
+    if suffix != text or len(suffix) > 40 or suffix in RESERVED_SUFFIXES:
+        suffix = f"{suffix[:30]}_{hashlib.md5(text.encode()).hexdigest()[:8]}"
+
+    return suffix
+
+
+def _partition_name(tbl: str, suffix: str) -> str:
+    """
+    - Name a partition `{tbl}_{suffix}`, shortened with a hash when that's longer than
+    Postgres allows, so the same partition always gets the same name
+    """
+
+    name = f"{tbl}_{suffix}"
+
+    if len(name.encode()) <= MAX_IDENTIFIER_BYTES:
+        return name
+
+    digest = hashlib.md5(name.encode()).hexdigest()[:8]
+    prefix = name.encode()[: MAX_IDENTIFIER_BYTES - 9].decode(errors="ignore")
+
+    return f"{prefix}_{digest}"
+
+
+def _partition_bounds(values: pd.Series, spec: dict) -> dict:
+    """
+    - Work out which partitions the data needs
+
+    Returns:
+        dict: keyed on the partition name suffix, with the `FOR VALUES ...` clause and
+        a SQL literal of one value that belongs in the partition
+    """
+
+    import pandas as pd
+
+    bounds = {}
+    values = values.drop_duplicates()
+
+    if values.isna().any():
+        if spec["strategy"] == "list":
+            bounds["null"] = ("FOR VALUES IN (NULL)", "NULL")
+        else:
+            bounds["default"] = ("DEFAULT", "NULL")
+
+    values = values.dropna()
+
+    if spec["strategy"] == "list":
+        for value in values:
+            value = value.item() if hasattr(value, "item") else value
+            bounds[_suffix(value)] = (f"FOR VALUES IN ({_literal(value)})", _literal(value))
+
+    elif spec["strategy"] == "range" and spec["interval"] in RANGE_INTERVALS:
+        freq, fmt = RANGE_INTERVALS[spec["interval"]]
+
+        for period in pd.to_datetime(values).dt.to_period(freq).unique():
+            lower, upper = period.start_time, (period + 1).start_time
+            bounds[period.start_time.strftime(fmt)] = (
+                f"FOR VALUES FROM ('{lower}') TO ('{upper}')",
+                f"'{lower}'",
+            )
+
+    elif spec["strategy"] == "range":
+        interval = spec["interval"]
+
+        for lower in {math.floor(v / interval) * interval for v in values}:
+            suffix = str(lower).replace("-", "neg").replace(".", "p")
+            bounds[suffix] = (f"FOR VALUES FROM ({lower}) TO ({lower + interval})", str(lower))
+
+    return bounds
+
+
+def _missing_partitions(self, schema: str, tbl: str, column: str, bounds: dict) -> dict:
+    """
+    - Find which of `bounds` no existing partition covers yet
+    - Existing partitions are found through `pg_inherits` and matched on their partition
+    constraints, not their names, so partitions created with other names still count
+    """
+
+    parent = f"{schema}.{tbl}"
+
+    children = self.query_as_list_of_lists(f"""
+        SELECT pg_get_expr(c.relpartbound, c.oid), pg_get_partition_constraintdef(c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = '{parent}'::regclass
+    """)
+
+    has_default = any(bound == "DEFAULT" for bound, _ in children)
+    constraints = [f"({constraint})" for bound, constraint in children if bound != "DEFAULT"]
+
+    missing = {
+        suffix: bound
+        for suffix, (bound, _) in bounds.items()
+        if bound == "DEFAULT" and not has_default
+    }
+    to_check = {suffix: value for suffix, (bound, value) in bounds.items() if bound != "DEFAULT"}
+
+    covered = set()
+
+    if to_check and constraints:
+        column_type = self.query_as_singleton(f"""
+            SELECT format_type(atttypid, atttypmod)
+            FROM pg_attribute
+            WHERE attrelid = '{parent}'::regclass AND attname = '{column}'
+        """)
+
+        samples = ", ".join(
+            f"({_literal(suffix)}, {value}::{column_type})" for suffix, value in to_check.items()
+        )
+
+        covered = set(self.query_as_list_of_singletons(f"""
+            SELECT v.suffix
+            FROM (VALUES {samples}) AS v(suffix, "{column}")
+            WHERE {" OR ".join(constraints)}
+        """))
+
+    for suffix in to_check:
+        if suffix not in covered:
+            missing[suffix] = bounds[suffix][0]
+
+    return missing
+
+
+def _import_partitioned(
+    self,
+    df: pd.DataFrame,
+    tablename: str,
+    partition_by: dict,
+    to_sql_kwargs: dict,
+    dtype: dict | None = None,
+    uid_col: str | None = None,
+    spatial_index: bool = False,
+) -> None:
+    """
+    - Load a dataframe into a declaratively partitioned table
+    - The parent table is created on the first import. Later imports with
+    `if_exists="append"` only add the partitions that are missing, and
+    never touch the partitions that already exist
+    - Postgres routes each row from the parent into its partition during the load
+
+    Arguments:
+        df (pd.DataFrame): sanitized data to load
+        tablename (str): name of the parent table
+        partition_by (dict): e.g. `{"column": "year", "strategy": "list"}`,
+            `{"column": "date", "strategy": "range", "interval": "month"}`
+            or `{"column": "id", "strategy": "hash", "modulus": 8}`
+        to_sql_kwargs (dict): keyword arguments for `DataFrame.to_sql()`
+        dtype (dict | None): `sqlalchemy` column types, e.g. for the geometry column
+        uid_col (str | None): name of a serial ID column to add, as part of the primary key
+        spatial_index (bool): flag to add a GIST index on `geom` to the parent table
+    """
+
+    import pandas as pd
+
+    spec = _partition_spec(partition_by)
+    column = spec["column"]
+
+    if column not in df.columns:
+        raise ValueError(f"Partition column '{column}' is not in the data: {list(df.columns)}")
+
+    to_sql_kwargs = {**to_sql_kwargs}
+    if_exists = to_sql_kwargs.pop("if_exists", "fail")
+
+    # The parent's columns have to match exactly what 'to_sql' writes
+    if to_sql_kwargs.pop("index", True):
+        df = df.reset_index()
+
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+    self.schema_add(schema)
+
+    existing_strategy = self.query_as_list_of_singletons(f"""
+        SELECT coalesce(pt.partstrat::text, 'not partitioned')
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_partitioned_table pt ON pt.partrelid = c.oid
+        WHERE n.nspname = '{schema}' AND c.relname = '{tbl}'
+    """)
+    existing_strategy = existing_strategy[0] if existing_strategy else None
+
+    if existing_strategy and if_exists == "fail":
+        raise ValueError(f"Table '{tablename}' already exists.")
+
+    if existing_strategy and if_exists == "replace":
+        self.execute(f"DROP TABLE {schema}.{tbl} CASCADE;")
+        existing_strategy = None
+
+    if existing_strategy and existing_strategy != PARTITION_STRATEGIES[spec["strategy"]]:
+        raise ValueError(
+            f"Table '{tablename}' already exists and is {existing_strategy=}, "
+            f"not '{spec['strategy']}' partitioned"
+        )
+
+    if not existing_strategy:
+        with self.sqlalchemy_connection() as connection:
+            create_table = pd.io.sql.get_schema(
+                df.head(0), tbl, con=connection, dtype=dtype, schema=schema
+            )
+
+        queries = [f'{create_table.strip()} PARTITION BY {spec["strategy"].upper()} ("{column}");']
+
+        if uid_col:
+            queries.append(f"""
+                ALTER TABLE {schema}.{tbl} ADD {uid_col} bigserial;
+                ALTER TABLE {schema}.{tbl} ADD PRIMARY KEY ({uid_col}, "{column}");
+            """)
+
+        # Indexes on the parent are created on every partition, now and later
+        if spatial_index:
+            queries.append(f"CREATE INDEX ON {schema}.{tbl} USING GIST (geom);")
+
+        if spec["strategy"] == "hash":
+            for remainder in range(spec["modulus"]):
+                queries.append(f"""
+                    CREATE TABLE {schema}.{_partition_name(tbl, f"p{remainder}")}
+                    PARTITION OF {schema}.{tbl}
+                    FOR VALUES WITH (MODULUS {spec["modulus"]}, REMAINDER {remainder});
+                """)
+
+        self.execute("\n".join(queries))
+
+    if spec["strategy"] != "hash":
+        missing = _missing_partitions(
+            self, schema, tbl, column, _partition_bounds(df[column], spec)
+        )
+
+        new_partitions = [f"""
+            CREATE TABLE {schema}.{_partition_name(tbl, suffix)}
+            PARTITION OF {schema}.{tbl}
+            {bound};
+            """ for suffix, bound in missing.items()]
+
+        if new_partitions:
+            print(f"Adding {len(new_partitions)} partitions to {tablename}")
+            self.execute("\n".join(new_partitions))
+
+    with self.sqlalchemy_connection() as connection:
+        df.to_sql(
+            tbl,
+            connection,
+            schema=schema,
+            if_exists="append",
+            index=False,
+            dtype=dtype,
+            **to_sql_kwargs,
+        )
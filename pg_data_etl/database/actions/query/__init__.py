@@ -1,7 +1,12 @@
+from .cache import *
+from .connection import *
+from .data_arrow import *
 from .data_nonspatial import *
 from .data_spatial import *
 from .execute import *
 from .lists import *
+from .map_query import *
+from .profile import *
 from .simple import *
 from .update_geo import *
 from .update import *
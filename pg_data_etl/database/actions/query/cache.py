@@ -0,0 +1,56 @@
+from __future__ import annotations
+from pathlib import Path
+
+from pg_data_etl.cache import DEFAULT_CACHE_FOLDER, QueryCache
+
+
+def enable_cache(
+    self, folder: Path | str = DEFAULT_CACHE_FOLDER, max_bytes: int = 2 * 1024**3
+) -> QueryCache:
+    """
+    - Cache the results of `df()` and `gdf()` on disk as Parquet/GeoParquet
+    - A cached result is reused until one of the tables behind the query changes
+    - See `pg_data_etl.cache` for the details of how results are keyed
+    - Parquet files need `pyarrow`, e.g. `pip install pg-data-etl[arrow]`
+
+    Arguments:
+        folder (Path | str): where the cached files are written
+        max_bytes (int): size limit for the cache folder, least recently used files are removed first
+
+    Returns:
+        QueryCache: the cache now used by this `Database`
+    """
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("The result cache stores Parquet files, which requires 'pyarrow'")
+
+    self._cache = QueryCache(folder=folder, max_bytes=max_bytes)
+
+    return self._cache
+
+
+def disable_cache(self, clear: bool = False) -> None:
+    """
+    - Stop caching `df()` and `gdf()` results
+
+    Arguments:
+        clear (bool): flag to also delete the cached files from disk
+    """
+
+    if self._cache and clear:
+        self._cache.clear()
+
+    self._cache = None
+
+
+def cache_stats(self) -> dict | None:
+    """
+    - Get the hit/miss counters and size on disk of the result cache
+
+    Returns:
+        dict | None: cache statistics, or `None` if the cache isn't enabled
+    """
+
+    return self._cache.stats() if self._cache else None
@@ -0,0 +1,327 @@
+import time
+from contextlib import contextmanager
+from itertools import count
+from urllib.parse import urlsplit
+
+from pg_data_etl import helpers, instrumentation
+
+# Savepoint names only need to be unique within one transaction
+_savepoint_ids = count()
+
+
+@contextmanager
+def _savepoint(conn, rollback: bool = False):
+    """
+    - Run a block inside a savepoint on a raw `psycopg2` connection, so a failure
+    only undoes that block and leaves the rest of the session's transaction intact
+    - With `rollback=True` the block is always undone, e.g. to throw away a temporary
+    view without touching anything else done on the connection
+    """
+
+    name = f"pg_data_etl_{next(_savepoint_ids)}"
+
+    cursor = conn.cursor()
+    cursor.execute(f"SAVEPOINT {name};")
+
+    try:
+        yield conn
+    except BaseException:
+        if not conn.closed:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {name};")
+        raise
+    else:
+        if rollback:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {name};")
+
+        cursor.execute(f"RELEASE SAVEPOINT {name};")
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def session(self):
+    """
+    - Context manager that runs every `Database` method called inside of it, on this
+    thread, through one shared connection and one transaction
+    - The transaction is committed once when the outermost `session()` ends, or rolled
+    back entirely if it raises
+    - Each helper called inside the session (and any nested `session()`) runs in its own
+    savepoint, so a helper that fails and is handled doesn't abort the whole session
+    - Actions that shell out to other programs (`psql`, `pg_dump`, `shp2pgsql`,
+    `ogr2ogr`, ...) use their own connections and aren't part of the session
+
+    ```python
+    >>> with db.session():
+    ...     db.import_geodataframe(gdf, "gis.parcels")
+    ...     db.table_rename_column("gis.parcels", "objectid", "parcel_id")
+    ```
+
+    Returns:
+        sqlalchemy.engine.Connection: the session's connection
+    """
+
+    import sqlalchemy
+
+    state = self._session
+
+    if getattr(state, "connection", None) is not None:
+        with state.connection.begin_nested():
+            yield state.connection
+        return
+
+    engine = self._engine or sqlalchemy.create_engine(self.uri)
+
+    try:
+        with instrumentation.waiting():
+            conn = engine.connect()
+
+        with conn:
+            with conn.begin():
+                state.connection = conn
+
+                try:
+                    yield conn
+                finally:
+                    state.connection = None
+    finally:
+        if engine is not self._engine:
+            engine.dispose()
+
+        _record_write(self)
+
+
+@contextmanager
+def pin_to_primary(self):
+    """
+    - Context manager that sends every read on this thread to the primary, even when
+    read replicas are configured
+    - Use it to read back data right after writing it, without waiting for replication
+
+    ```python
+    >>> db.execute("UPDATE counts SET volume = 0 WHERE station = 1")
+    >>> with db.pin_to_primary():
+    ...     db.df("SELECT * FROM counts WHERE station = 1")
+    ```
+    """
+
+    routing = self._routing
+    routing.pinned = getattr(routing, "pinned", 0) + 1
+
+    try:
+        yield
+    finally:
+        routing.pinned -= 1
+
+
+def _record_write(self) -> None:
+    # Reads on this thread stick to the primary for a moment, see `ReplicaRouter`
+    if self._router:
+        self._routing.last_write = time.monotonic()
+
+
+@contextmanager
+def _replica(self, read_only: bool = True):
+    """
+    - Choose a read replica for one read-only block, or yield `None` to use the primary
+    - The primary is used inside of `session()` and `pin_to_primary()`, just after a write
+    on this thread, and when no replica is available
+    """
+
+    router = self._router
+    routing = self._routing
+
+    if (
+        not read_only
+        or router is None
+        or getattr(self._session, "connection", None) is not None
+        or getattr(routing, "pinned", 0)
+        or time.monotonic() - getattr(routing, "last_write", float("-inf")) < router.sticky_seconds
+    ):
+        yield None
+        return
+
+    uri = router.acquire()
+
+    try:
+        yield uri
+    finally:
+        if uri:
+            router.release(uri)
+
+
+def _replica_failed(self, uri: str, error: Exception) -> None:
+    location = urlsplit(uri)
+
+    print(f"Replica {location.hostname}:{location.port} is unavailable, reading from the primary")
+    print(f"\t-> {str(error).strip()}")
+
+    self._router.mark_down(uri)
+
+
+@contextmanager
+def connection(self, super_uri: bool = False, read_only: bool = False):
+    """
+    - Context manager that yields a `psycopg2` connection
+    - The transaction is committed if the block succeeds and rolled back if it raises
+    - The connection is closed afterwards, or returned to the pool if `enable_pool()` was used
+    - Inside of `session()`, this yields the session's connection and runs the block
+    in a savepoint instead
+    - With `read_only=True` and read replicas configured, this connects to a replica,
+    or to the primary if the replica can't be reached
+
+    Arguments:
+        super_uri (bool): flag to control whether this connects to the analysis db or super db
+        read_only (bool): flag that the block only reads, so it may run on a read replica
+
+    Returns:
+        psycopg2.extensions.connection: an open connection
+    """
+
+    import psycopg2
+
+    shared = getattr(self._session, "connection", None)
+
+    if shared is not None and not super_uri:
+        with _savepoint(shared.connection.dbapi_connection) as conn:
+            yield conn
+        return
+
+    with _replica(self, read_only and not super_uri) as replica:
+        conn = None
+
+        if replica:
+            pool = self._router.pools.get(replica)
+
+            try:
+                with instrumentation.waiting():
+                    conn = pool.getconn() if pool else psycopg2.connect(replica)
+            except psycopg2.OperationalError as e:
+                _replica_failed(self, replica, e)
+
+        if conn is None:
+            uri = self.uri_superuser if super_uri else self.uri
+            pool = None if super_uri else self._pool
+
+            with instrumentation.waiting():
+                conn = pool.getconn() if pool else psycopg2.connect(uri)
+
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            if pool:
+                pool.putconn(conn)
+            else:
+                conn.close()
+
+            if not read_only and not super_uri:
+                _record_write(self)
+
+
+@contextmanager
+def sqlalchemy_connection(self, read_only: bool = False):
+    """
+    - Context manager that yields a `sqlalchemy` connection inside of a transaction
+    - Use this for anything that goes through `pandas`/`geopandas` I/O
+    - Inside of `session()`, this yields the session's connection and runs the block
+    in a savepoint instead
+    - With `read_only=True` and read replicas configured, this connects to a replica,
+    or to the primary if the replica can't be reached
+
+    Arguments:
+        read_only (bool): flag that the block only reads, so it may run on a read replica
+
+    Returns:
+        sqlalchemy.engine.Connection: an open connection with an active transaction
+    """
+
+    import sqlalchemy
+
+    shared = getattr(self._session, "connection", None)
+
+    if shared is not None:
+        with shared.begin_nested():
+            yield shared
+        return
+
+    with _replica(self, read_only) as replica:
+        conn = None
+
+        if replica:
+            engine = sqlalchemy.create_engine(replica)
+
+            try:
+                with instrumentation.waiting():
+                    conn = engine.connect()
+            except sqlalchemy.exc.OperationalError as e:
+                engine.dispose()
+                _replica_failed(self, replica, e.orig or e)
+
+        if conn is None:
+            engine = self._engine or sqlalchemy.create_engine(self.uri)
+
+        try:
+            if conn is None:
+                with instrumentation.waiting():
+                    conn = engine.connect()
+
+            with conn:
+                with conn.begin():
+                    yield conn
+        finally:
+            if engine is not self._engine:
+                engine.dispose()
+
+            if not read_only:
+                _record_write(self)
+
+
+def enable_pool(self, maxconn: int = 10) -> None:
+    """
+    - Share up to `maxconn` open connections between all actions on this `Database`,
+    instead of opening and closing a new connection for every action
+    - This makes the `Database` safe to use from several threads at once, e.g. with
+    a `concurrent.futures.ThreadPoolExecutor`
+
+    Arguments:
+        maxconn (int): maximum number of connections open at once, per driver
+
+    Returns:
+        None: but `connection()` and `sqlalchemy_connection()` now draw from the pools
+    """
+
+    import sqlalchemy
+
+    self.close_pool()
+
+    self._pool = helpers.ConnectionPool(self.uri, maxconn=maxconn)
+    self._engine = sqlalchemy.create_engine(self.uri, pool_size=maxconn, max_overflow=0)
+
+    if self._router:
+        self._router.pools = {
+            uri: helpers.ConnectionPool(uri, maxconn=maxconn) for uri in self._router.uris
+        }
+
+
+def close_pool(self) -> None:
+    """
+    - Close all pooled connections and go back to one connection per action
+    """
+
+    if self._pool:
+        self._pool.closeall()
+        self._pool = None
+
+    if self._engine:
+        self._engine.dispose()
+        self._engine = None
+
+    if self._router:
+        for pool in self._router.pools.values():
+            pool.closeall()
+
+        self._router.pools = {}
@@ -0,0 +1,209 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterator
+
+from pg_data_etl import instrumentation
+
+from .connection import _replica, _replica_failed
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# Arrow types for Postgres type OIDs, used when ADBC isn't installed.
+# Anything not listed here comes through as Postgres' own text output
+ARROW_TYPES = {
+    16: "bool_",
+    17: "binary",
+    20: "int64",
+    21: "int16",
+    23: "int32",
+    25: "string",
+    700: "float32",
+    701: "float64",
+    1042: "string",
+    1043: "string",
+    1082: "date32",
+}
+
+# Declared `numeric(p, s)` columns that fit become `decimal128(p, s)`. Wider or
+# unconstrained `numeric` columns become strings, so no digits are lost
+NUMERIC_OID = 1700
+MAX_DECIMAL128_PRECISION = 38
+
+
+def _arrow_type(column) -> pa.DataType:
+    import pyarrow as pa
+
+    oid = column.type_code
+
+    if oid == NUMERIC_OID and (column.precision or 0) <= MAX_DECIMAL128_PRECISION:
+        return pa.decimal128(column.precision, column.scale)
+
+    if oid == 1114:
+        return pa.timestamp("us")
+
+    if oid == 1184:
+        return pa.timestamp("us", tz="UTC")
+
+    return getattr(pa, ARROW_TYPES.get(oid, "string"))()
+
+
+def _read_unmapped_types_as_text(cursor) -> None:
+    """
+    - Make `cursor` return the text Postgres sent for every type without an Arrow
+    mapping, instead of a Python object, e.g. JSON text for json/jsonb rather than the
+    repr of a dict, and `{1,2}` rather than `[1, 2]` for arrays
+    """
+    from psycopg2 import extensions
+
+    converted = set(ARROW_TYPES) | {NUMERIC_OID, 1114, 1184}
+    oids = tuple(oid for oid in extensions.string_types if oid not in converted)
+
+    as_text = extensions.new_type(oids, "PG_DATA_ETL_TEXT", lambda value, cursor: value)
+    extensions.register_type(as_text, cursor)
+
+
+def _has_adbc() -> bool:
+    try:
+        import adbc_driver_postgresql.dbapi  # noqa: F401
+    except ImportError:
+        return False
+
+    return True
+
+
+def _batches_with_adbc(self, query: str) -> Iterator:
+    """
+    - Stream record batches with the ADBC Postgres driver, which decodes binary COPY
+    output directly into Arrow memory
+    """
+    import adbc_driver_postgresql.dbapi
+
+    with _replica(self) as replica:
+        connection = None
+
+        if replica:
+            try:
+                connection = adbc_driver_postgresql.dbapi.connect(replica)
+            except Exception as e:
+                _replica_failed(self, replica, e)
+
+        if connection is None:
+            connection = adbc_driver_postgresql.dbapi.connect(self.uri)
+
+        with connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query)
+                reader = cursor.fetch_record_batch()
+
+                yield reader.schema
+                yield from reader
+
+
+def _batches_with_psycopg2(self, query: str, batch_size: int) -> Iterator:
+    """
+    - Stream record batches through a server-side cursor, `batch_size` rows at a time
+    """
+    import pyarrow as pa
+
+    with self.connection(read_only=True) as connection:
+        cursor = connection.cursor(name="pg_data_etl_arrow")
+        cursor.itersize = batch_size
+        _read_unmapped_types_as_text(cursor)
+        cursor.execute(query)
+
+        rows = cursor.fetchmany(batch_size)
+
+        schema = pa.schema(
+            [(c.name, _arrow_type(c)) for c in cursor.description],
+        )
+        yield schema
+
+        # Numeric columns too wide for decimal128 keep every digit as text
+        wide_numerics = [
+            i
+            for i, (c, field) in enumerate(zip(cursor.description, schema))
+            if c.type_code == NUMERIC_OID and pa.types.is_string(field.type)
+        ]
+
+        while rows:
+            columns = list(zip(*rows))
+
+            for i in wide_numerics:
+                columns[i] = [None if v is None else str(v) for v in columns[i]]
+
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            )
+
+            rows = cursor.fetchmany(batch_size)
+
+        cursor.close()
+
+
+def arrow_batches(self, query: str, batch_size: int = 100_000) -> Iterator:
+    """
+    - Stream the result of a query as `pyarrow.RecordBatch` objects
+    - The first item yielded is the `pyarrow.Schema`
+    - Uses the ADBC driver (`adbc-driver-postgresql`) when it's installed, and otherwise
+    fetches `batch_size` rows at a time through a server-side cursor
+    - Without ADBC, types with no Arrow equivalent (json, arrays, intervals, ...) are
+    returned as the text Postgres prints for them
+
+    Arguments:
+        query (str): any valid SQL query that returns tabular data
+        batch_size (int): rows per batch, for the server-side cursor fallback
+
+    Returns:
+        Iterator: the schema, followed by record batches
+    """
+
+    if _has_adbc():
+        yield from _batches_with_adbc(self, query)
+    else:
+        yield from _batches_with_psycopg2(self, query, batch_size)
+
+
+def arrow(
+    self, query: str, batch_size: int = 100_000, to_pandas: bool = False
+) -> pa.Table | pd.DataFrame:
+    """
+    - Get a `pyarrow.Table` from a SQL query
+    - With the optional ADBC driver (`pip install adbc-driver-postgresql`, Python 3.9+)
+    rows are decoded straight into Arrow memory, without building a Python object for
+    every value the way `pandas.read_sql()` does
+    - Without it, `batch_size` rows at a time are fetched as Python objects through
+    `psycopg2` and converted to Arrow, which bounds memory use but isn't faster
+    - Set `to_pandas=True` for a dataframe whose columns are backed by the Arrow memory
+    (`pd.ArrowDtype`), which skips the conversion to NumPy/object columns
+
+    Arguments:
+        query (str): any valid SQL query that returns tabular data
+        batch_size (int): rows per batch, for the server-side cursor fallback
+        to_pandas (bool): flag to return an Arrow-backed `pandas.DataFrame` instead
+
+    Returns:
+        pa.Table | pd.DataFrame: query output
+    """
+
+    import pyarrow as pa
+
+    if self._profiler:
+        self._profiler.explain(query, "arrow")
+
+    with instrumentation.track("arrow", query, db=self) as event:
+        batches = arrow_batches(self, query, batch_size)
+        schema = next(batches)
+
+        table = pa.Table.from_batches(list(batches), schema=schema)
+
+        event.rows = table.num_rows
+        event.bytes = table.nbytes
+
+    if to_pandas:
+        import pandas as pd
+
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    return table
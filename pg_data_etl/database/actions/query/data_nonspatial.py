@@ -1,22 +1,177 @@
-import pandas as pd
-import sqlalchemy
+from __future__ import annotations
+from typing import TYPE_CHECKING
 
+from pg_data_etl import instrumentation
 
-def df(self, query: str) -> pd.DataFrame:
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Postgres type OIDs, as reported in `cursor.description`
+INTEGER_OIDS = {21: "Int16", 23: "Int32", 20: "Int64"}
+FLOAT_OIDS = {700, 701, 1700}
+TEXT_OIDS = {19, 25, 1042, 1043}
+BOOLEAN_OIDS = {16}
+DATETIME_OIDS = {1082, 1114, 1184}
+
+# Text columns with fewer unique values than this share of their length become categoricals
+CATEGORY_RATIO = 0.5
+
+
+def df(self, query: str, cache: bool = True, compact: bool = False) -> pd.DataFrame:
     """
     - Return a `pandas.Dataframe` from a SQL query
+    - If `enable_cache()` was used, an unchanged result is read from disk instead
+    - Set `compact=True` to pick memory-efficient dtypes from the Postgres column types:
+        - `smallint`/`integer`/`bigint` become nullable `Int16`/`Int32`/`Int64`,
+        instead of `float64` when they contain NULLs
+        - `real`, and `double precision`/`numeric` that survive the round trip, become `float32`.
+        Other `numeric` columns become `float64` instead of `Decimal` objects
+        - low-cardinality text becomes `category`, other text becomes Arrow-backed strings
+        when `pyarrow` is installed (`pip install pg-data-etl[arrow]`), or pandas' own
+        `string` dtype when it isn't
+        - `boolean` becomes nullable `boolean`, and dates/timestamps become `datetime64`
 
     Arguments:
         query (str): any valid SQL query that returns tabular data
+        cache (bool): set to `False` to bypass the result cache for this query
+        compact (bool): flag to shrink the dataframe's memory use with compact dtypes
 
     Returns:
         pd.DataFrame: a pandas dataframe with all rows/columns from the query
     """
 
-    engine = sqlalchemy.create_engine(self.uri)
+    kind = "df:compact" if compact else "df"
+
+    if self._cache:
+        return self._cache.fetch(
+            self, query, lambda: _df(self, query, compact), kind, use_cache=cache
+        )
+
+    return _df(self, query, compact)
+
+
+def _df(self, query: str, compact: bool = False) -> pd.DataFrame:
+    import pandas as pd
+
+    if self._profiler:
+        self._profiler.explain(query, "df")
+
+    with instrumentation.track("df", query, db=self) as event:
+        if compact:
+            df = _compact_df(self, query)
+
+        else:
+            with self.sqlalchemy_connection(read_only=True) as connection:
+                df = pd.read_sql(query, connection)
+
+        event.rows = len(df)
+
+    return df
+
+
+def _compact_df(self, query: str) -> pd.DataFrame:
+    import pandas as pd
+
+    with self.connection(read_only=True) as connection:
+        cursor = connection.cursor()
+        cursor.execute(query)
+
+        columns = [c.name for c in cursor.description]
+        type_codes = [c.type_code for c in cursor.description]
+
+        rows = cursor.fetchall()
+        df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+        cursor.close()
 
-    df = pd.read_sql(query, engine)
+    # from_records() turns integer columns with NULLs into float64, which can't hold
+    # every bigint exactly, so they're rebuilt from the original Python ints.
+    # Columns are set by position, since query results can repeat a column name
+    df.columns = range(len(columns))
 
-    engine.dispose()
+    for i, oid in enumerate(type_codes):
+        if oid in INTEGER_OIDS:
+            df[i] = pd.Series([row[i] for row in rows], index=df.index, dtype=object)
+
+    df.columns = columns
+
+    before = df.memory_usage(deep=True).sum()
+
+    df = compact_dtypes(df, type_codes)
+
+    after = df.memory_usage(deep=True).sum()
+
+    if before:
+        print(
+            f"Compact dtypes: {before / 1024**2:.1f} MB -> {after / 1024**2:.1f} MB "
+            f"({1 - after / before:.0%} smaller)"
+        )
 
     return df
+
+
+def _float_column(values: pd.Series) -> pd.Series:
+    import numpy as np
+
+    values = values.astype("float64")
+    as_float32 = values.astype("float32")
+
+    # Only downcast when every value survives the round trip
+    if np.array_equal(as_float32.astype("float64").to_numpy(), values.to_numpy(), equal_nan=True):
+        return as_float32
+
+    return values
+
+
+def _string_dtype():
+    import pandas as pd
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.StringDtype("python")
+
+    return pd.StringDtype("pyarrow")
+
+
+def compact_dtypes(df: pd.DataFrame, type_codes: list) -> pd.DataFrame:
+    """
+    - Convert each column of `df` to the most compact dtype for its Postgres type
+
+    Arguments:
+        df (pd.DataFrame): data built from a query's rows
+        type_codes (list): Postgres type OID of each column, e.g. from `cursor.description`
+
+    Returns:
+        pd.DataFrame: the same data with compact dtypes
+    """
+
+    import pandas as pd
+
+    converted = {}
+
+    for (name, values), oid in zip(df.items(), type_codes):
+        if oid in INTEGER_OIDS:
+            converted[name] = pd.Series(
+                pd.array(values.tolist(), dtype=INTEGER_OIDS[oid]), index=values.index
+            )
+
+        elif oid in FLOAT_OIDS:
+            converted[name] = _float_column(values)
+
+        elif oid in BOOLEAN_OIDS:
+            converted[name] = values.astype("boolean")
+
+        elif oid in DATETIME_OIDS:
+            converted[name] = pd.to_datetime(values, utc=oid == 1184)
+
+        elif oid in TEXT_OIDS:
+            if values.nunique() < len(values) * CATEGORY_RATIO:
+                converted[name] = values.astype("category")
+            else:
+                converted[name] = values.astype(_string_dtype())
+
+        else:
+            converted[name] = values
+
+    return pd.DataFrame(converted, index=df.index)
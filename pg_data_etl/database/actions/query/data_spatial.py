@@ -1,23 +1,318 @@
-import sqlalchemy
-import geopandas as gpd
+from __future__ import annotations
+import math
+from typing import TYPE_CHECKING, Iterator
 
+from pg_data_etl import helpers, instrumentation
 
-def gdf(self, query: str, geom_col: str = "geom") -> gpd.GeoDataFrame:
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+BYTEA_OID = 17
+
+
+def gdf(
+    self, query: str, geom_col: str | None = None, cache: bool = True, binary: bool = True
+) -> gpd.GeoDataFrame:
     """
     - Get a `geopandas.GeoDataFrame` from a SQL query
+    - Geometries are fetched as binary EWKB and decoded in one vectorized `shapely` call,
+    instead of parsing hex-encoded text one row at a time
+    - The geometry column(s) and CRS are detected from the query, so `geom_col` is only
+    needed to pick the active geometry when there's more than one. Otherwise `"geom"`
+    is preferred, then the first geometry column
+    - Set `binary=False` to use `GeoDataFrame.from_postgis()` instead
+    - If `enable_cache()` was used, an unchanged result is read from disk instead
 
     Arguments:
         query (str): `PostGIS` query as a string
-        geom_col (str): geometry column name in the query. Usually `'geom'` or `'shape'`
+        geom_col (str | None): geometry column name in the query. Usually `'geom'` or `'shape'`
+        cache (bool): set to `False` to bypass the result cache for this query
+        binary (bool): set to `False` to read with `GeoDataFrame.from_postgis()`
 
     Returns:
         gpd.GeoDataFrame: query output as GIS data
     """
 
-    connection = sqlalchemy.create_engine(self.uri)
+    kind = f"gdf:{geom_col or 'auto'}" if binary else f"gdf:{geom_col or 'geom'}:text"
+
+    if self._cache:
+        return self._cache.fetch(
+            self, query, lambda: _gdf(self, query, geom_col, binary), kind, use_cache=cache
+        )
+
+    return _gdf(self, query, geom_col, binary)
+
 
-    gdf = gpd.GeoDataFrame.from_postgis(query, connection, geom_col=geom_col)
+def _gdf(self, query: str, geom_col: str | None, binary: bool = True) -> gpd.GeoDataFrame:
+    import geopandas as gpd
 
-    connection.dispose()
+    if self._profiler:
+        self._profiler.explain(query, "gdf")
+
+    with instrumentation.track("gdf", query, db=self) as event:
+        if binary:
+            gdf = _gdf_from_ewkb(self, query, geom_col)
+
+        else:
+            with self.sqlalchemy_connection(read_only=True) as connection:
+                gdf = gpd.GeoDataFrame.from_postgis(query, connection, geom_col=geom_col or "geom")
+
+        event.rows = len(gdf)
 
     return gdf
+
+
+def _gdf_from_ewkb(self, query: str, geom_col: str | None) -> gpd.GeoDataFrame:
+    """
+    - Select every geometry column of `query` as `ST_AsEWKB()`, which arrives as binary
+    `bytea`, and decode each one with a single `shapely.from_wkb()` call
+    - `geography` columns are read the same way, and WKB that's already binary
+    (e.g. `ST_AsBinary(geom) AS geom`) is decoded when it's the active geometry
+    - The CRS comes from the SRID embedded in the EWKB
+    - Queries with duplicate column names can't be wrapped this way, and neither can an
+    active geometry of any other type, so they fall back to `geopandas.read_postgis()`
+    """
+
+    import geopandas as gpd
+    import numpy as np
+    import pandas as pd
+    import shapely
+
+    query = query.strip().rstrip(";")
+
+    with self.connection(read_only=True) as connection:
+        cursor = connection.cursor()
+
+        cursor.execute(
+            "SELECT oid, typname FROM pg_type WHERE typname IN ('geometry', 'geography')"
+        )
+        spatial_types = dict(cursor.fetchall())
+        spatial_types[BYTEA_OID] = "bytea"
+
+        # Find the geometry columns without running the query
+        cursor.execute(f"SELECT * FROM ({query}) AS q LIMIT 0")
+        columns = [c.name for c in cursor.description]
+        types = {c.name: spatial_types.get(c.type_code) for c in cursor.description}
+        geom_columns = [c for c in columns if types[c] in ["geometry", "geography"]]
+
+        if geom_col and geom_col not in columns:
+            raise ValueError(f"{geom_col=} is not one of the query's columns: {columns}")
+
+        if geom_col is None:
+            geom_col = "geom" if "geom" in geom_columns or not geom_columns else geom_columns[0]
+
+        if types.get(geom_col) == "bytea":
+            geom_columns.append(geom_col)
+
+        use_ewkb = geom_col in geom_columns and len(set(columns)) == len(columns)
+
+        if use_ewkb:
+            quoted = {c: '"' + c.replace('"', '""') + '"' for c in columns}
+            as_ewkb = {
+                "geometry": "ST_AsEWKB(q.{0}) AS {0}",
+                "geography": "ST_AsEWKB(q.{0}::geometry) AS {0}",
+                "bytea": "q.{0}",
+            }
+            selected = [
+                as_ewkb[types[c]].format(quoted[c]) if c in geom_columns else f"q.{quoted[c]}"
+                for c in columns
+            ]
+
+            cursor.execute(f"SELECT {', '.join(selected)} FROM ({query}) AS q")
+
+            df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns, coerce_float=True)
+
+        cursor.close()
+
+    if not use_ewkb:
+        with self.sqlalchemy_connection(read_only=True) as connection:
+            return gpd.read_postgis(query, connection, geom_col=geom_col)
+
+    crs = None
+
+    for c in geom_columns:
+        wkb = np.array([None if v is None else bytes(v) for v in df[c]], dtype=object)
+        geoms = shapely.from_wkb(wkb)
+
+        srids = set(np.unique(shapely.get_srid(geoms[~shapely.is_missing(geoms)]))) - {0}
+
+        if len(srids) > 1:
+            print(f"Warning! Column '{c}' mixes SRIDs {sorted(srids)}, so it has no CRS")
+
+        column_crs = f"EPSG:{srids.pop()}" if len(srids) == 1 else None
+        df[c] = gpd.GeoSeries(geoms, index=df.index, crs=column_crs)
+
+        if c == geom_col:
+            crs = column_crs
+
+    return gpd.GeoDataFrame(df, geometry=geom_col, crs=crs)
+
+
+def _srid_from_crs(crs) -> int:
+    # Accepts 2272, "EPSG:2272", or anything with a `to_epsg()` like `pyproj.CRS`
+    if isinstance(crs, int):
+        return crs
+
+    if isinstance(crs, str):
+        return int(crs.split(":")[-1])
+
+    return crs.to_epsg()
+
+
+def _geometry_column(self, tablename: str, geom_col: str | None = None) -> tuple:
+    """
+    - Get the name and SRID of a table's geometry column from `geometry_columns`
+    - Without `geom_col`, `"geom"` is preferred, then the first geometry column
+    """
+
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+
+    found = dict(self.query_as_list_of_lists(f"""
+            SELECT f_geometry_column, srid
+            FROM geometry_columns
+            WHERE f_table_schema = '{schema}' AND f_table_name = '{tbl}'
+            ORDER BY f_geometry_column
+        """))
+
+    if not found:
+        raise ValueError(f"{tablename} does not have a geometry column")
+
+    if geom_col is None:
+        geom_col = "geom" if "geom" in found else next(iter(found))
+
+    if geom_col not in found:
+        raise ValueError(f"{geom_col=} is not one of the geometry columns: {list(found)}")
+
+    return geom_col, found[geom_col]
+
+
+def _bbox_where(geom_col: str, bbox: tuple, bbox_srid: int, table_srid: int) -> str:
+    """
+    - Build a `WHERE` clause that uses the GIST index with `&&` before the exact `ST_Intersects()`
+    - The bbox is reprojected to the table's SRID, never the other way around, and its
+    edges are densified first so they stay accurate after reprojection
+    """
+
+    xmin, ymin, xmax, ymax = bbox
+
+    envelope = f"ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax}, {bbox_srid})"
+
+    if bbox_srid != table_srid:
+        step = max(xmax - xmin, ymax - ymin) / 32
+        envelope = f"ST_Transform(ST_Segmentize({envelope}, {step}), {table_srid})"
+
+    return f'"{geom_col}" && {envelope} AND ST_Intersects("{geom_col}", {envelope})'
+
+
+def gdf_bbox(
+    self,
+    tablename: str,
+    bbox: tuple,
+    bbox_crs: int | str | None = None,
+    columns: str = "*",
+    geom_col: str | None = None,
+    cache: bool = True,
+) -> gpd.GeoDataFrame:
+    """
+    - Get the features of a spatial table that intersect a bounding box
+    - The query filters with `&&` so the GIST index is used, then with `ST_Intersects()`
+    - The bbox is reprojected into the table's SRID rather than reprojecting every feature
+
+    ```python
+    >>> db.gdf_bbox("gis.parcels", (-75.2, 39.9, -75.1, 40.0), bbox_crs=4326)
+    ```
+
+    Arguments:
+        tablename (str): name of the spatial table, optionally with schema prefix
+        bbox (tuple): `(xmin, ymin, xmax, ymax)`
+        bbox_crs (int | str | None): EPSG code of the bbox, e.g. `4326` or `"EPSG:4326"`.
+        Defaults to the table's SRID
+        columns (str): columns to select, as a SQL select list
+        geom_col (str | None): geometry column to filter on, if the table has more than one
+        cache (bool): set to `False` to bypass the result cache for this query
+
+    Returns:
+        gpd.GeoDataFrame: the matching features, in the table's CRS
+    """
+
+    geom_col, table_srid = _geometry_column(self, tablename, geom_col)
+    bbox_srid = table_srid if bbox_crs is None else _srid_from_crs(bbox_crs)
+
+    query = f"""
+        SELECT {columns}
+        FROM {tablename}
+        WHERE {_bbox_where(geom_col, bbox, bbox_srid, table_srid)}
+    """
+
+    return self.gdf(query, geom_col=geom_col, cache=cache)
+
+
+def iter_tiles(
+    self,
+    tablename: str,
+    tile_size: float,
+    columns: str = "*",
+    geom_col: str | None = None,
+) -> Iterator:
+    """
+    - Walk a large spatial table one square tile at a time, so only one tile's
+    features are in memory at once
+    - Each tile is fetched with `&&` so the GIST index is used
+    - Every feature is returned exactly once, by the tile that holds the lower-left
+    corner of its bounding box. Empty tiles are skipped
+
+    ```python
+    >>> for bounds, tile in db.iter_tiles("gis.parcels", tile_size=5280):
+    ...     process(tile)
+    ```
+
+    Arguments:
+        tablename (str): name of the spatial table, optionally with schema prefix
+        tile_size (float): width and height of each tile, in the units of the table's SRID
+        columns (str): columns to select, as a SQL select list
+        geom_col (str | None): geometry column to tile on, if the table has more than one
+
+    Returns:
+        Iterator: of `((xmin, ymin, xmax, ymax), gpd.GeoDataFrame)` for each non-empty tile
+    """
+
+    geom_col, srid = _geometry_column(self, tablename, geom_col)
+
+    xmin, ymin, xmax, ymax = self.query_as_list_of_lists(f"""
+        SELECT ST_XMin(e), ST_YMin(e), ST_XMax(e), ST_YMax(e)
+        FROM (SELECT ST_Extent("{geom_col}") AS e FROM {tablename}) AS extent
+    """)[0]
+
+    if xmin is None:
+        return
+
+    n_columns = max(math.ceil((xmax - xmin) / tile_size), 1)
+    n_rows = max(math.ceil((ymax - ymin) / tile_size), 1)
+
+    # Neighbouring tiles share the exact same float for their common edge, so no corner
+    # can fall between them. The last edges always reach the extent
+    x_edges = [xmin + i * tile_size for i in range(n_columns + 1)]
+    y_edges = [ymin + i * tile_size for i in range(n_rows + 1)]
+    x_edges[-1], y_edges[-1] = max(x_edges[-1], xmax), max(y_edges[-1], ymax)
+
+    for row in range(n_rows):
+        for column in range(n_columns):
+            x0, y0 = x_edges[column], y_edges[row]
+            bounds = (x0, y0, x_edges[column + 1], y_edges[row + 1])
+
+            # The last row and column also take corners that sit exactly on the extent
+            x_end = "<=" if column == n_columns - 1 else "<"
+            y_end = "<=" if row == n_rows - 1 else "<"
+
+            query = f"""
+                SELECT {columns}
+                FROM {tablename}
+                WHERE "{geom_col}" && ST_MakeEnvelope({x0}, {y0}, {bounds[2]}, {bounds[3]}, {srid})
+                AND ST_XMin("{geom_col}") >= {x0} AND ST_XMin("{geom_col}") {x_end} {bounds[2]}
+                AND ST_YMin("{geom_col}") >= {y0} AND ST_YMin("{geom_col}") {y_end} {bounds[3]}
+            """
+
+            tile = self.gdf(query, geom_col=geom_col, cache=False)
+
+            if len(tile):
+                yield bounds, tile
@@ -1,4 +1,4 @@
-import psycopg2
+from pg_data_etl import instrumentation
 
 
 def execute(self, query: str) -> None:
@@ -12,13 +12,17 @@ def execute(self, query: str) -> None:
         None: although the database is updated in-place with whatever is in the query
     """
 
-    connection = psycopg2.connect(self.uri)
-    cursor = connection.cursor()
+    with instrumentation.track("execute", query, db=self) as event:
+        with self.connection() as connection:
+            cursor = connection.cursor()
 
-    cursor.execute(query)
+            if self._profiler:
+                self._profiler.execute(cursor, query)
+            else:
+                cursor.execute(query)
 
-    cursor.close()
-    connection.commit()
-    connection.close()
+            event.rows = cursor.rowcount
+
+            cursor.close()
 
     return None
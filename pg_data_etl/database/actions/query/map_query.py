@@ -0,0 +1,156 @@
+from __future__ import annotations
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from pg_data_etl import helpers, instrumentation
+
+from .connection import _replica
+
+
+def _server_connection_cap(self) -> int:
+    """
+    - Get how many more connections the server will accept from this role on this database,
+    after `superuser_reserved_connections` and any `CONNECTION LIMIT` on the role or database
+    """
+
+    free, role_limit, role_used, db_limit, db_used = self.query_as_list_of_lists("""
+        SELECT
+            current_setting('max_connections')::int
+                - current_setting('superuser_reserved_connections')::int
+                - (SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend'),
+            (SELECT rolconnlimit FROM pg_roles WHERE rolname = current_user),
+            (SELECT count(*) FROM pg_stat_activity WHERE usename = current_user),
+            (SELECT datconnlimit FROM pg_database WHERE datname = current_database()),
+            (SELECT count(*) FROM pg_stat_activity WHERE datname = current_database())
+    """)[0]
+
+    caps = [free]
+
+    if role_limit >= 0:
+        caps.append(role_limit - role_used)
+
+    if db_limit >= 0:
+        caps.append(db_limit - db_used)
+
+    return max(min(caps), 1)
+
+
+def _run_query(self, pool, key, query: str, as_: str) -> dict:
+    start = time.perf_counter()
+    result = {
+        "key": key,
+        "status": "ok",
+        "seconds": None,
+        "rows": None,
+        "result": None,
+        "error": None,
+    }
+
+    try:
+        with instrumentation.track("map_query", query, db=self) as event:
+            conn = pool.getconn()
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute(query)
+
+                rows = cursor.fetchall()
+                columns = [c.name for c in cursor.description]
+
+                cursor.close()
+                conn.commit()
+            except BaseException:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                pool.putconn(conn)
+
+            event.rows = len(rows)
+
+        if as_ == "df":
+            import pandas as pd
+
+            result["result"] = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+        else:
+            result["result"] = [list(x) for x in rows]
+
+        result["rows"] = len(rows)
+
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+
+    result["seconds"] = round(time.perf_counter() - start, 4)
+
+    return result
+
+
+def map_query(self, queries: list | dict, workers: int = 4, as_: str = "df") -> list:
+    """
+    - Run many read-only queries at once, e.g. the same aggregate for every county
+    - Up to `workers` queries run at the same time, each on its own connection. `workers`
+    is lowered if the server wouldn't accept that many more connections
+    - Uses the pool from `enable_pool()` if there is one, and a private pool otherwise,
+    so it's safe to call while other threads use this `Database`
+    - A failing query does not stop the others. Its result has `status="error"` and the error message
+    - Queries run on their own connections, outside of any `session()`. With read
+    replicas configured, they all run on one replica
+
+    ```python
+    >>> queries = {county: f"SELECT sum(pop) FROM census WHERE county = '{county}'" for county in counties}
+    >>> for r in db.map_query(queries, workers=8, as_="rows"):
+    ...     print(r["key"], r["status"], r["seconds"], r["result"])
+    ```
+
+    Arguments:
+        queries (list | dict): SQL queries, or a dict of `{key: query}`
+        workers (int): maximum number of queries running at the same time
+        as_ (str): `"df"` for a `pandas.DataFrame` per query, or `"rows"` for a list of lists
+
+    Returns:
+        list: one dict per query, in the same order as `queries`, with `key`, `status`,
+        `seconds`, `rows`, `result` and `error`. `key` is the list index or dict key
+    """
+
+    if as_ not in ["df", "rows"]:
+        raise ValueError(f"{as_=} is not valid. Use 'df' or 'rows'")
+
+    items = list(queries.items()) if isinstance(queries, dict) else list(enumerate(queries))
+
+    with _replica(self) as replica:
+        cap = _server_connection_cap(self)
+
+        if workers > cap:
+            print(f"The server only has room for {cap} more connections, using {cap} workers")
+            workers = cap
+
+        pool = self._router.pools.get(replica) if replica else self._pool
+        pool_owner = pool is None
+
+        if pool_owner:
+            pool = helpers.ConnectionPool(replica or self.uri, maxconn=workers)
+
+        start = time.perf_counter()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+                results = list(
+                    executor.map(lambda item: _run_query(self, pool, item[0], item[1], as_), items)
+                )
+        finally:
+            if pool_owner:
+                pool.closeall()
+
+    failed = [r for r in results if r["status"] != "ok"]
+
+    print(
+        f"Ran {len(results)} queries on {workers} workers in "
+        f"{time.perf_counter() - start:.2f}s, {len(failed)} failed"
+    )
+
+    for r in failed:
+        print(f"\t-> query {r['key']!r} failed: {r['error']}")
+
+    return results
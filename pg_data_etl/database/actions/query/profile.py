@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+
+from pg_data_etl.profiling import Profiler
+
+
+@contextmanager
+def profile(self, analyze: bool = True, print_summary: bool = False):
+    """
+    - Context manager that captures `EXPLAIN` plans and timings for every statement
+    run by this `Database` inside the `with` block
+    - See `pg_data_etl.profiling` for the details of how each action is profiled
+
+    ```python
+    >>> with db.profile() as profiler:
+    ...     db.gis_make_geotable_from_query(query, "analysis.buffers", "POLYGON", 26918)
+    >>> profiler.slowest_nodes(5)
+    ```
+
+    Arguments:
+        analyze (bool): run `EXPLAIN ANALYZE` if `True`, or capture estimated plans if `False`
+        print_summary (bool): flag to print the profiler summary when the block exits
+
+    Returns:
+        Profiler: with the captured `records` and summary methods
+    """
+
+    profiler = Profiler(self, analyze=analyze)
+
+    previous_profiler = self._profiler
+    self._profiler = profiler
+
+    try:
+        yield profiler
+    finally:
+        self._profiler = previous_profiler
+
+        if print_summary:
+            profiler.print_summary()
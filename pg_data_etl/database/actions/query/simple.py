@@ -1,10 +1,11 @@
-import psycopg2
+from pg_data_etl import instrumentation
 
 
 def query_as_list_of_lists(self, query: str, super_uri: bool = False) -> list:
     """
     - Use `psycopg2` to run a query and return the result as a list of lists
-    - This will NOT commit any changes to the database
+    - The query runs in its own transaction, which is committed once the rows are fetched
+    - Inside of `session()`, it runs in the session's transaction instead
 
     Arguments:
         query (str): any valid SQL query that returns data
@@ -14,20 +15,19 @@ def query_as_list_of_lists(self, query: str, super_uri: bool = False) -> list:
         list: with each row returned from the query as its own sub-list
     """
 
-    if super_uri:
-        uri = self.uri_superuser
-    else:
-        uri = self.uri
+    if self._profiler:
+        self._profiler.explain(query, "query_as_list_of_lists", super_uri=super_uri)
 
-    connection = psycopg2.connect(uri)
-    cursor = connection.cursor()
+    with instrumentation.track("query_as_list_of_lists", query, db=self) as event:
+        with self.connection(super_uri=super_uri, read_only=True) as connection:
+            cursor = connection.cursor()
 
-    cursor.execute(query)
+            cursor.execute(query)
 
-    result = cursor.fetchall()
+            result = cursor.fetchall()
+            event.rows = len(result)
 
-    cursor.close()
-    connection.close()
+            cursor.close()
 
     return [list(x) for x in result]
 
@@ -37,6 +37,64 @@ def gis_table_add_spatial_index(self, tablename: str) -> None:
     self.execute(query)
 
 
+def gis_table_cluster_on_spatial_index(self, tablename: str) -> None:
+    """
+    - Rewrite a table in the order of its spatial index with `CLUSTER`, so features
+    that are close together in space are stored on the same pages
+    - This takes an exclusive lock on the table while it runs. The order isn't
+    maintained for rows that are added later, so re-run it after large loads
+    - A partitioned table is clustered one partition at a time, each on its own
+    spatial index, since Postgres can't `CLUSTER` a partitioned table before version 15
+
+    Arguments:
+        tablename (str): name of the spatial table to cluster
+
+    Returns:
+        None: but rewrites the table in-place and refreshes its statistics
+    """
+
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+
+    relkind = self.query_as_singleton(
+        f"SELECT relkind FROM pg_class WHERE oid = '{schema}.{tbl}'::regclass"
+    )
+
+    if relkind == "p":
+        partitions = self.query_as_list_of_lists(f"""
+            SELECT n.nspname, c.relname
+            FROM pg_partition_tree('{schema}.{tbl}'::regclass) p
+            JOIN pg_class c ON c.oid = p.relid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE p.isleaf
+        """)
+
+        for partition_schema, partition in partitions:
+            self.gis_table_cluster_on_spatial_index(f"{partition_schema}.{partition}")
+
+        self.execute(f"ANALYZE {schema}.{tbl};")
+
+        return None
+
+    query = f"""
+        SELECT i.relname
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        JOIN pg_class t ON t.oid = x.indrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        JOIN pg_am am ON am.oid = i.relam
+        WHERE n.nspname = '{schema}' AND t.relname = '{tbl}' AND am.amname = 'gist'
+        AND pg_get_indexdef(i.oid) LIKE '%(geom)%'
+    """
+
+    index_names = self.query_as_list_of_singletons(query)
+
+    if not index_names:
+        self.gis_table_add_spatial_index(tablename)
+        index_names = self.query_as_list_of_singletons(query)
+
+    self.execute(f'CLUSTER {schema}.{tbl} USING "{index_names[0]}"; ANALYZE {schema}.{tbl};')
+
+
 def gis_table_update_spatial_data_projection(
     self,
     tablename: str,
@@ -74,6 +132,8 @@ def gis_make_geotable_from_query(
     geom_type: str,
     epsg: int,
     uid_col: str = "uid",
+    spatial_order: str | None = None,
+    cluster: bool = False,
 ) -> None:
     """
     - Allow the creation of a new table in the db directly via query.
@@ -81,12 +141,20 @@ def gis_make_geotable_from_query(
     - This is especially helpful when you're working with a large dataset
     and you want to limit the I/O processing time.
 
+    - Use `spatial_order` to write the rows along a space-filling curve, so the
+    pages under the spatial index have good locality:
+        - `"hilbert"` uses `ORDER BY geom`, which sorts on a Hilbert curve in PostGIS 3.1+
+        - `"geohash"` sorts on `ST_GeoHash()` of each feature's bounding box center
+    - Use `cluster=True` to `CLUSTER` the new table on its spatial index afterwards
+
     Arguments:
         query (str): any valid SQL query that returns a spatial table
         new_table_name (str): name of the new table to hold the query output
         geom_type (str): PostGIS geometry data type returned by the query
         epsg (int): EPSG code of the geometry data returned by the query
         uid_col (str): name of the new unique ID column that will be auto-generated (defaults to 'uid')
+        spatial_order (str | None): `"hilbert"` or `"geohash"` to sort the rows as they're written
+        cluster (bool): flag to `CLUSTER` the table on its spatial index after it's built
 
     Returns:
         None: but generates a new spatial table from the query
@@ -116,6 +184,21 @@ def gis_make_geotable_from_query(
         schema, _ = helpers.convert_full_tablename_to_parts(new_table_name)
         self.schema_add(schema)
 
+        if spatial_order == "hilbert":
+            query = f"SELECT * FROM ({query}) AS unordered ORDER BY geom"
+
+        elif spatial_order == "geohash":
+            center = "ST_Centroid(ST_Envelope(geom))"
+            if int(epsg) != 4326:
+                center = f"ST_Transform({center}, 4326)"
+
+            query = f"SELECT * FROM ({query}) AS unordered ORDER BY ST_GeoHash({center})"
+
+        elif spatial_order:
+            raise ValueError(
+                f"{spatial_order=} is not supported. Valid options include: {helpers.SPATIAL_ORDERS}"
+            )
+
         query_to_make_table = f"""
             DROP TABLE IF EXISTS {new_table_name};
             CREATE TABLE {new_table_name} AS
@@ -127,6 +210,9 @@ def gis_make_geotable_from_query(
         self.table_add_uid_column(new_table_name, uid_col=uid_col)
         self.gis_table_add_spatial_index(new_table_name)
 
+        if cluster:
+            self.gis_table_cluster_on_spatial_index(new_table_name)
+
         # We're not reprojecting here, but rather forcing an entry for
         # the new geo table into the geometry_columns table
         self.gis_table_update_spatial_data_projection(new_table_name, epsg, epsg, geom_type.upper())
@@ -1,14 +1,20 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+
 from pg_data_etl import helpers
 
 
-def report_spatial(self, print_output: bool = False) -> dict:
+def report_spatial(self, print_output: bool = False, include_stats: bool = False) -> dict:
     """
     - Get a report of all spatial table in the database
     - The report groups tables first by EPSG code, then by geometry type
     - All tables that share an EPSG and geometry type are grouped into a list
+    - With `include_stats=True`, each list of tables becomes a dictionary of
+    `table_stats()` results, and the printed report includes row counts, sizes and extents
 
     Arguments:
         print_output (bool): flag to control if the report should also be printed out to console
+        include_stats (bool): flag to add the catalog estimates from `table_stats()`
 
     Returns:
         dict: keyed on EPSG code, with a sub-dictionary keyed on geometry type. Value is a list of tables
@@ -30,6 +36,13 @@ def report_spatial(self, print_output: bool = False) -> dict:
 
         output[epsg][geom_type].append(tbl)
 
+    if include_stats:
+        stats = self.table_stats()
+
+        for epsg in output:
+            for geom_type in output[epsg]:
+                output[epsg][geom_type] = {tbl: stats.get(tbl) for tbl in output[epsg][geom_type]}
+
     if print_output:
 
         print("-" * 80)
@@ -48,6 +61,15 @@ def report_spatial(self, print_output: bool = False) -> dict:
                 for tbl in output[k][geom_type]:
                     print(f"\t\t\t-> {tbl}")
 
+                    if include_stats and output[k][geom_type][tbl]:
+                        tbl_stats = output[k][geom_type][tbl]
+                        extents = [g["estimated_extent"] for g in tbl_stats["geometry"].values()]
+
+                        print(
+                            f"\t\t\t\t~{tbl_stats['estimated_rows']} rows, "
+                            f"{_pretty_bytes(tbl_stats['total_bytes'])}, extent: {extents}"
+                        )
+
     return output
 
 
@@ -71,3 +93,186 @@ def projection(self, tablename: str) -> int:
     """
 
     return self.query_as_singleton(query)
+
+
+def _pretty_bytes(num_bytes: int | None) -> str:
+    if num_bytes is None:
+        return "? bytes"
+
+    for unit in ["bytes", "kB", "MB", "GB"]:
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}"
+        num_bytes /= 1024
+
+    return f"{num_bytes:.1f} TB"
+
+
+def _quoted_tablename(tablename: str) -> str:
+    schema, tbl = helpers.convert_full_tablename_to_parts(tablename)
+
+    return f'"{schema}"."{tbl}"'
+
+
+def table_stats(
+    self,
+    tablenames: list | None = None,
+    schema: str | None = None,
+    exact: bool = False,
+    workers: int = 4,
+) -> dict:
+    """
+    - Get row counts, sizes, maintenance times and spatial extents for many tables at once
+    - By default everything comes from the system catalogs in a few bulk queries,
+    so it takes milliseconds no matter how large the tables are. Row counts and
+    extents are the planner's estimates, as of the last `ANALYZE`
+    - Set `exact=True` to also run `count(*)` and `ST_Extent()` on every table,
+    spread across `workers` parallel connections
+
+    Arguments:
+        tablenames (list | None): tables to report on, defaults to every table in the database
+        schema (str | None): optional name of schema to filter results to
+        exact (bool): flag to add exact `rows` and geometry `extent` values by scanning each table
+        workers (int): number of tables scanned at the same time when `exact=True`
+
+    Returns:
+        dict: keyed on `schema.tablename`, with a sub-dictionary of statistics for each table
+    """
+
+    query = """
+        SELECT
+            concat(n.nspname, '.', c.relname),
+            CASE WHEN c.reltuples < 0 THEN NULL ELSE c.reltuples::bigint END,
+            pg_table_size(c.oid),
+            pg_indexes_size(c.oid),
+            pg_total_relation_size(c.oid),
+            greatest(s.last_analyze, s.last_autoanalyze),
+            greatest(s.last_vacuum, s.last_autovacuum)
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+        WHERE c.relkind IN ('r', 'p', 'm')
+        AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+        AND n.nspname NOT LIKE 'pg_toast%'
+    """
+
+    output = {}
+
+    for row in self.query_as_list_of_lists(query):
+        tbl, rows, table_bytes, index_bytes, total_bytes, last_analyze, last_vacuum = row
+
+        output[tbl] = {
+            "estimated_rows": rows,
+            "table_bytes": table_bytes,
+            "index_bytes": index_bytes,
+            "total_bytes": total_bytes,
+            "indexes": {},
+            "last_analyze": last_analyze,
+            "last_vacuum": last_vacuum,
+            "geometry": {},
+        }
+
+    if tablenames is not None:
+        wanted = [".".join(helpers.convert_full_tablename_to_parts(t)) for t in tablenames]
+        output = {tbl: output[tbl] for tbl in wanted if tbl in output}
+
+    if schema:
+        output = {tbl: v for tbl, v in output.items() if tbl.split(".")[0] == schema}
+
+    index_query = """
+        SELECT concat(n.nspname, '.', t.relname), i.relname, pg_relation_size(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        JOIN pg_class t ON t.oid = x.indrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+    """
+
+    for tbl, index_name, index_bytes in self.query_as_list_of_lists(index_query):
+        if tbl in output:
+            output[tbl]["indexes"][index_name] = index_bytes
+
+    # Only PostGIS-enabled databases have geometry_columns
+    if self.query_as_singleton("SELECT to_regclass('geometry_columns') IS NOT NULL"):
+
+        geom_query = """
+            SELECT
+                concat(g.f_table_schema, '.', g.f_table_name),
+                g.f_geometry_column,
+                g.srid,
+                g.type,
+                ST_XMin(e.extent), ST_YMin(e.extent), ST_XMax(e.extent), ST_YMax(e.extent)
+            FROM geometry_columns g
+            JOIN pg_namespace n ON n.nspname = g.f_table_schema
+            JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = g.f_table_name
+            CROSS JOIN LATERAL (
+                SELECT
+                    CASE WHEN c.relkind IN ('r', 'm') THEN
+                        ST_EstimatedExtent(g.f_table_schema, g.f_table_name, g.f_geometry_column)
+                    END AS extent
+            ) e
+        """
+
+        for tbl, geom_col, srid, geom_type, *bounds in self.query_as_list_of_lists(geom_query):
+            if tbl in output:
+                output[tbl]["geometry"][geom_col] = {
+                    "srid": srid,
+                    "type": geom_type,
+                    "estimated_extent": bounds if bounds[0] is not None else None,
+                }
+
+    if exact:
+        # Share connections between the workers through the caller's pool if there is one,
+        # and a private pool otherwise, so other threads using this `Database` keep theirs
+        pool = self._pool
+        pool_owner = pool is None
+
+        if pool_owner:
+            pool = helpers.ConnectionPool(self.uri, maxconn=workers)
+
+        def scan(tbl: str) -> tuple:
+            columns = ["count(*)"] + [
+                f'ST_Extent("{geom_col}")::text' for geom_col in output[tbl]["geometry"]
+            ]
+
+            query = f"SELECT {', '.join(columns)} FROM {_quoted_tablename(tbl)}"
+
+            conn = pool.getconn()
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute(query)
+                result = cursor.fetchone()
+                cursor.close()
+                conn.commit()
+            except BaseException:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                pool.putconn(conn)
+
+            return tbl, result
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+                results = list(executor.map(scan, output))
+        finally:
+            if pool_owner:
+                pool.closeall()
+
+        for tbl, (rows, *extents) in results:
+            output[tbl]["rows"] = rows
+
+            for geom_col, extent in zip(output[tbl]["geometry"], extents):
+                output[tbl]["geometry"][geom_col]["extent"] = _parse_box2d(extent)
+
+    return output
+
+
+def _parse_box2d(box: str | None) -> list | None:
+    # e.g. 'BOX(-75.28 39.87,-74.95 40.13)'
+    if box is None:
+        return None
+
+    lower_left, upper_right = box[box.index("(") + 1 : -1].split(",")
+
+    return [float(v) for v in lower_left.split() + upper_right.split()]
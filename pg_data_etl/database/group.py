@@ -0,0 +1,161 @@
+"""
+`pg_data_etl.database.group`
+----------------------------
+
+Run the same action against many databases at once.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+
+from pg_data_etl.batch import run_batch
+
+if TYPE_CHECKING:
+    from pg_data_etl import Database
+
+
+class DatabaseGroup:
+    """
+    A named collection of `Database` objects, e.g. every database on a cluster or
+    the same database on several clusters, that runs an action against all of them
+    concurrently.
+
+    - Build it from config file entries and/or database names
+
+        ```python
+        >>> group = DatabaseGroup.from_config("gis", ["production", "staging", "replica"])
+        >>> group = DatabaseGroup.from_config(["gis", "census", "transit"], "localhost")
+        ```
+
+    - Or from `Database` objects you already have
+
+        ```python
+        >>> group = DatabaseGroup({"gis": gis_db, "census": census_db}, workers=2)
+        ```
+
+    - Then call any `Database` method by name, or pass a function that takes a `Database`
+
+        ```python
+        >>> group.run("report_spatial")
+        {'production': {'status': 'ok', 'seconds': 1.2, 'error': None, 'result': {...}}, ...}
+
+        >>> group.run(lambda db: db.tables(schema="gis"))
+        ```
+
+    ---
+
+    """
+
+    def __init__(self, databases: dict | list, workers: int = 4):
+        """
+        Arguments:
+            databases (dict | list): `{name: Database}`, or a list of `Database` objects
+            named after their database
+            workers (int): maximum number of members running an action at the same time
+        """
+
+        if isinstance(databases, dict):
+            self.members = dict(databases)
+        else:
+            self.members = {db.connection_params["db_name"]: db for db in databases}
+
+        self.workers = workers
+
+    @classmethod
+    def from_config(
+        cls,
+        db_names: str | list,
+        config_keys: str | list,
+        config_filepath: str | None = None,
+        workers: int = 4,
+    ) -> DatabaseGroup:
+        """
+        - Build one `Database` for every combination of `db_names` and `config_keys`
+        - Members are named after whichever argument is a list, or
+        `"config_key/db_name"` when both are
+
+        Arguments:
+            db_names (str | list): one or more database names
+            config_keys (str | list): one or more entries in the configuration file
+            config_filepath (str | None): path to a configuration file other than the default
+            workers (int): maximum number of members running an action at the same time
+
+        Returns:
+            DatabaseGroup: with one member per database
+        """
+
+        from pg_data_etl import Database
+
+        names = [db_names] if isinstance(db_names, str) else list(db_names)
+        keys = [config_keys] if isinstance(config_keys, str) else list(config_keys)
+
+        members = {}
+
+        for key in keys:
+            for name in names:
+                if len(keys) == 1:
+                    member = name
+                elif len(names) == 1:
+                    member = key
+                else:
+                    member = f"{key}/{name}"
+
+                members[member] = Database.from_config(name, key, config_filepath)
+
+        return cls(members, workers=workers)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __iter__(self):
+        return iter(self.members.items())
+
+    def __getitem__(self, name: str) -> Database:
+        return self.members[name]
+
+    def run(self, action: str | Callable, *args, **kwargs) -> dict:
+        """
+        - Run `action` against every member, up to `workers` of them at once
+        - A member that fails does not stop the others
+
+        Arguments:
+            action (str | Callable): name of a `Database` method, or a function that
+            takes a `Database` as its first argument
+            *args, **kwargs: passed through to `action`
+
+        Returns:
+            dict: keyed by member name, each with `status`, `seconds`, `error` and `result`
+        """
+
+        label = action if isinstance(action, str) else getattr(action, "__name__", "action")
+
+        returned = {}
+
+        def run_one(name: str) -> None:
+            db = self.members[name]
+
+            if isinstance(action, str):
+                returned[name] = getattr(db, action)(*args, **kwargs)
+            else:
+                returned[name] = action(db, *args, **kwargs)
+
+        summary = run_batch(run_one, list(self.members), jobs=self.workers, label=label)
+
+        output = {}
+
+        for r in summary["results"]:
+            output[r["target"]] = {
+                "status": r["status"],
+                "seconds": r["seconds"],
+                "error": r["error"],
+                "result": returned.get(r["target"]),
+            }
+
+            if r["status"] != "ok":
+                print(f"{label} failed on {r['target']}: {r['error']}")
+
+        print(
+            f"Ran {label} on {len(self)} databases in {summary['total_seconds']}s, "
+            f"{summary['failed']} failed"
+        )
+
+        return output
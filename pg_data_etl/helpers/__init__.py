@@ -2,3 +2,6 @@ from .commands import *  # noqa
 from .files import *  # noqa
 from .sql_tables import *  # noqa
 from .uri import *  # noqa
+from .pool import *  # noqa
+from .replicas import *  # noqa
+from .spatial_order import *  # noqa
@@ -2,27 +2,82 @@ from __future__ import annotations
 import subprocess
 from pathlib import Path
 
+from pg_data_etl import instrumentation
 
-def run_command_in_shell(command: str) -> str:
+
+def run_command_in_shell(command: str, check: bool = False) -> str:
     """
     - Use subprocess to execute a command in a shell
 
     Arguments:
         command (str)
+        check (bool): flag to raise a `RuntimeError` if the command exits with an error
 
     Returns:
         str: output from the command that was run
     """
 
-    process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE)
+    with instrumentation.track("shell", command) as event:
+        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE)
+
+        output, err = process.communicate()
+        print(output.decode("utf-8"))
+
+        if err:
+            print(err.decode("utf-8"))
+
+        process.kill()
+
+        event.bytes = len(output)
+
+    if check and process.returncode != 0:
+        raise RuntimeError(
+            f"Command exited with code {process.returncode}: {instrumentation.redact(command)}"
+        )
+
+    return output
+
+
+def run_pipeline_in_shell(*commands: str) -> str:
+    """
+    - Run shell commands connected by pipes, i.e. `a | b | c`
+    - Unlike a `|` inside of `run_command_in_shell()`, where only the last command's
+    exit code counts, this raises a `RuntimeError` if any of the commands fails
+
+    Arguments:
+        *commands (str): the commands, in pipeline order
+
+    Returns:
+        str: output from the last command
+    """
+
+    with instrumentation.track("shell", " | ".join(commands)) as event:
+        processes = []
+        stdin = None
+
+        for command in commands:
+            process = subprocess.Popen(command, shell=True, stdin=stdin, stdout=subprocess.PIPE)
+
+            # Let the upstream command see a closed pipe if this one exits early
+            if stdin is not None:
+                stdin.close()
+
+            processes.append(process)
+            stdin = process.stdout
+
+        output, _ = processes[-1].communicate()
+        print(output.decode("utf-8"))
 
-    output, err = process.communicate()
-    print(output.decode("utf-8"))
+        for process in processes[:-1]:
+            process.wait()
 
-    if err:
-        print(err.decode("utf-8"))
+        event.bytes = len(output)
 
-    process.kill()
+    for command, process in zip(commands, processes):
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"Command exited with code {process.returncode}: {instrumentation.redact(command)}"
+            )
 
     return output
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
+import glob
 from datetime import datetime
+from pathlib import Path
 
 
 def timestamp_for_filepath(dt: datetime | None = None) -> str:
@@ -16,3 +18,33 @@ def timestamp_for_filepath(dt: datetime | None = None) -> str:
         dt = datetime.now()
 
     return dt.strftime("on_%Y_%m_%d_at_%H_%M_%S")
+
+
+def filesize_in_bytes(filepath: Path | str) -> int | None:
+    """
+    - Get the size of a file on disk, including any sidecar files that
+    share its name (e.g. the `.dbf`, `.shx` and `.prj` of a shapefile)
+    - Folders (e.g. a FileGDB) are measured recursively
+
+    Arguments:
+        filepath (Path | str): path to the file, with or without its extension
+
+    Returns:
+        int | None: total size in bytes, or `None` if nothing exists at the path
+    """
+    filepath = Path(filepath)
+
+    if filepath.is_dir():
+        return sum(f.stat().st_size for f in filepath.rglob("*") if f.is_file())
+
+    if filepath.suffix.lower() == ".shp" or not filepath.exists():
+        stem = filepath.stem if filepath.suffix.lower() == ".shp" else filepath.name
+        sidecars = [f for f in filepath.parent.glob(f"{glob.escape(stem)}.*") if f.is_file()]
+
+        if sidecars:
+            return sum(f.stat().st_size for f in sidecars)
+
+    if filepath.is_file():
+        return filepath.stat().st_size
+
+    return None
@@ -0,0 +1,48 @@
+from __future__ import annotations
+import threading
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of `psycopg2` connections to a single URI.
+
+    Unlike `psycopg2.pool.ThreadedConnectionPool`, asking for a connection
+    while all `maxconn` connections are checked out waits for one to be
+    returned instead of raising `PoolError`.
+
+    Connections are opened lazily, the first time they're needed.
+    """
+
+    def __init__(self, uri: str, maxconn: int = 10):
+        from psycopg2.pool import ThreadedConnectionPool
+
+        self.maxconn = maxconn
+        self._pool = ThreadedConnectionPool(0, maxconn, uri)
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self):
+        """
+        - Check out a connection, waiting if all of them are in use
+        """
+        self._slots.acquire()
+
+        try:
+            return self._pool.getconn()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection, close: bool = False) -> None:
+        """
+        - Return a connection to the pool. Broken connections are discarded
+        """
+        try:
+            self._pool.putconn(connection, close=close or bool(connection.closed))
+        finally:
+            self._slots.release()
+
+    def closeall(self) -> None:
+        """
+        - Close every connection held by the pool
+        """
+        self._pool.closeall()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import threading
+import time
+
+REPLICA_STRATEGIES = ["round_robin", "least_busy"]
+
+
+class ReplicaRouter:
+    """
+    Pick which read replica serves each read-only query.
+
+    - `"round_robin"` takes turns between the replicas
+    - `"least_busy"` picks the replica with the fewest reads in flight from this process
+
+    A replica that refuses a connection is skipped for `retry_after` seconds.
+    Reads made within `sticky_seconds` of a write on the same thread go to the
+    primary, so they don't miss rows that haven't replicated yet.
+    """
+
+    def __init__(
+        self,
+        uris: list | str,
+        strategy: str = "round_robin",
+        retry_after: float = 30,
+        sticky_seconds: float = 5,
+    ):
+        if isinstance(uris, str):
+            uris = uris.replace(",", " ").split()
+
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"{strategy=} is not valid. Options include: {REPLICA_STRATEGIES}")
+
+        self.uris = list(uris)
+        self.strategy = strategy
+        self.retry_after = retry_after
+        self.sticky_seconds = sticky_seconds
+        self.pools = {}
+
+        self._lock = threading.Lock()
+        self._turn = 0
+        self._in_flight = {uri: 0 for uri in self.uris}
+        self._reads = {uri: 0 for uri in self.uris}
+        self._down_until = {}
+
+    def acquire(self) -> str | None:
+        """
+        - Choose a replica for one read, or `None` if every replica is down
+        - Every `acquire()` that returns a URI must be followed by `release()`
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            available = [uri for uri in self.uris if self._down_until.get(uri, 0) <= now]
+
+            if not available:
+                return None
+
+            if self.strategy == "round_robin":
+                uri = available[self._turn % len(available)]
+                self._turn += 1
+            else:
+                uri = min(available, key=lambda u: self._in_flight[u])
+
+            self._in_flight[uri] += 1
+            self._reads[uri] += 1
+
+            return uri
+
+    def release(self, uri: str) -> None:
+        with self._lock:
+            self._in_flight[uri] -= 1
+
+    def mark_down(self, uri: str) -> None:
+        """
+        - Stop sending reads to `uri` for `retry_after` seconds
+        """
+
+        with self._lock:
+            self._down_until[uri] = time.monotonic() + self.retry_after
+
+    def stats(self) -> dict:
+        """
+        - Get the number of reads sent to each replica, and which are currently skipped
+        """
+
+        with self._lock:
+            now = time.monotonic()
+
+            return {
+                uri: {
+                    "reads": self._reads[uri],
+                    "in_flight": self._in_flight[uri],
+                    "down": self._down_until.get(uri, 0) > now,
+                }
+                for uri in self.uris
+            }
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from geopandas import GeoSeries
+
+SPATIAL_ORDERS = ["hilbert", "geohash"]
+
+
+def _grid_cells(x: np.ndarray, y: np.ndarray, bounds: tuple, order: int) -> tuple:
+    """
+    - Scale coordinates onto a `2**order` by `2**order` integer grid
+    """
+    import numpy as np
+
+    xmin, ymin, xmax, ymax = bounds
+    cells = 2**order - 1
+
+    width = (xmax - xmin) or 1.0
+    height = (ymax - ymin) or 1.0
+
+    xi = np.clip((x - xmin) / width * cells, 0, cells).astype(np.int64)
+    yi = np.clip((y - ymin) / height * cells, 0, cells).astype(np.int64)
+
+    return xi, yi
+
+
+def hilbert_keys(x: np.ndarray, y: np.ndarray, bounds: tuple, order: int = 16) -> np.ndarray:
+    """
+    - Get the distance of each point along a Hilbert curve that fills `bounds`
+    - Points that are close together in space get keys that are close together
+
+    Arguments:
+        x (np.ndarray): x coordinates
+        y (np.ndarray): y coordinates
+        bounds (tuple): (xmin, ymin, xmax, ymax) of the area the curve covers
+        order (int): number of bits per axis, i.e. the curve has `2**order` cells per side
+
+    Returns:
+        np.ndarray: integer key for each point
+    """
+    import numpy as np
+
+    xi, yi = _grid_cells(x, y, bounds, order)
+    n = 2**order
+    keys = np.zeros(len(xi), dtype=np.int64)
+
+    s = n // 2
+    while s > 0:
+        rx = (xi & s) > 0
+        ry = (yi & s) > 0
+
+        keys += s * s * ((3 * rx.astype(np.int64)) ^ ry.astype(np.int64))
+
+        # Rotate the quadrant so the curve stays continuous
+        flip = ~ry & rx
+        xi = np.where(flip, n - 1 - xi, xi)
+        yi = np.where(flip, n - 1 - yi, yi)
+        xi, yi = np.where(ry, xi, yi), np.where(ry, yi, xi)
+
+        s //= 2
+
+    return keys
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """
+    - Insert a zero bit between each of the lower 32 bits of every value
+    """
+    import numpy as np
+
+    v = v.astype(np.uint64)
+    for shift, mask in [
+        (16, 0x0000FFFF0000FFFF),
+        (8, 0x00FF00FF00FF00FF),
+        (4, 0x0F0F0F0F0F0F0F0F),
+        (2, 0x3333333333333333),
+        (1, 0x5555555555555555),
+    ]:
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+
+    return v
+
+
+def geohash_keys(x: np.ndarray, y: np.ndarray, bounds: tuple, order: int = 16) -> np.ndarray:
+    """
+    - Get the Z-order (Morton) key of each point, by interleaving the bits of x and y
+    - This is the same ordering that geohash strings sort in, applied to the data's own
+    bounds so it also works for projected coordinates
+
+    Arguments:
+        x (np.ndarray): x coordinates
+        y (np.ndarray): y coordinates
+        bounds (tuple): (xmin, ymin, xmax, ymax) of the area the curve covers
+        order (int): number of bits per axis
+
+    Returns:
+        np.ndarray: integer key for each point
+    """
+    import numpy as np
+
+    xi, yi = _grid_cells(x, y, bounds, order)
+
+    return (_spread_bits(xi) << np.uint64(1)) | _spread_bits(yi)
+
+
+def spatial_sort_order(geoseries: GeoSeries, method: str = "hilbert") -> np.ndarray:
+    """
+    - Get the positions that sort a `GeoSeries` along a space-filling curve
+    - Each feature is placed by the center of its bounding box
+
+    Arguments:
+        geoseries (GeoSeries): geometries to sort
+        method (str): `"hilbert"` or `"geohash"`
+
+    Returns:
+        np.ndarray: positional indexer for `.iloc[]`
+    """
+    import numpy as np
+
+    if method not in SPATIAL_ORDERS:
+        raise ValueError(f"{method=} is not supported. Valid options include: {SPATIAL_ORDERS}")
+
+    bounds = geoseries.bounds.to_numpy()
+    x = (bounds[:, 0] + bounds[:, 2]) / 2
+    y = (bounds[:, 1] + bounds[:, 3]) / 2
+
+    # Empty and null geometries have NaN bounds, so they go to the end
+    valid = ~(np.isnan(x) | np.isnan(y))
+
+    if not valid.any():
+        return np.arange(len(geoseries))
+
+    total_bounds = (x[valid].min(), y[valid].min(), x[valid].max(), y[valid].max())
+
+    key_function = hilbert_keys if method == "hilbert" else geohash_keys
+    keys = key_function(np.where(valid, x, 0), np.where(valid, y, 0), total_bounds)
+
+    return np.lexsort((keys, ~valid))
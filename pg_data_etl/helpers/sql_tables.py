@@ -1,7 +1,32 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING
 
-from pandas import DataFrame
-from geopandas import GeoDataFrame
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from geopandas import GeoDataFrame
+
+
+BAD_COLUMN_CHARACTERS = [".", "-", "(", ")", "+", ":", "$", r"/"]
+
+
+def sanitize_column_name(name: str) -> str:
+    """
+    - Clean up a single column name so it imports into SQL properly,
+    e.g. 'Geo.Display-Label (2020)' becomes 'geodisplaylabel_2020'
+
+    Arguments:
+        name (str): raw column name, e.g. from a spreadsheet header
+
+    Returns:
+        str: the sanitized column name
+    """
+
+    name = str(name).replace(" ", "_").lower()
+
+    for s in BAD_COLUMN_CHARACTERS:
+        name = name.replace(s, "")
+
+    return name
 
 
 def sanitize_df_for_sql(df: DataFrame | GeoDataFrame) -> DataFrame | GeoDataFrame:
@@ -13,19 +38,10 @@ def sanitize_df_for_sql(df: DataFrame | GeoDataFrame) -> DataFrame | GeoDataFram
         - all column names are 100% lowercase
         - funky characters are stripped out of column names
 
-    TODO: docstring
+    See `sanitize_column_name()` for the rules applied to each column
     """
 
-    bad_characters = [".", "-", "(", ")", "+", ":", "$", r"/"]
-
-    # Replace "Column Name" with "column_name"
-    df.columns = df.columns.str.replace(" ", "_")
-    df.columns = [x.lower() for x in df.columns]
-
-    # Remove '.' and '-' from column names.
-    # i.e. 'geo.display-label' becomes 'geodisplaylabel'
-    for s in bad_characters:
-        df.columns = df.columns.str.replace(s, "", regex=False)
+    df.columns = [sanitize_column_name(x) for x in df.columns]
 
     return df
 
@@ -0,0 +1,445 @@
+"""
+`pg_data_etl.manifest`
+----------------------
+
+Describe an ETL job as a manifest of sources, SQL transforms and exports,
+and run it as a DAG with a bounded pool of workers.
+
+Manifests can be written in YAML (requires `pyyaml`) or TOML:
+
+```yaml
+database:
+  name: sample_database
+  config_key: localhost
+
+jobs: 4
+
+sources:
+  roads:
+    filepath: data/roads.shp
+    table: gis.roads
+  counts:
+    filepath: data/counts.csv
+    table: raw.counts
+
+transforms:
+  road_buffers:
+    table: analysis.road_buffers
+    geom_type: POLYGON
+    epsg: 2272
+    sql: SELECT uid, ST_Buffer(geom, 100) AS geom FROM gis.roads
+
+exports:
+  buffers:
+    table_or_sql: analysis.road_buffers
+    filepath: output/road_buffers.geojson
+```
+
+Dependencies come from an explicit `depends_on: [step, ...]` list, and are also
+inferred whenever a step's SQL or `table_or_sql` mentions the `table` that
+another step creates. In the example above, `road_buffers` depends on `roads`
+and `buffers` depends on `road_buffers`, while `counts` runs in parallel.
+
+Each successful step stores a fingerprint of its definition, its input file
+and its upstream fingerprints in a `.state.json` file next to the manifest.
+On the next run, steps with an unchanged fingerprint and existing output are skipped.
+
+```python
+>>> from pg_data_etl.manifest import run_manifest
+>>> summary = run_manifest("etl.yml")
+```
+
+Or from a terminal: `pg run etl.yml --jobs 4`
+"""
+from __future__ import annotations
+import hashlib
+import json
+import re
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+
+from pg_data_etl import helpers
+
+SECTIONS = ["sources", "transforms", "exports"]
+
+TABULAR_SUFFIXES = [".csv", ".xlsx", ".xls"]
+CSV_SUFFIXES = [".csv", ".tsv"]
+
+
+def load_manifest_file(filepath: Path | str) -> dict:
+    """
+    - Read a `.yml`/`.yaml` or `.toml` manifest into a `dict`
+    """
+    filepath = Path(filepath)
+    suffix = filepath.suffix.lower()
+
+    if suffix in [".yml", ".yaml"]:
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML manifests require 'pyyaml'. Install it or use a .toml manifest")
+
+        with open(filepath) as open_file:
+            return yaml.safe_load(open_file) or {}
+
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+
+        with open(filepath, "rb") as open_file:
+            return tomllib.load(open_file)
+
+    raise ValueError(f"Manifest must be .yml, .yaml or .toml, not '{suffix}'")
+
+
+class Manifest:
+    """
+    A parsed manifest: the steps, their dependencies and the target database.
+
+    Each step is a `dict` from the manifest, with two extra keys:
+
+    - `kind`: `"source"`, `"transform"` or `"export"`
+    - `name`: the key the step was declared with
+    """
+
+    def __init__(self, data: dict, filepath: Path | str | None = None):
+        self.data = data
+        self.filepath = Path(filepath) if filepath else None
+        self.steps = {}
+
+        for section in SECTIONS:
+            for name, spec in (data.get(section) or {}).items():
+                if name in self.steps:
+                    raise ValueError(f"Step '{name}' is declared more than once")
+
+                self.steps[name] = {**spec, "kind": section[:-1], "name": name}
+
+        self.dependencies = {name: self._find_dependencies(name) for name in self.steps}
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_file(cls, filepath: Path | str) -> Manifest:
+        return cls(load_manifest_file(filepath), filepath=filepath)
+
+    @property
+    def base_folder(self) -> Path:
+        return self.filepath.parent if self.filepath else Path(".")
+
+    @property
+    def state_filepath(self) -> Path | None:
+        if self.filepath:
+            return self.filepath.with_suffix(".state.json")
+        return None
+
+    def resolve_path(self, filepath: str) -> Path:
+        """
+        - Paths in the manifest are relative to the manifest itself
+        """
+        filepath = Path(filepath)
+        return filepath if filepath.is_absolute() else self.base_folder / filepath
+
+    def _find_dependencies(self, name: str) -> list:
+        step = self.steps[name]
+        dependencies = list(step.get("depends_on", []))
+
+        for dependency in dependencies:
+            if dependency not in self.steps:
+                raise ValueError(f"Step '{name}' depends on '{dependency}', which doesn't exist")
+
+        # Infer dependencies from tables mentioned in this step's SQL
+        text = " ".join(str(step.get(k, "")) for k in ["sql", "table_or_sql"]).lower()
+
+        for other_name, other in self.steps.items():
+            table = other.get("table")
+
+            if other_name == name or not table or other_name in dependencies:
+                continue
+
+            if re.search(rf"(?<![\w.]){re.escape(table.lower())}(?![\w])", text):
+                dependencies.append(other_name)
+
+        return dependencies
+
+    def _topological_order(self) -> list:
+        remaining = {name: set(deps) for name, deps in self.dependencies.items()}
+        order = []
+
+        while remaining:
+            ready = sorted(name for name, deps in remaining.items() if not deps)
+
+            if not ready:
+                raise ValueError(f"Manifest has a dependency cycle between: {sorted(remaining)}")
+
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return order
+
+    # Fingerprints
+    # ------------
+
+    def _input_fingerprint(self, step: dict) -> str | None:
+        if step["kind"] != "source":
+            return None
+
+        filepath = self.resolve_path(step["filepath"])
+
+        if filepath.is_file():
+            stat = filepath.stat()
+            return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+        return str(helpers.filesize_in_bytes(filepath))
+
+    def fingerprint(self, name: str, upstream: dict) -> str:
+        """
+        - Hash of a step's definition, its input file and its upstream fingerprints
+        """
+        step = self.steps[name]
+
+        payload = {
+            "step": step,
+            "input": self._input_fingerprint(step),
+            "upstream": {dep: upstream.get(dep) for dep in self.dependencies[name]},
+        }
+
+        text = json.dumps(payload, sort_keys=True, default=str)
+
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def read_state(self) -> dict:
+        if self.state_filepath and self.state_filepath.exists():
+            return json.loads(self.state_filepath.read_text())
+        return {}
+
+    def write_state(self, state: dict) -> None:
+        if self.state_filepath:
+            self.state_filepath.write_text(json.dumps(state, indent=2, sort_keys=True))
+
+
+# Step execution
+# --------------
+
+
+def _run_source(db, manifest: Manifest, step: dict) -> None:
+    filepath = manifest.resolve_path(step["filepath"])
+    kwargs = step.get("kwargs", {})
+
+    if filepath.suffix.lower() in TABULAR_SUFFIXES:
+        db.import_file_with_pandas(
+            filepath,
+            step["table"],
+            df_import_kwargs={"index": False, "if_exists": "replace", **kwargs},
+        )
+        return
+
+    method = step.get("method", "geopandas")
+
+    if method == "geopandas":
+        kwargs = {"gpd_kwargs": {"if_exists": "replace"}, **kwargs}
+    else:
+        db.execute(f"DROP TABLE IF EXISTS {step['table']} CASCADE;")
+
+    db.import_gis(method=method, filepath=str(filepath), sql_tablename=step["table"], **kwargs)
+
+
+def _run_transform(db, manifest: Manifest, step: dict) -> None:
+    if "table" not in step:
+        db.execute(step["sql"])
+
+    elif "geom_type" in step:
+        db.gis_make_geotable_from_query(
+            step["sql"],
+            step["table"],
+            step["geom_type"],
+            step["epsg"],
+            uid_col=step.get("uid_col", "uid"),
+        )
+
+    else:
+        schema, _ = helpers.convert_full_tablename_to_parts(step["table"])
+        db.schema_add(schema)
+        db.execute(f"""
+            DROP TABLE IF EXISTS {step['table']};
+            CREATE TABLE {step['table']} AS
+            {step['sql']}
+        """)
+
+
+def _run_export(db, manifest: Manifest, step: dict) -> None:
+    filepath = manifest.resolve_path(step["filepath"])
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    table_or_sql = step.get("table_or_sql", step.get("table"))
+
+    if set(CSV_SUFFIXES) & {s.lower() for s in filepath.suffixes}:
+        db.export_csv(table_or_sql, filepath, **step.get("kwargs", {}))
+        return
+
+    kwargs = {
+        "table_or_sql": table_or_sql,
+        "filepath": filepath,
+        "filetype": step.get("filetype", filepath.suffix[1:]),
+        **step.get("kwargs", {}),
+    }
+
+    db.export_gis(method=step.get("method", "geopandas"), **kwargs)
+
+
+STEP_RUNNERS = {
+    "source": _run_source,
+    "transform": _run_transform,
+    "export": _run_export,
+}
+
+
+def _output_exists(db, manifest: Manifest, step: dict) -> bool:
+    if step["kind"] == "export":
+        return manifest.resolve_path(step["filepath"]).exists()
+
+    if "table" in step:
+        schema, _ = helpers.convert_full_tablename_to_parts(step["table"])
+        table = step["table"] if "." in step["table"] else f"public.{step['table']}"
+        return table in db.tables(schema=schema)
+
+    return True
+
+
+def run_manifest(
+    manifest: Manifest | Path | str,
+    db=None,
+    jobs: int | None = None,
+    force: bool = False,
+) -> dict:
+    """
+    - Run every step of a manifest, in dependency order, with up to `jobs` steps at once
+    - Steps whose fingerprint hasn't changed since the last successful run are skipped
+    - Steps downstream of a failure are marked as `blocked` and do not run
+
+    Arguments:
+        manifest (Manifest | Path | str): a `Manifest`, or the path to a manifest file
+        db (Database | None): database to run against. Defaults to the manifest's `database` entry
+        jobs (int | None): max number of steps to run at once. Defaults to the manifest's `jobs` or 1
+        force (bool): flag to run every step, even if it's unchanged
+
+    Returns:
+        dict: summary with a `results` entry per step, in dependency order
+    """
+    from pg_data_etl import Database
+
+    if not isinstance(manifest, Manifest):
+        manifest = Manifest.from_file(manifest)
+
+    jobs = jobs or manifest.data.get("jobs", 1)
+
+    if db is None:
+        db_config = manifest.data["database"]
+        db = Database.from_config(
+            db_config["name"],
+            db_config.get("config_key", "localhost"),
+            config_filepath=db_config.get("config_file"),
+        )
+
+    # Share connections between the workers, unless the caller already set up a pool
+    pool_owner = db._pool is None
+    if pool_owner:
+        db.enable_pool(maxconn=jobs)
+
+    state = {} if force else manifest.read_state()
+    new_state = dict(state)
+    fingerprints = {}
+    results = {}
+    lock = threading.Lock()
+
+    started_at = datetime.now().isoformat(timespec="seconds")
+    start = time.perf_counter()
+
+    def run_step(name: str) -> dict:
+        step = manifest.steps[name]
+        result = {"step": name, "kind": step["kind"], "status": "ok", "seconds": 0.0, "error": None}
+        step_start = time.perf_counter()
+
+        with lock:
+            fingerprint = manifest.fingerprint(name, fingerprints)
+
+        try:
+            if state.get(name) == fingerprint and _output_exists(db, manifest, step):
+                result["status"] = "skipped"
+            else:
+                print(f"-> Running {step['kind']} '{name}'")
+                STEP_RUNNERS[step["kind"]](db, manifest, step)
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+
+        result["seconds"] = round(time.perf_counter() - step_start, 4)
+
+        with lock:
+            if result["status"] == "error":
+                new_state.pop(name, None)
+            else:
+                fingerprints[name] = fingerprint
+                new_state[name] = fingerprint
+
+        return result
+
+    pending = list(manifest.order)
+    running = {}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+            while pending or running:
+                for name in list(pending):
+                    dep_status = [
+                        results.get(d, {}).get("status") for d in manifest.dependencies[name]
+                    ]
+
+                    if any(s in ("error", "blocked") for s in dep_status):
+                        results[name] = {
+                            "step": name,
+                            "kind": manifest.steps[name]["kind"],
+                            "status": "blocked",
+                            "seconds": 0.0,
+                            "error": None,
+                        }
+                        pending.remove(name)
+
+                    elif all(s in ("ok", "skipped") for s in dep_status):
+                        running[executor.submit(run_step, name)] = name
+                        pending.remove(name)
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    results[running.pop(future)] = future.result()
+    finally:
+        manifest.write_state(new_state)
+
+        if pool_owner:
+            db.close_pool()
+
+    ordered = [results[name] for name in manifest.order]
+
+    return {
+        "manifest": str(manifest.filepath) if manifest.filepath else None,
+        "started_at": started_at,
+        "jobs": jobs,
+        "total_seconds": round(time.perf_counter() - start, 4),
+        "succeeded": len([r for r in ordered if r["status"] == "ok"]),
+        "skipped": len([r for r in ordered if r["status"] == "skipped"]),
+        "failed": len([r for r in ordered if r["status"] == "error"]),
+        "blocked": len([r for r in ordered if r["status"] == "blocked"]),
+        "results": ordered,
+    }
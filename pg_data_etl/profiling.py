@@ -0,0 +1,408 @@
+"""
+`pg_data_etl.profiling`
+-----------------------
+
+Capture `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)` plans for the statements a
+`Database` runs, and summarize where the time went.
+
+Use it through `Database.profile()`:
+
+```python
+>>> with db.profile() as profiler:
+...     db.gis_make_geotable_from_query(query, "analysis.buffers", "POLYGON", 26918)
+...     db.df("SELECT * FROM analysis.buffers WHERE ...")
+>>> profiler.print_summary()
+>>> profiler.save("plans.json")
+```
+
+While profiling:
+
+- `execute()` runs every explainable statement (`SELECT`, `INSERT`, `UPDATE`,
+`DELETE`, `CREATE TABLE ... AS`, etc.) as `EXPLAIN ANALYZE <statement>`. The
+statement is still executed exactly once, and other statements (`DROP`,
+`ALTER`, `CREATE INDEX`) run as-is.
+- `df()`, `gdf()` and the `query_*` helpers explain the query first and then
+fetch the data, so read queries run twice. Use `analyze=False` to only
+capture the estimated plan instead.
+"""
+from __future__ import annotations
+import json
+import re
+import threading
+import time
+from pathlib import Path
+
+
+EXPLAINABLE = re.compile(
+    r"""^\s*(
+        select | insert | update | delete | merge | values | with | table | execute | declare
+        | create\s+(?:(?:global|local)\s+)?(?:temp|temporary|unlogged)?\s*table\s+
+            (?:if\s+not\s+exists\s+)?[\w."]+\s*(?:\([^)]*\)\s*)?as\b
+        | create\s+materialized\s+view\s+
+            (?:if\s+not\s+exists\s+)?[\w."]+\s*(?:\([^)]*\)\s*)?as\b
+    )""",
+    re.IGNORECASE | re.VERBOSE | re.DOTALL,
+)
+
+SPATIAL_PREDICATES = re.compile(
+    r"(&&|st_intersects|st_dwithin|st_contains|st_within|st_covers|st_coveredby|st_touches)",
+    re.IGNORECASE,
+)
+
+FILTER_COLUMNS = re.compile(r"\(?\(?([a-z_][a-z0-9_]*)\)?(?:::\w+)?\s*(?:=|<>|<=|>=|<|>|~~)")
+
+
+def split_statements(sql: str) -> list:
+    """
+    - Split a string that holds one or more SQL statements on `;`
+    - Semicolons inside quotes, dollar-quoted bodies and comments are ignored
+
+    Arguments:
+        sql (str): one or more SQL statements
+
+    Returns:
+        list: with each non-empty statement, without its trailing semicolon
+    """
+    statements = []
+    current = []
+    i = 0
+    n = len(sql)
+
+    while i < n:
+        char = sql[i]
+
+        # Line comment
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = n if end == -1 else end
+            current.append(sql[i:end])
+            i = end
+            continue
+
+        # Block comment
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+            current.append(sql[i:end])
+            i = end
+            continue
+
+        # Single- or double-quoted literal/identifier ('' and "" are escapes)
+        if char in ("'", '"'):
+            end = i + 1
+            while end < n:
+                if sql[end] == char:
+                    if end + 1 < n and sql[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(sql[i : end + 1])
+            i = end + 1
+            continue
+
+        # Dollar-quoted body, e.g. $$ ... $$ or $fn$ ... $fn$
+        if char == "$":
+            match = re.match(r"\$[A-Za-z_]*\$", sql[i:])
+            if match:
+                tag = match.group(0)
+                end = sql.find(tag, i + len(tag))
+                end = n if end == -1 else end + len(tag)
+                current.append(sql[i:end])
+                i = end
+                continue
+
+        if char == ";":
+            statements.append("".join(current))
+            current = []
+            i += 1
+            continue
+
+        current.append(char)
+        i += 1
+
+    statements.append("".join(current))
+
+    return [s.strip() for s in statements if _strip_comments(s).strip()]
+
+
+def _strip_comments(sql: str) -> str:
+    sql = re.sub(r"/\*.*?\*/", " ", sql, flags=re.DOTALL)
+    return re.sub(r"--[^\n]*", " ", sql)
+
+
+def is_explainable(statement: str) -> bool:
+    """
+    - True if `EXPLAIN ANALYZE` can wrap the statement
+    """
+    return bool(EXPLAINABLE.match(_strip_comments(statement)))
+
+
+def walk_plan(node: dict, depth: int = 0):
+    """
+    - Yield `(depth, node)` for every node in a JSON plan tree
+    """
+    yield depth, node
+
+    for child in node.get("Plans", []):
+        yield from walk_plan(child, depth + 1)
+
+
+def exclusive_time(node: dict) -> float:
+    """
+    - Milliseconds spent in a plan node itself, excluding its children
+    """
+
+    def total(n: dict) -> float:
+        return n.get("Actual Total Time", 0.0) * n.get("Actual Loops", 1)
+
+    return max(total(node) - sum(total(c) for c in node.get("Plans", [])), 0.0)
+
+
+class Profiler:
+    """
+    Holds the plans and timings captured while `Database.profile()` is active.
+
+    Each entry in `records` is a `dict` with:
+
+    - `action`: the `Database` method that ran the statement
+    - `statement`: the SQL that was profiled
+    - `duration`: wall-clock seconds
+    - `planning_ms` / `execution_ms`: as reported by `EXPLAIN ANALYZE`
+    - `plan`: the JSON plan, or `None` if the statement can't be explained
+    """
+
+    def __init__(self, db, analyze: bool = True):
+        self.db = db
+        self.analyze = analyze
+        self.records = []
+        self._lock = threading.Lock()
+        self._spatial_tables = None
+
+    @property
+    def explain_prefix(self) -> str:
+        if self.analyze:
+            return "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)"
+        return "EXPLAIN (FORMAT JSON)"
+
+    def _record(self, action: str, statement: str, duration: float, plan) -> None:
+        record = {
+            "action": action,
+            "statement": statement,
+            "duration": duration,
+            "planning_ms": None,
+            "execution_ms": None,
+            "plan": plan,
+        }
+
+        if plan:
+            record["planning_ms"] = plan.get("Planning Time")
+            record["execution_ms"] = plan.get("Execution Time")
+
+        with self._lock:
+            self.records.append(record)
+
+    def _explain_with_cursor(self, cursor, statement: str):
+        cursor.execute(f"{self.explain_prefix} {statement}")
+        plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return plan[0]
+
+    def execute(self, cursor, query: str, action: str = "execute") -> None:
+        """
+        - Run every statement in `query` on `cursor`, explaining the ones that can be explained
+        - With `analyze=True`, explainable statements are executed by `EXPLAIN ANALYZE` itself.
+        Otherwise the estimated plan is captured before the statement runs
+        """
+        for statement in split_statements(query):
+            start = time.perf_counter()
+
+            plan = None
+
+            if is_explainable(statement):
+                plan = self._explain_with_cursor(cursor, statement)
+
+            # EXPLAIN ANALYZE already executed the statement
+            if not (plan and self.analyze):
+                cursor.execute(statement)
+
+            self._record(action, statement, time.perf_counter() - start, plan)
+
+    def explain(self, query: str, action: str = "query", super_uri: bool = False) -> None:
+        """
+        - Capture the plan of a read query without returning its data
+        """
+        from pg_data_etl.database.actions.query.connection import _savepoint
+
+        start = time.perf_counter()
+
+        with self.db.connection(super_uri=super_uri) as connection:
+            # Never keep side effects of a profiled read, but leave the rest of a
+            # `session()` transaction alone
+            with _savepoint(connection, rollback=True):
+                cursor = connection.cursor()
+                plan = self._explain_with_cursor(cursor, query)
+                cursor.close()
+
+        self._record(action, query, time.perf_counter() - start, plan)
+
+    # Summaries
+    # ---------
+
+    def _nodes(self):
+        for record in self.records:
+            if record["plan"]:
+                for depth, node in walk_plan(record["plan"]["Plan"]):
+                    yield record, depth, node
+
+    def slowest_nodes(self, n: int = 10) -> list:
+        """
+        - The `n` plan nodes with the most exclusive time across all captured plans
+        """
+        nodes = [
+            {
+                "statement": record["statement"],
+                "node_type": node.get("Node Type"),
+                "relation": node.get("Relation Name"),
+                "exclusive_ms": exclusive_time(node),
+                "total_ms": node.get("Actual Total Time"),
+                "rows": node.get("Actual Rows", node.get("Plan Rows")),
+            }
+            for record, _, node in self._nodes()
+        ]
+
+        return sorted(nodes, key=lambda x: x["exclusive_ms"], reverse=True)[:n]
+
+    @property
+    def spatial_tables(self) -> set:
+        """
+        - Names of all spatial tables in the database, with and without schema
+        """
+        if self._spatial_tables is None:
+            tables = set()
+            for tablename in self.db.tables(spatial_only=True):
+                tables.add(tablename)
+                tables.add(tablename.split(".")[-1])
+            self._spatial_tables = tables
+
+        return self._spatial_tables
+
+    def spatial_seq_scans(self) -> list:
+        """
+        - Sequential scans on tables that are registered in `geometry_columns`
+        """
+        scans = []
+
+        for record, _, node in self._nodes():
+            relation = node.get("Relation Name")
+
+            if node.get("Node Type") == "Seq Scan" and relation in self.spatial_tables:
+                scans.append(
+                    {
+                        "statement": record["statement"],
+                        "relation": relation,
+                        "filter": node.get("Filter"),
+                        "exclusive_ms": exclusive_time(node),
+                    }
+                )
+
+        return scans
+
+    def index_hints(self, min_rows_removed: int = 1000) -> list:
+        """
+        - Suggest indexes for sequential scans that throw away most of the rows they read
+
+        Arguments:
+            min_rows_removed (int): ignore scans that filter out fewer rows than this
+
+        Returns:
+            list: of human-readable hints
+        """
+        hints = []
+
+        for _, _, node in self._nodes():
+            if node.get("Node Type") != "Seq Scan" or not node.get("Filter"):
+                continue
+
+            relation = node.get("Relation Name")
+            removed = node.get("Rows Removed by Filter", 0)
+            kept = node.get("Actual Rows", 0)
+
+            if removed < min_rows_removed or removed < kept * 10:
+                continue
+
+            node_filter = node["Filter"]
+
+            if SPATIAL_PREDICATES.search(node_filter):
+                hint = (
+                    f"{relation}: spatial filter scanned sequentially ({removed:,} rows removed). "
+                    f"Check for a GIST index on the geometry column and use an index-aware "
+                    f"predicate like ST_Intersects or && instead of a transformed geometry"
+                )
+            else:
+                columns = sorted(set(FILTER_COLUMNS.findall(node_filter)))
+                hint = (
+                    f"{relation}: {removed:,} rows removed by filter `{node_filter}`. "
+                    f"Consider an index on {', '.join(columns) or 'the filtered columns'}"
+                )
+
+            if hint not in hints:
+                hints.append(hint)
+
+        return hints
+
+    def summary(self, n: int = 10) -> dict:
+        """
+        - Summarize the captured plans in a single `dict`
+        """
+        return {
+            "statements": len(self.records),
+            "explained": len([r for r in self.records if r["plan"]]),
+            "total_seconds": sum(r["duration"] for r in self.records),
+            "slowest_statements": sorted(
+                [{"statement": r["statement"], "duration": r["duration"]} for r in self.records],
+                key=lambda x: x["duration"],
+                reverse=True,
+            )[:n],
+            "slowest_nodes": self.slowest_nodes(n),
+            "spatial_seq_scans": self.spatial_seq_scans(),
+            "index_hints": self.index_hints(),
+        }
+
+    def print_summary(self, n: int = 10) -> None:
+        """
+        - Print the `summary()` to the console
+        """
+        summary = self.summary(n)
+
+        print("-" * 80)
+        print(f"Profiled {summary['statements']} statements in {summary['total_seconds']:.3f}s")
+
+        print("\t-> Slowest plan nodes:")
+        for node in summary["slowest_nodes"]:
+            relation = f" on {node['relation']}" if node["relation"] else ""
+            print(f"\t\t-> {node['exclusive_ms']:.1f} ms: {node['node_type']}{relation}")
+
+        if summary["spatial_seq_scans"]:
+            print("\t-> Sequential scans on spatial tables:")
+            for scan in summary["spatial_seq_scans"]:
+                print(f"\t\t-> {scan['relation']} ({scan['exclusive_ms']:.1f} ms)")
+
+        if summary["index_hints"]:
+            print("\t-> Index hints:")
+            for hint in summary["index_hints"]:
+                print(f"\t\t-> {hint}")
+
+    def save(self, filepath: Path | str) -> Path:
+        """
+        - Write all records (statements, timings and plans) to a `.json` file
+        """
+        filepath = Path(filepath)
+
+        with open(filepath, "w") as open_file:
+            json.dump(self.records, open_file, indent=2, default=str)
+
+        return filepath
@@ -27,6 +27,19 @@ def local_db():
     db.admin("DROP")
 
 
+@pytest.fixture(scope="function")
+def local_target_db():
+    """ A second local db to copy data into, dropped after the test """
+
+    db = Database.from_config("pytest_target", "localhost")
+
+    db.admin("CREATE")
+
+    yield db
+
+    db.admin("DROP")
+
+
 @pytest.fixture(scope="function")
 def local_db_with_spatial_data(downloaded_shapefile):
     """ Spin up a local db, use it in the test, then drop it """
@@ -101,6 +114,6 @@ def teardown_test_data_dir(request):
 
     # Teardown
     def remove_test_dir_and_db():
-        shutil.rmtree(TEST_DATA_PATH)
+        shutil.rmtree(TEST_DATA_PATH, ignore_errors=True)
 
     request.addfinalizer(remove_test_dir_and_db)
@@ -0,0 +1,77 @@
+import json
+from decimal import Decimal
+
+import pyarrow as pa
+
+from pg_data_etl import Database
+
+QUERY = """
+    SELECT
+        g::int AS id,
+        g::float8 / 4 AS quarter,
+        'row ' || g AS label,
+        CASE WHEN mod(g, 5) = 0 THEN NULL ELSE mod(g, 2) = 0 END AS is_even,
+        DATE '2021-01-01' + g AS day
+    FROM generate_series(1, 2500) g
+"""
+
+
+def test_arrow_returns_typed_batches(local_db: Database):
+    table = local_db.arrow(QUERY, batch_size=1000)
+
+    assert table.num_rows == 2500
+    assert table.schema.field("id").type == pa.int32()
+    assert table.schema.field("quarter").type == pa.float64()
+    assert table.schema.field("label").type == pa.string()
+    assert table.schema.field("day").type == pa.date32()
+    assert table.column("is_even").null_count == 500
+
+    df = local_db.arrow(QUERY, to_pandas=True)
+
+    assert str(df["id"].dtype) == "int32[pyarrow]"
+    assert df["quarter"].sum() == local_db.df(QUERY)["quarter"].sum()
+
+
+def test_export_arrow_can_be_memory_mapped(local_db: Database, tmp_path):
+    filepath = tmp_path / "rows.arrow"
+
+    local_db.export_arrow(QUERY, filepath, compression="zstd", batch_size=1000)
+
+    with pa.memory_map(str(filepath)) as source:
+        reader = pa.ipc.open_file(source)
+
+        assert reader.num_record_batches == 3
+        assert reader.read_all().num_rows == 2500
+
+
+def test_arrow_keeps_numeric_columns_exact(local_db: Database):
+    table = local_db.arrow("""
+        SELECT
+            (g::numeric / 4)::numeric(10, 2) AS fixed,
+            g::numeric / 3 AS unconstrained,
+            (CASE WHEN g > 1 THEN 12345678901234567890123.45 END)::numeric(30, 2) AS wide
+        FROM generate_series(1, 10) g
+    """)
+
+    assert table.schema.field("fixed").type == pa.decimal128(10, 2)
+    assert table.schema.field("unconstrained").type == pa.string()
+    assert table.column("fixed")[0].as_py() == Decimal("0.25")
+    assert table.column("wide")[1].as_py() == Decimal("12345678901234567890123.45")
+    assert table.column("wide").null_count == 1
+
+
+def test_arrow_returns_json_and_arrays_as_postgres_text(local_db: Database):
+    table = local_db.arrow("""
+        SELECT
+            '{"a": 1}'::json AS js,
+            '{"b": [true, null]}'::jsonb AS jsb,
+            ARRAY[1, 2] AS ints,
+            ARRAY['x', NULL] AS texts
+    """)
+
+    row = table.to_pylist()[0]
+
+    assert json.loads(row["js"]) == {"a": 1}
+    assert json.loads(row["jsb"]) == {"b": [True, None]}
+    assert row["ints"] == "{1,2}"
+    assert row["texts"] == "{x,NULL}"
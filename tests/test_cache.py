@@ -0,0 +1,70 @@
+import sys
+
+import pytest
+
+from pg_data_etl import Database
+from pg_data_etl.cache import normalize_sql
+
+from .conftest import TEST_DATA_PATH
+
+
+def test_normalize_sql_keeps_quoted_whitespace():
+    assert normalize_sql("SELECT  *\n FROM t -- note\n;") == "SELECT * FROM t"
+    assert normalize_sql("SELECT 'a  b'") != normalize_sql("SELECT 'a b'")
+
+
+def test_cache_hits_until_the_table_changes(local_db: Database):
+    local_db.execute("CREATE TABLE cached AS SELECT g AS id FROM generate_series(1, 100) g;")
+    local_db.enable_cache(folder=TEST_DATA_PATH / "query_cache")
+
+    query = "SELECT * FROM cached"
+
+    assert len(local_db.df(query)) == 100
+    assert len(local_db.df(query)) == 100
+    assert local_db.cache_stats()["hits"] == 1
+
+    # A rewrite of the table changes its freshness token
+    local_db.execute("TRUNCATE cached; INSERT INTO cached SELECT g FROM generate_series(1, 5) g;")
+
+    assert len(local_db.df(query)) == 5
+    assert len(local_db.df(query, cache=False)) == 5
+
+    stats = local_db.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["bypassed"]) == (1, 2, 1)
+
+    local_db.disable_cache(clear=True)
+
+
+def test_results_that_cant_be_written_are_returned_uncached(local_db: Database):
+    local_db.execute("CREATE TABLE cached AS SELECT g AS id FROM generate_series(1, 10) g;")
+    local_db.enable_cache(folder=TEST_DATA_PATH / "query_cache")
+
+    # Parquet doesn't allow duplicate column names
+    df = local_db.df("SELECT id, id FROM cached")
+
+    assert len(df) == 10
+    assert local_db.cache_stats()["write_errors"] == 1
+    assert local_db.cache_stats()["files"] == 0
+
+    local_db.disable_cache(clear=True)
+
+
+def test_cache_works_while_profiling(local_db: Database):
+    local_db.execute("CREATE TABLE cached AS SELECT g AS id FROM generate_series(1, 10) g;")
+    local_db.enable_cache(folder=TEST_DATA_PATH / "query_cache")
+
+    with local_db.profile():
+        local_db.df("SELECT * FROM cached")
+        local_db.df("SELECT * FROM cached")
+
+    stats = local_db.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["bypassed"]) == (1, 1, 0)
+
+    local_db.disable_cache(clear=True)
+
+
+def test_enable_cache_needs_pyarrow(local_db: Database, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.raises(ImportError, match="pyarrow"):
+        local_db.enable_cache(folder=TEST_DATA_PATH / "query_cache")
@@ -0,0 +1,52 @@
+import json
+
+import pandas as pd
+from click.testing import CliRunner
+
+from pg_data_etl import Database
+from pg_data_etl.cli import main
+
+
+def test_import_many_files_in_parallel(local_db: Database, tmp_path):
+    targets = []
+    for i in range(3):
+        filepath = tmp_path / f"data_{i}.csv"
+        pd.DataFrame({"value": range(10)}).to_csv(filepath, index=False)
+        targets.append(f"{filepath}=cli.data_{i}")
+
+    db_name = local_db.connection_params["db_name"]
+    result = CliRunner().invoke(main, ["import", "--db", db_name, "--jobs", "3", *targets])
+
+    summary = json.loads(result.stdout)
+
+    assert result.exit_code == 0
+    assert summary["succeeded"] == 3
+    assert sorted(local_db.tables(schema="cli")) == [f"cli.data_{i}" for i in range(3)]
+
+
+def test_failed_target_is_reported_without_stopping_the_batch(local_db: Database, tmp_path):
+    filepath = tmp_path / "data.csv"
+    pd.DataFrame({"value": range(10)}).to_csv(filepath, index=False)
+
+    db_name = local_db.connection_params["db_name"]
+    targets = [f"{filepath}=cli.good", f"{tmp_path / 'missing.csv'}=cli.bad"]
+    result = CliRunner().invoke(main, ["import", "--db", db_name, *targets])
+
+    summary = json.loads(result.stdout)
+
+    assert result.exit_code == 1
+    assert [r["status"] for r in summary["results"]] == ["ok", "error"]
+
+
+def test_unsupported_export_suffix_is_a_failure(local_db: Database, tmp_path):
+    local_db.execute("CREATE TABLE counts AS SELECT 1 AS value;")
+
+    db_name = local_db.connection_params["db_name"]
+    targets = [f"counts={tmp_path / 'counts.csv'}", f"counts={tmp_path / 'counts.kml'}"]
+    result = CliRunner().invoke(main, ["export", "--db", db_name, *targets])
+
+    summary = json.loads(result.stdout)
+
+    assert result.exit_code == 1
+    assert [r["status"] for r in summary["results"]] == ["ok", "error"]
+    assert "counts.kml" in summary["results"][1]["target"]
@@ -0,0 +1,17 @@
+import pytest
+
+from pg_data_etl import helpers
+
+
+def test_run_command_in_shell_raises_on_failure_when_checked():
+    assert helpers.run_command_in_shell("exit 3") == b""
+
+    with pytest.raises(RuntimeError, match="code 3"):
+        helpers.run_command_in_shell("exit 3", check=True)
+
+
+def test_run_pipeline_in_shell_raises_if_any_command_fails():
+    assert helpers.run_pipeline_in_shell("echo hello", "tr a-z A-Z") == b"HELLO\n"
+
+    with pytest.raises(RuntimeError, match="code 1: false"):
+        helpers.run_pipeline_in_shell("false", "cat")
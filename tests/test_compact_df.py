@@ -0,0 +1,50 @@
+import sys
+
+from pg_data_etl import Database
+
+
+def test_compact_df_uses_nullable_and_small_dtypes(local_db: Database):
+    query = """
+        SELECT
+            CASE WHEN mod(g, 10) = 0 THEN NULL ELSE g END::int AS id,
+            mod(g, 3)::numeric / 2 AS half,
+            g::float8 / 3 AS third,
+            CASE WHEN mod(g, 2) = 0 THEN 'even' ELSE 'odd' END AS parity,
+            'row ' || g AS label,
+            mod(g, 2) = 0 AS is_even,
+            DATE '2021-01-01' + g AS day
+        FROM generate_series(1, 1000) g
+    """
+
+    default = local_db.df(query)
+    compact = local_db.df(query, compact=True)
+
+    assert str(compact["id"].dtype) == "Int32"
+    assert compact["id"].isna().sum() == 100
+    assert str(compact["half"].dtype) == "float32"
+    assert str(compact["third"].dtype) == "float64"
+    assert str(compact["parity"].dtype) == "category"
+    assert str(compact["is_even"].dtype) == "boolean"
+    assert str(compact["day"].dtype).startswith("datetime64")
+
+    assert compact.memory_usage(deep=True).sum() < default.memory_usage(deep=True).sum()
+
+
+def test_compact_df_keeps_large_bigints_exact(local_db: Database):
+    compact = local_db.df(
+        "SELECT * FROM (VALUES (9007199254740993::bigint), (NULL)) AS t(big)", compact=True
+    )
+
+    assert str(compact["big"].dtype) == "Int64"
+    assert compact["big"][0] == 9007199254740993
+    assert compact["big"].isna()[1]
+
+
+def test_compact_df_without_pyarrow(local_db: Database, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    compact = local_db.df(
+        "SELECT 'row ' || g AS label FROM generate_series(1, 100) g", compact=True
+    )
+
+    assert compact["label"].dtype.storage == "python"
@@ -1,6 +1,147 @@
+import psycopg2
+import pytest
+
+from pg_data_etl import Database
+
 # def test_spatial_copy_table_to(local_db, local_db_with_spatial_data):
 #     """Copy a spatial table from a local db to another local db """
 
 #     local_db_with_spatial_data.copy_table_to("circuittrails", local_db)
 
 #     assert "public.circuittrails" in local_db.list_of_tables(spatial_only=True)
+
+
+def test_copy_table_in_parallel_ranges(local_db, local_target_db):
+    """Stream a table with binary COPY over several connections """
+
+    local_db.execute(
+        """
+        CREATE SCHEMA raw;
+        CREATE TABLE raw.counts (uid serial PRIMARY KEY, name text NOT NULL);
+        INSERT INTO raw.counts (name) SELECT 'row ' || g FROM generate_series(1, 20000) g;
+        CREATE INDEX ON raw.counts (name);
+        """
+    )
+
+    local_db.export_table_to_another_db("raw.counts", local_target_db, method="copy", workers=4)
+
+    assert local_target_db.query_as_singleton("SELECT count(DISTINCT uid) FROM raw.counts") == 20000
+    assert len(local_target_db.query("SELECT * FROM pg_indexes WHERE tablename = 'counts'")) == 2
+
+    # The serial sequence continues after the copied values
+    local_target_db.execute("INSERT INTO raw.counts (name) VALUES ('new');")
+    assert local_target_db.query_as_singleton("SELECT max(uid) FROM raw.counts") == 20001
+
+
+def test_copy_table_with_more_workers_than_pooled_connections(local_db, local_target_db):
+    """Parallel ranges don't wait on each other for pooled connections """
+
+    local_db.execute(
+        """
+        CREATE TABLE counts (uid serial PRIMARY KEY, name text);
+        INSERT INTO counts (name) SELECT repeat('x', 500) FROM generate_series(1, 50000) g;
+        """
+    )
+
+    local_db.enable_pool(maxconn=2)
+    local_target_db.enable_pool(maxconn=2)
+
+    try:
+        local_db.export_table_to_another_db("counts", local_target_db, method="copy", workers=4)
+    finally:
+        local_db.close_pool()
+        local_target_db.close_pool()
+
+    assert local_target_db.query_as_singleton("SELECT count(*) FROM counts") == 50000
+
+
+def test_copy_query_subset_keeps_column_types(local_db, local_target_db):
+    """Copy a filtered, projected subset of a table into a new table """
+
+    local_db.execute(
+        """
+        CREATE TABLE counts (uid serial, county varchar(20), total numeric(10, 2), extra text);
+        INSERT INTO counts (county, total)
+        SELECT CASE WHEN g % 2 = 0 THEN 'Bucks' ELSE 'Chester' END, g / 3.0
+        FROM generate_series(1, 1000) g;
+        """
+    )
+
+    query = "SELECT uid, county, total, total * 2 AS doubled FROM counts WHERE county = 'Bucks';"
+
+    local_db.copy_query_to_another_db(query, local_target_db, "subset.bucks")
+
+    assert local_target_db.query_as_singleton("SELECT count(*) FROM subset.bucks") == 500
+
+    column_types = local_target_db.query(
+        """
+        SELECT column_name, data_type, character_maximum_length
+        FROM information_schema.columns
+        WHERE table_schema = 'subset' AND table_name = 'bucks'
+        ORDER BY ordinal_position
+        """
+    )
+
+    assert column_types == [
+        ["uid", "integer", None],
+        ["county", "character varying", 20],
+        ["total", "numeric", None],
+        ["doubled", "numeric", None],
+    ]
+
+
+def test_clone_copies_the_database_with_a_template(local_db):
+    """Clone a database on the same cluster with CREATE DATABASE ... TEMPLATE """
+
+    local_db.execute(
+        """
+        CREATE TABLE counts (uid serial PRIMARY KEY, total int);
+        INSERT INTO counts (total) SELECT g FROM generate_series(1, 500) g;
+        """
+    )
+
+    clone = local_db.clone("pytest_clone")
+
+    try:
+        assert clone.connection_params["db_name"] == "pytest_clone"
+        assert clone.query_as_singleton("SELECT sum(total) FROM counts") == 125250
+    finally:
+        clone.admin("DROP")
+
+
+def test_export_entire_db_terminates_other_connections(local_db):
+    """Copy with a template on the same cluster, even while someone else is connected """
+
+    local_db.execute("CREATE TABLE counts AS SELECT g AS uid FROM generate_series(1, 10) g;")
+
+    target_db = Database.from_config("pytest_clone", "localhost")
+    lingering = psycopg2.connect(local_db.uri)
+
+    try:
+        local_db.export_entire_db_to_another_db(target_db, connections="terminate")
+
+        assert target_db.query_as_singleton("SELECT count(*) FROM counts") == 10
+
+        with pytest.raises(psycopg2.OperationalError):
+            lingering.cursor().execute("SELECT 1")
+    finally:
+        lingering.close()
+        target_db.admin("DROP")
+
+
+def test_export_entire_db_falls_back_to_a_dump(local_db):
+    """The default method copies with pg_dump when the template is in use """
+
+    local_db.execute("CREATE TABLE counts AS SELECT g AS uid FROM generate_series(1, 10) g;")
+
+    target_db = Database.from_config("pytest_clone", "localhost")
+    lingering = psycopg2.connect(local_db.uri)
+
+    try:
+        local_db.export_entire_db_to_another_db(target_db)
+
+        assert target_db.query_as_singleton("SELECT count(*) FROM counts") == 10
+        assert not lingering.closed
+    finally:
+        lingering.close()
+        target_db.admin("DROP")
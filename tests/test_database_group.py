@@ -0,0 +1,32 @@
+from pg_data_etl import Database, DatabaseGroup
+
+
+def test_group_runs_an_action_on_every_member(local_db: Database, local_target_db: Database):
+    group = DatabaseGroup([local_db, local_target_db], workers=2)
+
+    results = group.run("query_as_singleton", "SELECT current_database()")
+
+    assert {name: r["result"] for name, r in results.items()} == {
+        "pytest": "pytest",
+        "pytest_target": "pytest_target",
+    }
+    assert all(r["status"] == "ok" for r in results.values())
+
+
+def test_group_collects_failures_per_member(local_db: Database, local_target_db: Database):
+    local_db.execute("CREATE TABLE only_in_one_db (id int);")
+
+    group = DatabaseGroup({"source": local_db, "target": local_target_db})
+
+    results = group.run(lambda db: db.query_as_singleton("SELECT count(*) FROM only_in_one_db"))
+
+    assert results["source"]["result"] == 0
+    assert results["target"]["status"] == "error"
+    assert "only_in_one_db" in results["target"]["error"]
+
+
+def test_group_from_config_names_members():
+    group = DatabaseGroup.from_config(["pytest", "pytest_target"], "localhost")
+
+    assert [name for name, _ in group] == ["pytest", "pytest_target"]
+    assert group["pytest_target"].connection_params["db_name"] == "pytest_target"
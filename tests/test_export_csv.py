@@ -0,0 +1,46 @@
+import pandas as pd
+
+from pg_data_etl import Database
+
+
+def _make_counts(db: Database) -> None:
+    db.execute("""
+        CREATE TABLE counts AS
+        SELECT g AS id, mod(g, 7) AS station, 'count, ' || g AS label
+        FROM generate_series(1, 10000) g;
+    """)
+
+
+def test_export_csv_streams_tables_and_queries(local_db: Database, tmp_path):
+    _make_counts(local_db)
+
+    [plain] = local_db.export_csv("counts", tmp_path / "counts.csv")
+    [gzipped] = local_db.export_csv(
+        "SELECT * FROM counts WHERE station = 3", tmp_path / "station_3.tsv.gz"
+    )
+
+    df = pd.read_csv(plain)
+
+    assert len(df) == 10000
+    assert df["label"][0] == "count, 1"
+
+    df = pd.read_csv(gzipped, sep="\t")
+
+    assert len(df) == len([g for g in range(1, 10001) if g % 7 == 3])
+    assert set(df["station"]) == {3}
+
+
+def test_export_csv_splits_into_parts(local_db: Database, tmp_path):
+    _make_counts(local_db)
+
+    by_location = local_db.export_csv("counts", tmp_path / "counts.csv", parts=3)
+    by_key = local_db.export_csv(
+        "SELECT id, label FROM counts", tmp_path / "keyed.csv.gz", parts=4, split_on="id"
+    )
+
+    assert [f.name for f in by_key] == [f"keyed_{i:03d}.csv.gz" for i in range(4)]
+
+    for filepaths in [by_location, by_key]:
+        df = pd.concat([pd.read_csv(f) for f in filepaths])
+
+        assert sorted(df["id"]) == list(range(1, 10001))
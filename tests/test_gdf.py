@@ -0,0 +1,32 @@
+from pg_data_etl import Database
+
+
+def test_gdf_accepts_a_trailing_semicolon(local_db: Database):
+    gdf = local_db.gdf("SELECT 1 AS a, ST_SetSRID(ST_MakePoint(0, 0), 2272) AS geom; \n")
+
+    assert len(gdf) == 1
+    assert gdf.crs.to_epsg() == 2272
+
+
+def test_gdf_with_duplicate_column_names(local_db: Database):
+    gdf = local_db.gdf("SELECT 1 AS a, 2 AS a, ST_SetSRID(ST_MakePoint(0, 0), 2272) AS geom;")
+
+    assert list(gdf.columns) == ["a", "a", "geom"]
+    assert gdf.geometry.name == "geom"
+
+
+def test_gdf_reads_a_geography_column(local_db: Database):
+    gdf = local_db.gdf("SELECT 1 AS a, ST_SetSRID(ST_MakePoint(-75, 40), 4326)::geography AS geom")
+
+    assert len(gdf) == 1
+    assert gdf.crs.to_epsg() == 4326
+    assert gdf.geometry.x[0] == -75
+
+
+def test_gdf_reads_wkb_bytea(local_db: Database):
+    # The WKB of POINT (1 2), as ST_AsBinary() returns it
+    gdf = local_db.gdf(
+        "SELECT 1 AS a, '\\x0101000000000000000000f03f0000000000000040'::bytea AS geom"
+    )
+
+    assert gdf.geometry.y[0] == 2
@@ -1,3 +1,7 @@
+import geopandas as gpd
+import pytest
+from shapely.geometry import MultiPolygon, Point, box
+
 from pg_data_etl import Database
 
 
@@ -48,3 +52,42 @@ def test_geopandas_imports_spatial_data_from_disk(local_db: Database, downloaded
 
     # Confirm that the EPSG is correct
     assert 2272 == local_db.projection(sql_tablename)
+
+
+def test_chunked_geopandas_import_skips_chunks_of_null_geometries(local_db: Database, tmp_path):
+    filepath = tmp_path / "points.gpkg"
+    geometry = [None, None] + [Point(i, i) for i in range(3)]
+    gpd.GeoDataFrame({"v": range(5)}, geometry=geometry, crs="EPSG:2272").to_file(filepath)
+
+    local_db.import_gis(
+        method="geopandas", filepath=filepath, sql_tablename="test.points", chunksize=2
+    )
+
+    assert local_db.query_as_singleton("SELECT count(*) FROM test.points") == 3
+
+
+def test_chunked_geopandas_import_rejects_a_chunk_of_another_geometry_type(
+    local_db: Database, tmp_path
+):
+    filepath = tmp_path / "squares.gpkg"
+    squares = [box(i, i, i + 1, i + 1) for i in range(4)]
+    geometry = squares[:2] + [MultiPolygon([square]) for square in squares[2:]]
+    gpd.GeoDataFrame({"v": range(4)}, geometry=geometry, crs="EPSG:2272").to_file(filepath)
+
+    with pytest.raises(ValueError, match="MULTIPOLYGON"):
+        local_db.import_gis(
+            method="geopandas", filepath=filepath, sql_tablename="test.squares", chunksize=2
+        )
+
+    # Exploding makes every chunk single-part
+    local_db.import_gis(
+        method="geopandas",
+        filepath=filepath,
+        sql_tablename="test.squares",
+        gpd_kwargs={"if_exists": "replace"},
+        chunksize=2,
+        explode=True,
+        resume=False,
+    )
+
+    assert local_db.query_as_singleton("SELECT count(*) FROM test.squares") == 4
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+# Generous ceiling so this only trips when a heavy import sneaks back into the import path
+IMPORT_TIME_LIMIT_MS = float(os.environ.get("PG_DATA_ETL_IMPORT_TIME_LIMIT_MS", 300))
+
+HEAVY_MODULES = ["pandas", "geopandas", "sqlalchemy", "geoalchemy2", "psycopg2", "shapely"]
+
+
+def import_times(module: str) -> dict:
+    """
+    - Import `module` in a fresh interpreter with `python -X importtime`
+    - Return a dict of {module name: cumulative import time in milliseconds}
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1000
+
+    return times
+
+
+def test_cli_import_does_not_load_heavy_dependencies():
+    times = import_times("pg_data_etl.cli")
+
+    assert [m for m in HEAVY_MODULES if m in times] == []
+
+
+def test_cli_import_time_is_below_threshold():
+    # Take the best of a few runs so a busy machine doesn't cause false alarms
+    best = min(import_times("pg_data_etl.cli")["pg_data_etl.cli"] for _ in range(3))
+
+    assert best < IMPORT_TIME_LIMIT_MS
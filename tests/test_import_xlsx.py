@@ -0,0 +1,104 @@
+import datetime
+
+import openpyxl
+import pytest
+
+from pg_data_etl import Database
+
+
+def test_import_xlsx_streams_each_sheet_into_its_own_table(local_db: Database, tmp_path):
+    filepath = tmp_path / "counts.xlsx"
+
+    workbook = openpyxl.Workbook()
+    north = workbook.active
+    north.title = "North"
+    north.append(["Station ID", "Geo.Display-Label", "Volume", "Counted On"])
+
+    for i in range(1, 1201):
+        # Whole numbers in the first chunk, decimals in the second
+        volume = i if i <= 500 else i + 0.5
+        north.append(
+            [i, f"station {i}", volume, datetime.datetime(2021, 1, 1) + datetime.timedelta(i)]
+        )
+
+    south = workbook.create_sheet("South")
+    south.append(["Station ID", "Note"])
+    south.append([1, "only row"])
+    workbook.save(filepath)
+
+    counts = local_db.import_xlsx(filepath, "xlsx_test.counts", chunksize=500, if_exists="replace")
+
+    assert counts == {"North": 1200, "South": 1}
+    assert set(local_db.columns("xlsx_test.counts_north")) == {
+        "station_id",
+        "geodisplaylabel",
+        "volume",
+        "counted_on",
+    }
+    assert local_db.query_as_singleton("SELECT sum(volume) FROM xlsx_test.counts_north") == sum(
+        i if i <= 500 else i + 0.5 for i in range(1, 1201)
+    )
+    assert (
+        local_db.query_as_singleton(
+            "SELECT pg_typeof(counted_on)::text FROM xlsx_test.counts_north LIMIT 1"
+        )
+        == "timestamp without time zone"
+    )
+    assert local_db.query_as_singleton("SELECT note FROM xlsx_test.counts_south") == "only row"
+
+
+def test_import_xlsx_renames_colliding_headers(local_db: Database, tmp_path):
+    filepath = tmp_path / "collide.xlsx"
+
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["Volume", "volume", "A-B", "AB"])
+    workbook.active.append([1, 2, 3, 4])
+    workbook.save(filepath)
+
+    local_db.import_xlsx(filepath, "xlsx_test.collide")
+
+    assert set(local_db.columns("xlsx_test.collide")) == {"volume", "volume_2", "ab", "ab_2"}
+
+
+def test_import_xlsx_append_never_alters_the_existing_table(local_db: Database, tmp_path):
+    filepath = tmp_path / "append.xlsx"
+
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["Station", "Volume"])
+    workbook.active.append([1, 10.5])
+    workbook.save(filepath)
+
+    local_db.execute("CREATE TABLE append_target (station int, volume int);")
+
+    with pytest.raises(ValueError, match="volume"):
+        local_db.import_xlsx(filepath, "public.append_target", if_exists="append")
+
+    local_db.execute("ALTER TABLE append_target ALTER COLUMN volume TYPE numeric;")
+    local_db.import_xlsx(filepath, "public.append_target", if_exists="append")
+
+    assert local_db.query_as_list_of_lists(
+        "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = 'append_target'::regclass AND attname = 'station'"
+    ) == [["integer"]]
+    assert local_db.query_as_singleton("SELECT sum(volume) FROM append_target") == 10.5
+
+
+def test_import_xlsx_keeps_empty_text_cells_apart_from_empty_cells(local_db: Database):
+    from pg_data_etl.database.actions.import_excel import _copy_chunk
+
+    local_db.execute("CREATE SCHEMA IF NOT EXISTS xlsx_test")
+    local_db.execute("DROP TABLE IF EXISTS xlsx_test.blanks")
+    local_db.execute("CREATE TABLE xlsx_test.blanks (id bigint, note text)")
+
+    with local_db.connection() as conn:
+        with conn.cursor() as cursor:
+            _copy_chunk(
+                cursor,
+                "xlsx_test.blanks",
+                ["id", "note"],
+                [(1, ""), (2, None), (3, 'say "hi", twice')],
+            )
+
+    assert local_db.query_as_list_of_lists(
+        "SELECT id, note IS NULL, note FROM xlsx_test.blanks ORDER BY id"
+    ) == [[1, False, ""], [2, True, None], [3, False, 'say "hi", twice']]
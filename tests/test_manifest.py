@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from pg_data_etl import Database
+from pg_data_etl.manifest import Manifest, run_manifest
+
+
+def test_dependencies_are_inferred_from_table_names():
+    manifest = Manifest(
+        {
+            "sources": {"roads": {"filepath": "roads.shp", "table": "gis.roads"}},
+            "transforms": {
+                "buffers": {"table": "gis.buffers", "sql": "SELECT * FROM gis.roads"},
+            },
+            "exports": {"out": {"table_or_sql": "gis.buffers", "filepath": "out.geojson"}},
+        }
+    )
+
+    assert manifest.dependencies == {"roads": [], "buffers": ["roads"], "out": ["buffers"]}
+    assert manifest.order == ["roads", "buffers", "out"]
+
+
+def test_dependency_cycles_are_rejected():
+    with pytest.raises(ValueError):
+        Manifest(
+            {
+                "transforms": {
+                    "a": {"sql": "SELECT 1", "depends_on": ["b"]},
+                    "b": {"sql": "SELECT 1", "depends_on": ["a"]},
+                }
+            }
+        )
+
+
+def test_unchanged_steps_are_skipped_on_the_next_run(local_db: Database, tmp_path):
+    pd.DataFrame({"value": range(10)}).to_csv(tmp_path / "values.csv", index=False)
+
+    manifest_path = tmp_path / "etl.toml"
+    manifest_path.write_text(
+        """
+        jobs = 2
+
+        [sources.values]
+        filepath = "values.csv"
+        table = "raw.values"
+
+        [transforms.doubled]
+        table = "raw.doubled"
+        sql = "SELECT value * 2 AS value FROM raw.values"
+
+        [exports.doubled_csv]
+        table_or_sql = "raw.doubled"
+        filepath = "output/doubled.csv"
+        """
+    )
+
+    first = run_manifest(manifest_path, db=local_db)
+    second = run_manifest(manifest_path, db=local_db)
+
+    assert [r["status"] for r in first["results"]] == ["ok", "ok", "ok"]
+    assert [r["status"] for r in second["results"]] == ["skipped", "skipped", "skipped"]
+    assert (tmp_path / "output" / "doubled.csv").exists()
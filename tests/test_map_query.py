@@ -0,0 +1,22 @@
+from pg_data_etl import Database
+
+
+def test_map_query_keeps_order_and_reports_failures(local_db: Database):
+    queries = {n: f"SELECT {n} AS n, pg_sleep(0.05)::text AS slept" for n in range(8)}
+    queries["broken"] = "SELECT * FROM table_that_does_not_exist"
+
+    results = local_db.map_query(queries, workers=4)
+
+    assert [r["key"] for r in results] == list(queries)
+    assert [r["result"]["n"][0] for r in results[:-1]] == list(range(8))
+    assert all(r["seconds"] >= 0.05 for r in results[:-1])
+
+    assert results[-1]["status"] == "error"
+    assert "table_that_does_not_exist" in results[-1]["error"]
+
+
+def test_map_query_returns_rows(local_db: Database):
+    results = local_db.map_query(["SELECT 1, 'a'", "SELECT 2, 'b'"], as_="rows")
+
+    assert [r["result"] for r in results] == [[[1, "a"]], [[2, "b"]]]
+    assert [r["rows"] for r in results] == [1, 1]
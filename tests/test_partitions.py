@@ -0,0 +1,90 @@
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import Point
+
+from pg_data_etl import Database
+
+
+def test_list_partitions_are_added_on_append(local_db: Database):
+    df = pd.DataFrame({"Year": [2019, 2019, 2020], "count": [1, 2, 3]})
+
+    partition_by = {"column": "Year", "strategy": "list"}
+
+    local_db.import_dataframe(df, "raw.counts", {"index": False}, partition_by=partition_by)
+
+    assert local_db.table_partitions("raw.counts") == ["raw.counts_2019", "raw.counts_2020"]
+
+    new_df = pd.DataFrame({"Year": [2020, 2021], "count": [4, 5]})
+    local_db.import_dataframe(
+        new_df, "raw.counts", {"index": False, "if_exists": "append"}, partition_by=partition_by
+    )
+
+    assert local_db.table_partitions("raw.counts")[-1] == "raw.counts_2021"
+    assert local_db.query_as_singleton("SELECT count(*) FROM raw.counts_2020") == 2
+    assert local_db.query_as_singleton("SELECT count(*) FROM raw.counts") == 5
+
+
+def test_monthly_range_partitions(local_db: Database):
+    df = pd.DataFrame(
+        {"date": pd.to_datetime(["2021-01-05", "2021-01-20", "2021-03-01"]), "value": [1, 2, 3]}
+    )
+
+    local_db.import_dataframe(
+        df,
+        "events",
+        {"index": False},
+        partition_by={"column": "date", "strategy": "range", "interval": "month"},
+    )
+
+    assert local_db.table_partitions("events") == ["public.events_2021_01", "public.events_2021_03"]
+    assert local_db.query_as_singleton("SELECT count(*) FROM events_2021_01") == 2
+
+
+def test_long_partition_names_are_found_again_on_append(local_db: Database):
+    tablename = "raw.counts_with_a_very_long_name_that_is_close_to_the_postgres_limit"
+    partition_by = {"column": "station", "strategy": "list"}
+    df = pd.DataFrame({"station": ["a" * 30, "b" * 30], "count": [1, 2]})
+
+    for if_exists in ["fail", "append"]:
+        local_db.import_dataframe(
+            df, tablename, {"index": False, "if_exists": if_exists}, partition_by=partition_by
+        )
+
+    assert len(local_db.table_partitions(tablename)) == 2
+    assert local_db.query_as_singleton(f"SELECT count(*) FROM {tablename}") == 4
+
+
+def test_the_text_null_and_a_null_value_get_their_own_partitions(local_db: Database):
+    df = pd.DataFrame({"label": ["null", None], "count": [1, 2]})
+
+    local_db.import_dataframe(
+        df, "labels", {"index": False}, partition_by={"column": "label", "strategy": "list"}
+    )
+
+    partitions = local_db.table_partitions("labels")
+
+    assert len(partitions) == 2
+    assert "public.labels_null" in partitions
+    assert local_db.query_as_singleton("SELECT count FROM labels_null") == 2
+
+
+def test_partitioned_geodataframe_is_clustered_one_partition_at_a_time(local_db: Database):
+    gdf = gpd.GeoDataFrame(
+        {"year": [2019, 2019, 2020]},
+        geometry=[Point(0, 0), Point(1, 1), Point(2, 2)],
+        crs="EPSG:2272",
+    )
+
+    local_db.import_geodataframe(
+        gdf, "gis.points", partition_by={"column": "year", "strategy": "list"}, cluster=True
+    )
+
+    clustered = local_db.query_as_list_of_singletons("""
+        SELECT c.relname
+        FROM pg_index x
+        JOIN pg_class c ON c.oid = x.indrelid
+        WHERE x.indisclustered
+        ORDER BY 1
+    """)
+
+    assert clustered == ["points_2019", "points_2020"]
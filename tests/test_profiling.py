@@ -0,0 +1,31 @@
+from pg_data_etl import Database
+from pg_data_etl.profiling import split_statements, is_explainable
+
+
+def test_split_statements_ignores_semicolons_in_literals():
+    sql = "DROP TABLE IF EXISTS x; CREATE TABLE x AS SELECT ';' AS a, $$;$$ AS b;"
+
+    statements = split_statements(sql)
+
+    assert len(statements) == 2
+    assert not is_explainable(statements[0])
+    assert is_explainable(statements[1])
+
+
+def test_profile_captures_ctas_plan_and_index_hint(local_db: Database):
+    with local_db.profile() as profiler:
+        local_db.execute(
+            """
+            CREATE TABLE profiled AS
+            SELECT g AS id FROM generate_series(1, 100000) g;
+            """
+        )
+        local_db.df("SELECT * FROM profiled WHERE id = 5")
+
+    assert [r["action"] for r in profiler.records] == ["execute", "df"]
+    assert all(r["plan"] for r in profiler.records)
+
+    # The CTAS ran exactly once, through EXPLAIN ANALYZE
+    assert local_db.query_as_singleton("SELECT count(*) FROM profiled") == 100000
+
+    assert any("id" in hint for hint in profiler.index_hints())
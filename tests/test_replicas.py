@@ -0,0 +1,75 @@
+"""
+The "replica" in these tests is a second database on the local server, which is
+enough to see where each read is routed
+"""
+from pg_data_etl import Database, helpers
+
+CURRENT_DB = "SELECT current_database()"
+
+
+def test_reads_go_to_replicas_and_writes_to_primary(local_db: Database, local_target_db: Database):
+    db = Database.from_uri(local_db.uri, replicas=[local_target_db.uri])
+
+    assert db.query_as_singleton(CURRENT_DB) == "pytest_target"
+    assert db.df("SELECT current_database() AS name")["name"][0] == "pytest_target"
+
+    with db.pin_to_primary():
+        assert db.query_as_singleton(CURRENT_DB) == "pytest"
+
+    # Reads right after a write on this thread stick to the primary
+    db.execute("CREATE TABLE written_on_primary (id int);")
+    assert db.query_as_singleton("SELECT count(*) FROM written_on_primary") == 0
+
+    with db.session():
+        assert db.query_as_singleton(CURRENT_DB) == "pytest"
+
+
+def test_round_robin_takes_turns(local_db: Database, local_target_db: Database):
+    db = Database.from_uri(local_db.uri, replicas=[local_target_db.uri, local_db.uri])
+
+    assert [db.query_as_singleton(CURRENT_DB) for _ in range(4)] == [
+        "pytest_target",
+        "pytest",
+        "pytest_target",
+        "pytest",
+    ]
+
+
+def test_least_busy_picks_the_replica_with_fewest_reads_in_flight():
+    router = helpers.ReplicaRouter(["postgresql://a", "postgresql://b"], strategy="least_busy")
+
+    first = router.acquire()
+    second = router.acquire()
+
+    assert {first, second} == {"postgresql://a", "postgresql://b"}
+
+    router.release(second)
+
+    assert router.acquire() == second
+
+
+def test_unreachable_replica_falls_back_to_primary(local_db: Database):
+    unreachable = "postgresql://postgres:@localhost:1/pytest"
+    db = Database.from_uri(local_db.uri, replicas=unreachable)
+
+    assert db.query_as_singleton(CURRENT_DB) == "pytest"
+    assert db._router.stats()[unreachable]["down"]
+
+
+def test_replicas_from_config_file(local_target_db: Database, tmp_path):
+    config_file = tmp_path / "database_connections.cfg"
+    config_file.write_text(
+        "[localhost]\n"
+        "host = localhost\n"
+        "un = postgres\n"
+        "pw = \n"
+        "port = 5432\n"
+        f"replicas = {local_target_db.uri}\n"
+        "replica_strategy = least_busy\n"
+    )
+
+    db = Database.from_config("pytest_target", "localhost", config_filepath=config_file)
+
+    assert db._router.uris == [local_target_db.uri]
+    assert db._router.strategy == "least_busy"
+    assert db.query_as_singleton(CURRENT_DB) == "pytest_target"
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from pg_data_etl import Database, helpers
+
+from .conftest import TEST_DATA_PATH
+
+
+def test_chunked_csv_import_resumes_after_failure(local_db: Database, monkeypatch):
+    TEST_DATA_PATH.mkdir(exist_ok=True)
+    filepath = TEST_DATA_PATH / "resumable.csv"
+    pd.DataFrame({"ID": range(1000), "Value": 1.5}).to_csv(filepath, index=False)
+
+    sanitize = helpers.sanitize_df_for_sql
+    calls = []
+
+    def fail_on_fourth_chunk(df):
+        calls.append(1)
+        if len(calls) == 4:
+            raise RuntimeError("connection lost")
+        return sanitize(df)
+
+    monkeypatch.setattr(helpers, "sanitize_df_for_sql", fail_on_fourth_chunk)
+
+    with pytest.raises(RuntimeError):
+        local_db.import_file_with_pandas(filepath, "raw.resumable", chunksize=100)
+
+    # The three committed chunks stay loaded
+    assert local_db.query_as_singleton("SELECT count(*) FROM raw.resumable") == 300
+
+    monkeypatch.setattr(helpers, "sanitize_df_for_sql", sanitize)
+    local_db.import_file_with_pandas(filepath, "raw.resumable", chunksize=100)
+
+    assert local_db.query_as_singleton("SELECT count(DISTINCT id) FROM raw.resumable") == 1000
+    assert local_db.query_as_singleton("SELECT count(*) FROM raw.resumable") == 1000
+    assert local_db.query_as_singleton("SELECT count(*) FROM pg_data_etl_import_progress") == 0
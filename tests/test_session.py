@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from pg_data_etl import Database
+
+
+def test_session_shares_one_connection_and_transaction(local_db: Database):
+    with local_db.session():
+        pid = local_db.query_as_singleton("SELECT pg_backend_pid()")
+
+        local_db.execute("CREATE TABLE session_shared (id int);")
+        local_db.import_dataframe(
+            pd.DataFrame({"id": [1, 2, 3]}),
+            "session_shared",
+            {"index": False, "if_exists": "append"},
+        )
+
+        assert local_db.df("SELECT pg_backend_pid() AS pid")["pid"][0] == pid
+        assert local_db.query_as_singleton("SELECT count(*) FROM session_shared") == 3
+
+    assert local_db.query_as_singleton("SELECT pg_backend_pid()") != pid
+    assert local_db.query_as_singleton("SELECT count(*) FROM session_shared") == 3
+
+
+def test_session_rolls_back_everything_on_failure(local_db: Database):
+    with pytest.raises(ZeroDivisionError):
+        with local_db.session():
+            local_db.execute("CREATE TABLE session_rolled_back (id int);")
+            local_db.execute("INSERT INTO session_rolled_back VALUES (1);")
+            1 / 0
+
+    assert not local_db.query_as_singleton("SELECT to_regclass('session_rolled_back') IS NOT NULL")
+
+
+def test_failed_helper_only_rolls_back_its_savepoint(local_db: Database):
+    with local_db.session():
+        local_db.execute("CREATE TABLE session_savepoint (id int PRIMARY KEY);")
+        local_db.execute("INSERT INTO session_savepoint VALUES (1);")
+
+        with pytest.raises(Exception):
+            local_db.execute("INSERT INTO session_savepoint VALUES (1);")
+
+        with pytest.raises(ValueError):
+            with local_db.session():
+                local_db.execute("INSERT INTO session_savepoint VALUES (2);")
+                raise ValueError()
+
+        local_db.execute("INSERT INTO session_savepoint VALUES (3);")
+
+    assert local_db.query_as_list_of_singletons("SELECT id FROM session_savepoint ORDER BY id") == [
+        1,
+        3,
+    ]
+
+
+def test_profiling_and_query_copies_keep_the_session_writes(
+    local_db: Database, local_target_db: Database
+):
+    with local_db.session():
+        local_db.execute("CREATE TABLE session_kept (id int);")
+        local_db.execute("INSERT INTO session_kept VALUES (1), (2);")
+
+        with local_db.profile(analyze=False):
+            assert local_db.query_as_singleton("SELECT count(*) FROM session_kept") == 2
+
+        local_db.copy_query_to_another_db(
+            "SELECT generate_series(1, 2) AS id", local_target_db, "kept"
+        )
+
+        assert local_db.query_as_singleton("SELECT count(*) FROM session_kept") == 2
+
+    assert local_db.query_as_singleton("SELECT count(*) FROM session_kept") == 2
+    assert local_target_db.query_as_singleton("SELECT count(*) FROM kept") == 2
@@ -0,0 +1,20 @@
+import numpy as np
+
+from pg_data_etl import helpers
+
+
+def test_hilbert_keys_visit_neighboring_cells():
+    x, y = np.meshgrid(np.arange(8.0), np.arange(8.0))
+    x, y = x.ravel(), y.ravel()
+
+    keys = helpers.hilbert_keys(x, y, (0, 0, 7, 7), order=3)
+    path = np.column_stack([x, y])[np.argsort(keys)]
+
+    assert sorted(keys) == list(range(64))
+    assert np.abs(np.diff(path, axis=0)).sum(axis=1).max() == 1
+
+
+def test_geohash_keys_interleave_x_then_y():
+    keys = helpers.geohash_keys(np.array([0.0, 1, 0, 1]), np.array([0.0, 0, 1, 1]), (0, 0, 1, 1), 1)
+
+    assert list(keys) == [0, 2, 1, 3]
@@ -0,0 +1,58 @@
+import pytest
+
+from pg_data_etl import Database
+
+
+@pytest.fixture(scope="function")
+def local_db_with_grid(local_db: Database):
+    """ A 10 x 10 grid of points in EPSG:2272, one every 1,000 feet """
+
+    local_db.execute("""
+        CREATE TABLE public.grid AS
+        SELECT x * 10 + y AS uid,
+               ST_SetSRID(ST_MakePoint(2690000 + x * 1000, 230000 + y * 1000), 2272) AS geom
+        FROM generate_series(0, 9) AS x, generate_series(0, 9) AS y;
+    """)
+
+    yield local_db
+
+
+def test_gdf_bbox_uses_the_table_srid_by_default(local_db_with_grid: Database):
+    gdf = local_db_with_grid.gdf_bbox("public.grid", (2690000, 230000, 2692500, 231500))
+
+    assert len(gdf) == 3 * 2
+    assert gdf.crs.to_epsg() == 2272
+
+
+def test_gdf_bbox_reprojects_the_bbox(local_db_with_grid: Database):
+    lon_lat = local_db_with_grid.query_as_list_of_lists("""
+        SELECT ST_XMin(e), ST_YMin(e), ST_XMax(e), ST_YMax(e)
+        FROM (SELECT ST_Extent(ST_Transform(geom, 4326)) AS e FROM public.grid) AS extent
+    """)[0]
+
+    gdf = local_db_with_grid.gdf_bbox("public.grid", lon_lat, bbox_crs="EPSG:4326")
+
+    assert gdf.crs.to_epsg() == 2272
+    assert len(gdf) >= 90
+
+
+def test_iter_tiles_returns_every_feature_once(local_db_with_grid: Database):
+    tiles = list(local_db_with_grid.iter_tiles("public.grid", tile_size=2500))
+
+    uids = [uid for _, tile in tiles for uid in tile["uid"]]
+
+    assert len(tiles) == 16
+    assert sorted(uids) == list(range(100))
+
+
+def test_iter_tiles_shares_edges_between_neighbouring_tiles(local_db: Database):
+    # With xmin=0.1 and tile_size=0.7, (0.1 + 3 * 0.7) + 0.7 < 2.8999999999999997 < 0.1 + 4 * 0.7
+    local_db.execute("""
+        CREATE TABLE public.edges AS
+        SELECT uid, ST_SetSRID(ST_MakePoint(x, 0), 2272) AS geom
+        FROM (VALUES (1, 0.1::float8), (2, 2.8999999999999997), (3, 4.0)) AS v (uid, x);
+    """)
+
+    tiles = list(local_db.iter_tiles("public.edges", tile_size=0.7))
+
+    assert sorted(uid for _, tile in tiles for uid in tile["uid"]) == [1, 2, 3]
@@ -0,0 +1,38 @@
+from pg_data_etl import Database
+
+
+def test_table_stats_estimates_and_exact_counts(local_db: Database):
+    local_db.execute(
+        """
+        CREATE TABLE counted AS SELECT g AS id FROM generate_series(1, 5000) g;
+        CREATE INDEX counted_id ON counted (id);
+        CREATE TABLE other AS SELECT 1 AS id;
+        ANALYZE counted;
+        """
+    )
+
+    stats = local_db.table_stats(["counted", "public.other"])
+
+    assert set(stats) == {"public.counted", "public.other"}
+    assert stats["public.counted"]["estimated_rows"] == 5000
+    assert stats["public.counted"]["last_analyze"] is not None
+    assert stats["public.counted"]["indexes"]["counted_id"] > 0
+    assert "rows" not in stats["public.counted"]
+
+    exact = local_db.table_stats(schema="public", exact=True, workers=2)
+
+    assert exact["public.counted"]["rows"] == 5000
+    assert exact["public.other"]["rows"] == 1
+
+
+def test_exact_table_stats_leave_the_database_pool_alone(local_db: Database, monkeypatch):
+    local_db.execute("CREATE TABLE counted AS SELECT g AS id FROM generate_series(1, 10) g;")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("table_stats() replaced the Database's pool")
+
+    monkeypatch.setattr(local_db, "enable_pool", fail)
+    monkeypatch.setattr(local_db, "close_pool", fail)
+
+    assert local_db.table_stats(exact=True, workers=2)["public.counted"]["rows"] == 10
+    assert local_db._pool is None